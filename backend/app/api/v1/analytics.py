@@ -6,8 +6,13 @@ from fastapi import APIRouter, Depends, HTTPException
 from supabase import Client
 from app.supabase_client import get_supabase
 from uuid import UUID
-from typing import List
+import numpy as np
 import pandas as pd
+from app.services.metrics import (
+    compute_metrics,
+    equity_from_trades,
+    positions_from_trades,
+)
 
 
 router = APIRouter()
@@ -36,6 +41,89 @@ async def get_metrics(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/metrics/recompute")
+async def recompute_metrics(
+    backtest_id: UUID,
+    supabase: Client = Depends(get_supabase)
+):
+    """저장된 거래 기록과 시장 데이터로 성과 지표 재계산"""
+    try:
+        backtest_response = supabase.table("bt_backtests")\
+            .select("*")\
+            .eq("id", str(backtest_id))\
+            .execute()
+
+        if not backtest_response.data:
+            raise HTTPException(status_code=404, detail="Backtest not found")
+
+        backtest = backtest_response.data[0]
+        result = backtest.get("result", {}) or {}
+        initial_capital = float(backtest["initial_capital"])
+
+        trades_response = supabase.table("bt_backtest_trades")\
+            .select("timestamp, trade_type, price, quantity, portfolio_value")\
+            .eq("backtest_id", str(backtest_id))\
+            .order("timestamp")\
+            .execute()
+
+        market_response = supabase.table("bt_market_data")\
+            .select("timestamp, close")\
+            .eq("symbol", backtest["symbol"])\
+            .gte("timestamp", backtest["start_date"])\
+            .lte("timestamp", backtest["end_date"])\
+            .order("timestamp")\
+            .execute()
+
+        if not market_response.data:
+            raise HTTPException(status_code=404, detail="Market data not found")
+
+        # 레코드를 열 배열로 변환
+        trades = pd.DataFrame(
+            trades_response.data or [],
+            columns=["timestamp", "trade_type", "price", "quantity", "portfolio_value"]
+        )
+        market = pd.DataFrame(market_response.data)
+
+        bar_timestamps = pd.to_datetime(market["timestamp"], utc=True).to_numpy()
+        close = market["close"].to_numpy(dtype=np.float64)
+        trade_timestamps = pd.to_datetime(trades["timestamp"], utc=True).to_numpy()
+        action = np.where(trades["trade_type"].to_numpy() == "buy", 1, -1)
+        price = trades["price"].to_numpy(dtype=np.float64)
+        quantity = trades["quantity"].to_numpy(dtype=np.float64)
+
+        equity = equity_from_trades(
+            bar_timestamps,
+            close,
+            trade_timestamps,
+            action,
+            quantity,
+            trades["portfolio_value"].to_numpy(dtype=np.float64),
+            initial_capital
+        )
+
+        # 체결 봉 위치와 체결 직후 보유 수량 (노출 비율 등 보유 기간 지표용)
+        trade_index = np.minimum(
+            np.searchsorted(bar_timestamps, trade_timestamps, side='left'),
+            max(len(bar_timestamps) - 1, 0)
+        )
+
+        return compute_metrics(
+            equity=equity,
+            initial_capital=initial_capital,
+            action=action,
+            price=price,
+            quantity=quantity,
+            trade_index=trade_index,
+            position=positions_from_trades(action, quantity),
+            commission=float(result.get("commission", 0))
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/chart")
 async def get_chart_data(
     backtest_id: UUID,
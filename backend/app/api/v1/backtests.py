@@ -5,11 +5,29 @@ Backtests API Routes - Supabase REST API
 from fastapi import APIRouter, Depends, HTTPException, status
 from supabase import Client
 from app.supabase_client import get_supabase
-from app.services.backtest_engine import BacktestEngine
+from app.services.backtest_runner import (
+    backtest_cache_key,
+    backtest_exists,
+    build_result_data,
+    get_strategy,
+    load_panel,
+    run_backtest,
+    run_portfolio_backtest,
+    run_streaming_backtest,
+    save_trades,
+)
+from app.services.result_cache import get_result_cache
 from app.services.data_collector import DataCollector
+from app.services.progress import (
+    FINAL_STATUSES,
+    ProgressReporter,
+    get_progress_store,
+    progress_shared_with_workers,
+)
 from pydantic import BaseModel
-from uuid import UUID
-import pandas as pd
+from typing import List, Optional
+from uuid import UUID, uuid4
+import asyncio
 from datetime import datetime
 
 
@@ -20,6 +38,27 @@ class BacktestCreate(BaseModel):
     end_date: str
     initial_capital: float = 10000.0
     commission: float = 0.001
+    run_async: bool = False  # True = 워커에서 실행하고 바로 pending 반환
+
+
+class PortfolioBacktestCreate(BaseModel):
+    strategy_id: str
+    symbols: List[str]
+    start_date: str
+    end_date: str
+    initial_capital: float = 10000.0
+    commission: float = 0.001
+    include_equity_curve: bool = False
+
+
+class StreamingBacktestCreate(BaseModel):
+    strategy_id: str
+    symbol: str
+    start_date: str
+    end_date: str
+    initial_capital: float = 10000.0
+    commission: float = 0.001
+    job_id: Optional[str] = None  # 진행 상황 조회용 (없으면 생성)
 
 
 router = APIRouter()
@@ -57,82 +96,108 @@ async def create_backtest(
     """백테스팅 시작"""
     try:
         # 1. 전략 조회
-        strategy_response = supabase.table("bt_strategies")\
-            .select("*")\
-            .eq("id", backtest_data.strategy_id)\
-            .execute()
+        strategy = get_strategy(supabase, backtest_data.strategy_id)
 
-        if not strategy_response.data:
+        if strategy is None:
             raise HTTPException(
                 status_code=404,
                 detail=f"Strategy {backtest_data.strategy_id} not found"
             )
 
-        strategy = strategy_response.data[0]
+        backtest_record = {
+            "strategy_id": backtest_data.strategy_id,
+            "symbol": backtest_data.symbol,
+            "start_date": backtest_data.start_date,
+            "end_date": backtest_data.end_date,
+            "initial_capital": float(backtest_data.initial_capital),
+        }
 
-        # 2. 시장 데이터 조회 (DB에서)
-        data_response = supabase.table("bt_market_data")\
-            .select("*")\
-            .eq("symbol", backtest_data.symbol)\
-            .gte("timestamp", backtest_data.start_date)\
-            .lte("timestamp", backtest_data.end_date)\
-            .order("timestamp")\
-            .execute()
+        # 비동기 모드: pending 으로 기록하고 Celery 워커에 맡김
+        if backtest_data.run_async:
+            from app.tasks.backtest_tasks import run_backtest_task
 
-        if not data_response.data:
-            # DB에 데이터가 없으면 자동으로 수집
-            market_data = await data_collector.fetch_stock_data(
-                backtest_data.symbol,
-                backtest_data.start_date,
-                backtest_data.end_date
-            )
+            # 워커의 진행 상황을 볼 수 없으면 상태 조회가 pending 에 머무름
+            if not progress_shared_with_workers():
+                raise HTTPException(
+                    status_code=400,
+                    detail="Async backtests require a shared progress store "
+                           "(set PROGRESS_REDIS_URL or use a Redis broker)"
+                )
 
-            # DB에 저장
-            await data_collector.save_to_database(
-                supabase,
-                backtest_data.symbol,
-                market_data
+            backtest_response = supabase.table("bt_backtests")\
+                .insert({**backtest_record, "status": "pending"})\
+                .execute()
+
+            if not backtest_response.data:
+                raise HTTPException(
+                    status_code=500,
+                    detail="Failed to save backtest"
+                )
+
+            backtest_id = backtest_response.data[0]['id']
+            ProgressReporter(
+                backtest_id, kind="backtest", status="pending"
+            ).update(force=True)
+
+            await asyncio.to_thread(
+                run_backtest_task.delay,
+                backtest_id,
+                backtest_data.model_dump(exclude={"run_async"})
             )
-        else:
-            # DB 데이터를 DataFrame으로 변환
-            market_data = pd.DataFrame(data_response.data)
-            market_data['timestamp'] = pd.to_datetime(market_data['timestamp'])
-            market_data = market_data.set_index('timestamp')
-            market_data = market_data[['open', 'high', 'low', 'close', 'volume']]
 
-        # 3. 백테스트 실행
-        engine = BacktestEngine(
-            strategy_code=strategy['code'],
-            parameters=strategy['parameters'],
-            initial_capital=backtest_data.initial_capital,
-            commission=backtest_data.commission
+            return {
+                "backtest_id": backtest_id,
+                "status": "pending"
+            }
+
+        # 2. 시장 데이터 조회 (로컬 캐시 → Yahoo Finance → DB)
+        market_data = await data_collector.load_market_data(
+            supabase,
+            backtest_data.symbol,
+            backtest_data.start_date,
+            backtest_data.end_date
         )
 
-        result = engine.execute(market_data)
+        # 같은 요청의 결과가 저장되어 있으면 다시 실행하지 않음
+        result_cache = get_result_cache()
+        cache_key = backtest_cache_key(
+            strategy,
+            market_data,
+            backtest_data.symbol,
+            backtest_data.start_date,
+            backtest_data.end_date,
+            backtest_data.initial_capital,
+            backtest_data.commission
+        )
+        if result_cache is not None:
+            cached = result_cache.get(cache_key)
+            if cached is not None and backtest_exists(supabase, cached['backtest_id']):
+                return {**cached, "cached": True}
+
+        # 3. 백테스트 실행
+        try:
+            result = await run_backtest(
+                supabase,
+                data_collector,
+                strategy,
+                backtest_data.symbol,
+                backtest_data.start_date,
+                backtest_data.end_date,
+                backtest_data.initial_capital,
+                backtest_data.commission,
+                market_data=market_data
+            )
+        except ValueError as e:
+            # 전략 코드 오류
+            raise HTTPException(status_code=400, detail=str(e))
 
         # 4. 백테스트 결과 저장
         # 스키마에 맞게 result JSONB 필드에 모든 메트릭 저장
-        result_data = {
-            "final_capital": result.final_capital,
-            "total_return": result.metrics.get('total_return', 0),
-            "total_return_pct": result.metrics.get('total_return_pct', 0),
-            "max_drawdown": result.metrics.get('max_drawdown', 0),
-            "sharpe_ratio": result.metrics.get('sharpe_ratio', 0),
-            "total_trades": result.metrics.get('total_trades', 0),
-            "win_rate": result.metrics.get('win_rate', 0),
-            **result.metrics  # 나머지 메트릭도 포함
-        }
-
-        backtest_record = {
-            "strategy_id": backtest_data.strategy_id,
-            "symbol": backtest_data.symbol,
-            "start_date": backtest_data.start_date,
-            "end_date": backtest_data.end_date,
-            "initial_capital": float(backtest_data.initial_capital),
+        backtest_record.update({
             "status": "completed",
-            "result": result_data,
+            "result": build_result_data(result, backtest_data.commission),
             "completed_at": datetime.now().isoformat(),
-        }
+        })
 
         backtest_response = supabase.table("bt_backtests")\
             .insert(backtest_record)\
@@ -147,32 +212,156 @@ async def create_backtest(
         backtest_id = backtest_response.data[0]['id']
 
         # 5. 거래 기록 저장
-        if result.trades:
-            trade_records = []
-            for trade in result.trades:
-                # 스키마에 맞게 필드 매핑
-                # action -> trade_type, balance -> portfolio_value
-                trade_records.append({
-                    "backtest_id": backtest_id,
-                    "timestamp": trade.timestamp.isoformat() if hasattr(trade.timestamp, 'isoformat') else str(trade.timestamp),
-                    "trade_type": trade.action if hasattr(trade, 'action') else (trade.trade_type if hasattr(trade, 'trade_type') else 'buy'),
-                    "price": float(trade.price),
-                    "quantity": float(trade.quantity),
-                    "commission": float(getattr(trade, 'commission', 0)),
-                    "portfolio_value": float(trade.balance if hasattr(trade, 'balance') else getattr(trade, 'portfolio_value', 0)),
-                })
-
-            supabase.table("bt_backtest_trades")\
-                .insert(trade_records)\
-                .execute()
+        save_trades(supabase, backtest_id, result)
 
-        return {
+        response = {
             "backtest_id": backtest_id,
             "status": "completed",
             "metrics": result.metrics,
             "trades_count": len(result.trades)
         }
 
+        if result_cache is not None:
+            result_cache.set(cache_key, response)
+
+        return response
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/portfolio")
+async def create_portfolio_backtest(
+    backtest_data: PortfolioBacktestCreate,
+    supabase: Client = Depends(get_supabase)
+):
+    """
+    다중 종목 포트폴리오 백테스트 (전략은 목표 비중 반환)
+
+    bt_backtests 는 단일 종목 스키마이므로 결과는 저장하지 않고 바로 반환합니다.
+    """
+    try:
+        strategy = get_strategy(supabase, backtest_data.strategy_id)
+
+        if strategy is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Strategy {backtest_data.strategy_id} not found"
+            )
+
+        if not backtest_data.symbols:
+            raise HTTPException(status_code=400, detail="No symbols given")
+
+        panel, failures = await load_panel(
+            supabase,
+            data_collector,
+            backtest_data.symbols,
+            backtest_data.start_date,
+            backtest_data.end_date
+        )
+
+        if not panel.symbols:
+            raise HTTPException(
+                status_code=404,
+                detail="No market data for the given symbols"
+            )
+
+        try:
+            result = await run_portfolio_backtest(
+                strategy,
+                panel,
+                backtest_data.initial_capital,
+                backtest_data.commission
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        response = {
+            "status": "completed",
+            "metrics": result.metrics,
+            "symbol_metrics": result.symbol_metrics,
+            "final_capital": result.final_capital,
+            "failures": failures,
+        }
+
+        if backtest_data.include_equity_curve:
+            response["equity_curve"] = [
+                {"timestamp": timestamp.isoformat(), "value": float(value)}
+                for timestamp, value in zip(panel.index, result.equity_curve)
+            ]
+
+        return response
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/streaming")
+async def create_streaming_backtest(
+    backtest_data: StreamingBacktestCreate,
+    supabase: Client = Depends(get_supabase)
+):
+    """
+    봉 단위 스트리밍 백테스트 (전략은 lookback 과 on_bar 선언)
+
+    로컬 캐시의 봉을 하나씩 흘려보내므로 기간이 길어도 메모리 사용량이
+    일정합니다. 진행 상황은 /progress/{job_id} 로 조회하며, 결과는 저장하지
+    않고 바로 반환합니다.
+    """
+    try:
+        strategy = get_strategy(supabase, backtest_data.strategy_id)
+
+        if strategy is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Strategy {backtest_data.strategy_id} not found"
+            )
+
+        job_id = backtest_data.job_id or str(uuid4())
+        progress = ProgressReporter(job_id, kind="backtest")
+
+        try:
+            result = await run_streaming_backtest(
+                supabase,
+                data_collector,
+                strategy,
+                backtest_data.symbol,
+                backtest_data.start_date,
+                backtest_data.end_date,
+                backtest_data.initial_capital,
+                backtest_data.commission,
+                progress=progress
+            )
+        except ValueError as e:
+            # lookback 누락·전략 코드 오류
+            progress.finish("failed", message=str(e))
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception:
+            progress.finish("failed")
+            raise
+
+        if result.bars == 0:
+            progress.finish("failed", message="No market data")
+            raise HTTPException(
+                status_code=404,
+                detail=f"No data found for symbol {backtest_data.symbol}"
+            )
+
+        progress.finish("completed")
+
+        return {
+            "job_id": job_id,
+            "status": "completed",
+            "metrics": result.metrics,
+            "final_capital": result.final_capital,
+            "bars": result.bars,
+            "trades_count": len(result.trades),
+        }
+
     except HTTPException:
         raise
     except Exception as e:
@@ -218,17 +407,45 @@ async def get_backtest_status(
     backtest_id: UUID,
     supabase: Client = Depends(get_supabase)
 ):
-    """백테스팅 진행 상태 조회"""
+    """백테스팅 진행 상태 조회 (DB 가 아직 진행 중이면 진행 상황 저장소 값 사용)"""
     try:
+        event = get_progress_store().get(str(backtest_id))
+
         response = supabase.table("bt_backtests")\
-            .select("status, metrics")\
+            .select("status, error_message, started_at, completed_at")\
             .eq("id", str(backtest_id))\
             .execute()
 
         if not response.data:
             raise HTTPException(status_code=404, detail="Backtest not found")
 
-        return response.data[0]
+        row = response.data[0]
+
+        # DB 가 끝난 상태면 저장소 이벤트가 남아 있어도 DB 가 기준
+        if (
+            event is not None
+            and event['status'] not in FINAL_STATUSES
+            and row['status'] not in FINAL_STATUSES
+        ):
+            return {
+                "id": str(backtest_id),
+                "status": event['status'],
+                "progress": event['progress'],
+                "message": event['message'],
+                "done": event['done'],
+                "total": event['total'],
+            }
+
+        progress = event['progress'] if event is not None else None
+        if row['status'] == "completed":
+            progress = 1.0
+
+        return {
+            "id": str(backtest_id),
+            **row,
+            "progress": progress,
+            "message": row.get('error_message'),
+        }
 
     except HTTPException:
         raise
@@ -6,7 +6,11 @@ from fastapi import APIRouter, Depends, HTTPException
 from supabase import Client
 from app.supabase_client import get_supabase
 from app.services.data_collector import DataCollector
+from app.services.progress import ProgressReporter
 from pydantic import BaseModel
+from dataclasses import asdict
+from typing import List, Optional
+from uuid import uuid4
 
 
 class DataImportRequest(BaseModel):
@@ -17,6 +21,16 @@ class DataImportRequest(BaseModel):
     asset_type: str = "stock"  # "stock" or "crypto"
 
 
+class BulkImportRequest(BaseModel):
+    symbols: List[str]
+    start_date: str
+    end_date: str
+    interval: str = "1d"
+    asset_type: str = "stock"  # "stock" or "crypto"
+    concurrency: Optional[int] = None  # None = 설정값
+    job_id: Optional[str] = None  # 진행 상황 조회용 ID (없으면 생성)
+
+
 router = APIRouter()
 data_collector = DataCollector()
 
@@ -89,3 +103,53 @@ async def import_data(
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/import/bulk")
+async def import_data_bulk(
+    request: BulkImportRequest,
+    supabase: Client = Depends(get_supabase)
+):
+    """여러 심볼 일괄 가져오기 (Yahoo Finance -> DB, 진행 상황: /api/v1/progress/{job_id})"""
+    if not request.symbols:
+        raise HTTPException(status_code=400, detail="No symbols given")
+
+    job_id = request.job_id or str(uuid4())
+    progress = ProgressReporter(job_id, kind="import", total=len(request.symbols))
+    progress.update(force=True)
+
+    def report(completed: int, total: int, result):
+        status = "ok" if result.success else f"failed: {result.error}"
+        progress.update(done=completed, message=f"{result.symbol} {status}")
+
+    try:
+        results = await data_collector.import_symbols(
+            supabase,
+            request.symbols,
+            request.start_date,
+            request.end_date,
+            interval=request.interval,
+            asset_type=request.asset_type,
+            concurrency=request.concurrency,
+            on_progress=report
+        )
+
+        failed = [asdict(r) for r in results if not r.success]
+        progress.finish(
+            "completed",
+            message=f"{len(failed)} of {len(results)} symbols failed" if failed else None
+        )
+
+        return {
+            "job_id": job_id,
+            "success": not failed,
+            "total_symbols": len(results),
+            "imported_symbols": len(results) - len(failed),
+            "records_imported": sum(r.records for r in results),
+            "failed": failed,
+            "results": [asdict(r) for r in results]
+        }
+
+    except Exception as e:
+        progress.finish("failed", message=str(e))
+        raise HTTPException(status_code=500, detail=str(e))
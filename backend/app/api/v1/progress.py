@@ -0,0 +1,68 @@
+"""
+Progress API Routes - 백테스트·최적화 진행 상황
+"""
+
+import asyncio
+import json
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+
+from app.config import settings
+from app.services.progress import FINAL_STATUSES, get_progress_store
+
+
+router = APIRouter()
+
+
+@router.get("/{job_id}")
+async def get_progress(job_id: str):
+    """작업 진행 상황 조회"""
+    event = get_progress_store().get(job_id)
+
+    if event is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return event
+
+
+@router.get("/{job_id}/stream")
+async def stream_progress(job_id: str, wait: float = 30.0):
+    """
+    작업 진행 상황 스트림 (Server-Sent Events)
+
+    진행 이벤트가 바뀔 때마다 전송하고 작업이 끝나면 종료합니다.
+    wait 초 동안 작업이 보이지 않으면 종료합니다.
+    """
+
+    store = get_progress_store()
+    interval = max(settings.PROGRESS_MIN_INTERVAL, 0.1)
+
+    async def events():
+        last_update = None
+        waited = 0.0
+
+        while True:
+            event = store.get(job_id)
+
+            if event is None:
+                if waited >= wait:
+                    yield "event: error\ndata: {\"detail\": \"Job not found\"}\n\n"
+                    return
+                waited += interval
+            elif event['updated_at'] != last_update:
+                last_update = event['updated_at']
+                yield f"data: {json.dumps(event)}\n\n"
+                if event['status'] in FINAL_STATUSES:
+                    return
+            else:
+                # 연결 유지용 주석
+                yield ": keep-alive\n\n"
+
+            await asyncio.sleep(interval)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -3,9 +3,11 @@ Strategies API Routes - Supabase REST API
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from uuid import UUID
-from typing import List
+from uuid import UUID, uuid4
+from typing import Optional
+import asyncio
 
+from app.config import settings
 from app.supabase_client import get_supabase
 from supabase import Client
 from app.schemas import (
@@ -130,20 +132,81 @@ async def optimize_strategy(
     symbol: str,
     start_date: str,
     end_date: str,
-    method: str = "grid",  # "grid", "bayesian", "random"
+    method: str = "grid",  # "grid", "bayesian", "random", "walk_forward", "halving"
     param_grid: dict = None,
     n_iter: int = 50,
+    n_folds: int = 5,  # walk_forward 구간 수
+    anchored: bool = False,  # walk_forward 학습 구간 시작 고정
+    eta: int = 3,  # halving 단계마다 상위 1/eta 유지
+    top_k: Optional[int] = None,  # 응답에 담을 상위 조합 수 (None = 설정값)
+    job_id: Optional[str] = None,  # 진행 상황 조회용 ID (없으면 생성)
     supabase: Client = Depends(get_supabase)
 ):
-    """전략 파라미터 최적화"""
+    """
+    전략 파라미터 최적화 (진행 상황: /api/v1/progress/{job_id})
+
+    grid / bayesian / random 은 진행 상태를 주기적으로 저장하므로 중단되면
+    /optimizations/{job_id}/resume 으로 이어서 실행할 수 있습니다.
+    """
+    request = {
+        "strategy_id": str(strategy_id),
+        "symbol": symbol,
+        "start_date": start_date,
+        "end_date": end_date,
+        "method": method,
+        "param_grid": param_grid,
+        "n_iter": n_iter,
+        "n_folds": n_folds,
+        "anchored": anchored,
+        "eta": eta,
+        "top_k": top_k,
+    }
+    return await _run_optimization(request, job_id or str(uuid4()), supabase)
+
+
+@router.post("/optimizations/{job_id}/resume")
+async def resume_optimization(
+    job_id: str,
+    supabase: Client = Depends(get_supabase)
+):
+    """중단된 최적화를 마지막 체크포인트부터 이어서 실행"""
+    from app.services.checkpoint import OptimizationCheckpoint
+
+    request = None
+    if settings.OPTIMIZER_CHECKPOINT_DIR:
+        request = await asyncio.to_thread(OptimizationCheckpoint.read_meta, job_id)
+    if request is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Checkpoint for optimization {job_id} not found"
+        )
+
+    return await _run_optimization(request, job_id, supabase)
+
+
+async def _run_optimization(request: dict, job_id: str, supabase: Client):
+    """최적화 실행 (request = optimize_strategy 의 요청 값, 체크포인트에 함께 저장)"""
     from app.services.optimizer import StrategyOptimizer
+    from app.services.checkpoint import OptimizationCheckpoint
     from app.services.data_collector import DataCollector
+    from app.services.progress import ProgressReporter
+
+    strategy_id = request["strategy_id"]
+    symbol = request["symbol"]
+    method = request["method"]
+    param_grid = request["param_grid"]
+    n_iter = request["n_iter"]
+
+    progress = ProgressReporter(job_id, kind="optimization")
+    checkpoint = None
+    if settings.OPTIMIZER_CHECKPOINT_DIR and method in ("grid", "bayesian", "random"):
+        checkpoint = OptimizationCheckpoint(job_id, meta=request)
 
     try:
         # 전략 조회
         strategy_response = supabase.table("bt_strategies")\
             .select("*")\
-            .eq("id", str(strategy_id))\
+            .eq("id", strategy_id)\
             .execute()
 
         if not strategy_response.data:
@@ -157,13 +220,17 @@ async def optimize_strategy(
         # 시장 데이터 조회
         data_collector = DataCollector()
         market_data = await data_collector.fetch_stock_data(
-            symbol, start_date, end_date
+            symbol, request["start_date"], request["end_date"]
         )
 
-        # 최적화 실행
+        # 최적화 실행 (이벤트 루프를 막지 않도록 스레드에서 실행)
         optimizer = StrategyOptimizer(
             strategy_code=strategy['code'],
-            market_data=market_data
+            market_data=market_data,
+            progress=progress,
+            top_k=request["top_k"],
+            results_id=job_id,  # 전체 결과: /optimizations/{job_id}/results
+            checkpoint=checkpoint
         )
 
         if method == "grid":
@@ -173,7 +240,7 @@ async def optimize_strategy(
                     "short_period": [10, 20, 30],
                     "long_period": [40, 50, 60]
                 }
-            result = optimizer.grid_search(param_grid)
+            result = await asyncio.to_thread(optimizer.grid_search, param_grid)
 
         elif method == "bayesian":
             if not param_grid:
@@ -182,7 +249,9 @@ async def optimize_strategy(
                     "short_period": (5, 30),
                     "long_period": (30, 100)
                 }
-            result = optimizer.bayesian_optimization(param_grid, n_calls=n_iter)
+            result = await asyncio.to_thread(
+                optimizer.bayesian_optimization, param_grid, n_calls=n_iter
+            )
 
         elif method == "random":
             if not param_grid:
@@ -190,7 +259,38 @@ async def optimize_strategy(
                     "short_period": (5, 30),
                     "long_period": (30, 100)
                 }
-            result = optimizer.random_search(param_grid, n_iter=n_iter)
+            result = await asyncio.to_thread(
+                optimizer.random_search, param_grid, n_iter=n_iter
+            )
+
+        elif method == "halving":
+            if not param_grid:
+                param_grid = {
+                    "short_period": [10, 20, 30],
+                    "long_period": [40, 50, 60]
+                }
+            try:
+                result = await asyncio.to_thread(
+                    optimizer.successive_halving, param_grid, eta=request["eta"]
+                )
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+
+        elif method == "walk_forward":
+            if not param_grid:
+                param_grid = {
+                    "short_period": [10, 20, 30],
+                    "long_period": [40, 50, 60]
+                }
+            try:
+                result = await asyncio.to_thread(
+                    optimizer.walk_forward,
+                    param_grid,
+                    n_folds=request["n_folds"],
+                    anchored=request["anchored"]
+                )
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
 
         else:
             raise HTTPException(
@@ -198,13 +298,60 @@ async def optimize_strategy(
                 detail=f"Unknown optimization method: {method}"
             )
 
+        progress.finish("completed")
+
         return {
             "success": True,
+            "job_id": job_id,
             "optimization_result": result,
-            "strategy_id": str(strategy_id)
+            "strategy_id": strategy_id
         }
 
-    except HTTPException:
+    except HTTPException as e:
+        progress.finish("failed", message=str(e.detail))
         raise
+    except ValueError as e:
+        # 잘못된 요청 (예: 데이터가 바뀌어 체크포인트와 맞지 않음)
+        progress.finish("failed", message=str(e))
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
+        progress.finish("failed", message=str(e))
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/optimizations/{job_id}/results")
+async def get_optimization_results(
+    job_id: str,
+    offset: int = 0,
+    limit: int = 100,
+    sort_by: Optional[str] = None,  # 지표 이름 (None = 평가 순서)
+    descending: bool = True
+):
+    """최적화 전체 결과 페이지 조회 (상위 결과는 최적화 응답의 top_results)"""
+    from app.services.result_sink import read_results, results_path
+
+    if offset < 0 or not 0 < limit <= 1000:
+        raise HTTPException(
+            status_code=400,
+            detail="offset must be >= 0 and limit between 1 and 1000"
+        )
+
+    try:
+        return await asyncio.to_thread(
+            read_results,
+            results_path(job_id),
+            offset=offset,
+            limit=limit,
+            sort_by=sort_by,
+            descending=descending
+        )
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Results for optimization {job_id} not found"
+        )
+    except KeyError:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown metric: {sort_by}"
+        )
@@ -20,12 +20,57 @@ class Settings(BaseSettings):
     SUPABASE_ANON_KEY: str = ""
     SUPABASE_SERVICE_ROLE_KEY: str = ""
 
+    # Database (Postgres 직접 연결, COPY 저장용)
+    DATABASE_URL: str = ""
+
     # Security
     SECRET_KEY: str = "your-secret-key-change-this-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # Optimizer
+    OPTIMIZER_N_JOBS: int = -1  # -1 = 모든 코어 사용
+    OPTIMIZER_MP_CONTEXT: str = "spawn"
+    EVALUATION_MEMO_PERSISTENT: bool = False  # 평가 결과를 최적화 간 공유 (Redis 는 RESULT_CACHE_REDIS_URL)
+    EVALUATION_MEMO_SIZE: int = 100000  # 평가 메모 최대 항목 수 (최적화당·공유 저장소)
+    OPTIMIZER_TOP_K: int = 100  # 응답에 담는 상위 결과 수
+    OPTIMIZER_RESULTS_DIR: str = "data/optimizer_results"  # 전체 결과 Parquet (빈 문자열 = 저장 안 함)
+    OPTIMIZER_BLOCK_SIZE: int = 4096  # 그리드·무작위 서치에서 한 번에 만들고 평가할 조합 수
+    OPTIMIZER_CHECKPOINT_DIR: str = "data/optimizer_checkpoints"  # 진행 상태 스냅샷 (빈 문자열 = 저장 안 함)
+    OPTIMIZER_CHECKPOINT_INTERVAL: float = 60.0  # 스냅샷 최소 간격 (초)
+
+    # Market Data
+    MARKET_DATA_CACHE_DIR: str = "data/market_cache"  # 빈 문자열 = 로컬 캐시 사용 안 함
+    MARKET_DATA_SETTLE_DAYS: int = 7  # 빈 응답 구간은 이 기간이 지난 것만 '데이터 없음'으로 기록
+    MARKET_DATA_MMAP: bool = True  # 로컬 캐시 조회를 메모리 맵 사본({캐시}/_mmap)으로 (복사 없음)
+    DATA_IMPORT_CONCURRENCY: int = 8  # 일괄 가져오기 동시 다운로드 수
+    DATA_IMPORT_WORKERS: int = 16  # 다운로드·DB 저장용 스레드 수
+    MARKET_DATA_UPSERT_CHUNK_SIZE: int = 1000  # upsert 요청당 레코드 수
+    MARKET_DATA_UPSERT_IN_FLIGHT: int = 4  # 동시에 보내는 upsert 요청 수
+    MARKET_DATA_UPSERT_RETRIES: int = 3
+    MARKET_DATA_USE_COPY: bool = False  # True 이고 DATABASE_URL 이 있으면 COPY 로 저장
+
+    # Celery
+    CELERY_BROKER_URL: str = "redis://localhost:6379/0"
+    CELERY_RESULT_BACKEND: str = "redis://localhost:6379/0"
+    CELERY_TASK_ALWAYS_EAGER: bool = False  # True = 호출 즉시 실행 (테스트: memory:// + cache+memory://)
+
+    # Progress
+    PROGRESS_REDIS_URL: str = ""  # 빈 문자열 = Redis 브로커 주소 (브로커가 Redis 가 아니면 프로세스 메모리)
+    PROGRESS_TTL_SECONDS: int = 3600
+    PROGRESS_MIN_INTERVAL: float = 0.5  # 진행 이벤트 최소 기록 간격 (초)
+
+    # Result Cache
+    RESULT_CACHE_ENABLED: bool = True
+    RESULT_CACHE_REDIS_URL: str = ""  # 빈 문자열 = 프로세스 메모리
+    RESULT_CACHE_SIZE: int = 256  # 메모리 캐시 최대 항목 수
+    RESULT_CACHE_TTL_SECONDS: int = 86400
+
+    # Strategy
+    STRATEGY_CACHE_SIZE: int = 128  # 컴파일된 전략 LRU 캐시 크기
+    INDICATOR_CACHE_MB: int = 256  # 지표 계산 결과 캐시 용량 (프로세스당)
+
     # CORS
     CORS_ORIGINS: Union[List[str], str] = [
         "http://localhost:3000",
@@ -5,7 +5,7 @@ FastAPI Main Application
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
-from app.api.v1 import strategies, backtests, data, analytics
+from app.api.v1 import strategies, backtests, data, analytics, progress
 
 app = FastAPI(
     title="Trading Backtest API",
@@ -30,6 +30,7 @@ app.include_router(strategies.router, prefix="/api/v1/strategies", tags=["Strate
 app.include_router(backtests.router, prefix="/api/v1/backtests", tags=["Backtests"])
 app.include_router(data.router, prefix="/api/v1/data", tags=["Data"])
 app.include_router(analytics.router, prefix="/api/v1/analytics", tags=["Analytics"])
+app.include_router(progress.router, prefix="/api/v1/progress", tags=["Progress"])
 
 
 @app.get("/")
@@ -4,9 +4,35 @@
 
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Union
 from datetime import datetime
 from dataclasses import dataclass
+from app.services.strategy_cache import strategy_cache
+from app.services.indicators import ta
+from app.services.metrics import trade_metrics
+from app.services.mmap_store import OHLCVArrays, as_market_frame
+from app.services.online_metrics import OnlineMetrics
+from app.services.trade_log import TradeLog
+from app.services.progress import ProgressReporter
+from app.services.signals import (
+    BUY,
+    SELL,
+    HOLD,
+    to_signal_array,
+    to_signal_matrix,
+)
+from app.services.simulation import (
+    simulate_signals,
+    simulate_signal_matrix,
+    matrix_metrics,
+)
+
+
+# 시뮬레이션 모드
+SIMULATION_MODES = ("loop", "vectorized")
+
+# 루프 시뮬레이션에서 진행 상황을 보고하는 봉 간격
+PROGRESS_EVERY = 4096
 
 
 @dataclass
@@ -18,13 +44,14 @@ class Trade:
     quantity: float
     balance: float
     position: float
+    commission: float = 0.0
 
 
 @dataclass
 class BacktestResult:
     """백테스트 결과"""
-    trades: List[Trade]
-    equity_curve: List[float]
+    trades: TradeLog
+    equity_curve: List[float]  # keep_equity=False 면 빈 목록
     metrics: Dict[str, Any]
     initial_capital: float
     final_capital: float
@@ -39,25 +66,56 @@ class BacktestEngine:
         parameters: dict,
         initial_capital: float = 10000.0,
         commission: float = 0.001,  # 0.1% 수수료
+        mode: str = "loop",  # "loop" 또는 "vectorized"
+        progress: Optional[ProgressReporter] = None,
+        keep_equity: bool = True,  # False 면 수익 곡선을 저장하지 않음 (메모리 O(1))
     ):
+        if mode not in SIMULATION_MODES:
+            raise ValueError(f"Unknown simulation mode: {mode}")
+
         self.strategy_code = strategy_code
         self.parameters = parameters
         self.initial_capital = initial_capital
         self.commission = commission
-
-    def execute(self, market_data: pd.DataFrame) -> BacktestResult:
-        """백테스트 실행"""
+        self.mode = mode
+        self.progress = progress  # 처리한 봉 수 보고 (없으면 생략)
+        self.keep_equity = keep_equity
+        # 실행 중 지표 누적기 (execute 중 언제든 snapshot() 가능)
+        self.online_metrics: Optional[OnlineMetrics] = None
+
+    def execute(
+        self, market_data: Union[pd.DataFrame, OHLCVArrays]
+    ) -> BacktestResult:
+        """백테스트 실행 (OHLCVArrays 뷰는 복사 없이 DataFrame 으로 감쌈)"""
+
+        market_data = as_market_frame(market_data)
+
+        if self.progress is not None:
+            self.progress.update(
+                done=0, total=len(market_data), message="signals", force=True
+            )
 
         # 전략 실행하여 신호 생성
         signals = self._execute_strategy(market_data)
 
+        self.online_metrics = OnlineMetrics(self.initial_capital)
+
         # 매매 시뮬레이션
-        trades, equity_curve = self._simulate_trading(market_data, signals)
+        if self.mode == "vectorized":
+            trades, equity_curve = self._simulate_vectorized(market_data, signals)
+        else:
+            trades, equity_curve = self._simulate_trading(market_data, signals)
+
+        if self.progress is not None:
+            self.progress.update(done=len(market_data), message="metrics")
 
         # 성과 지표 계산
-        metrics = self._calculate_metrics(trades, equity_curve)
+        metrics = self._calculate_metrics(trades, self.online_metrics)
 
-        final_capital = equity_curve[-1] if equity_curve else self.initial_capital
+        final_capital = (
+            self.online_metrics.last_equity if self.online_metrics.bars
+            else self.initial_capital
+        )
 
         return BacktestResult(
             trades=trades,
@@ -67,13 +125,104 @@ class BacktestEngine:
             final_capital=final_capital,
         )
 
-    def _execute_strategy(self, data: pd.DataFrame) -> List[str]:
-        """전략 코드를 실행하여 매매 신호 생성"""
+    def execute_batch(
+        self,
+        market_data: Union[pd.DataFrame, OHLCVArrays],
+        parameter_sets: List[dict],
+        signal_matrix: np.ndarray = None,
+        batch_size: int = 256,
+    ) -> pd.DataFrame:
+        """
+        여러 파라미터 세트를 한 번에 백테스트
+
+        Args:
+            market_data: 시장 데이터 (DataFrame 또는 OHLCVArrays)
+            parameter_sets: 파라미터 딕셔너리 목록
+            signal_matrix: int8 신호 행렬 (봉 × 파라미터 세트, 1/-1/0).
+                없으면 파라미터 세트마다 전략을 실행하여 생성
+            batch_size: 한 번에 시뮬레이션할 열 수 (메모리 상한)
+
+        Returns:
+            파라미터 세트별 성과 지표 표 (행 순서 = parameter_sets 순서)
+        """
+
+        market_data = as_market_frame(market_data)
+        close = market_data['close'].to_numpy(dtype=np.float64)
+
+        if signal_matrix is None:
+            signal_matrix = np.zeros(
+                (len(close), len(parameter_sets)), dtype=np.int8
+            )
+            for j, params in enumerate(parameter_sets):
+                signal_matrix[:, j] = self._execute_strategy(market_data, params)
+        else:
+            signal_matrix = to_signal_matrix(signal_matrix, len(close))
+            if signal_matrix.shape[1] != len(parameter_sets):
+                raise ValueError(
+                    "signal_matrix must have one column per parameter set"
+                )
+
+        tables = []
+        for start in range(0, len(parameter_sets), batch_size):
+            sim = simulate_signal_matrix(
+                close,
+                signal_matrix[:, start:start + batch_size],
+                self.initial_capital,
+                self.commission,
+            )
+            tables.append(pd.DataFrame(
+                matrix_metrics(close, sim, self.initial_capital)
+            ))
+
+        metrics = (
+            pd.concat(tables, ignore_index=True) if tables else pd.DataFrame()
+        )
+        params = pd.DataFrame(list(parameter_sets))
+        return pd.concat([params, metrics], axis=1)
+
+    def _execute_strategy(
+        self, data: pd.DataFrame, parameters: dict = None
+    ) -> np.ndarray:
+        """
+        전략 코드를 실행하여 매매 신호 생성
+
+        strategy(data, params) 형태로 선언된 전략에는 파라미터를 전달합니다.
+        반환된 신호는 int8 배열(1 = 매수, -1 = 매도, 0 = 관망)로 변환됩니다.
+        전역은 실행마다 새로 만들어 이전 실행의 모듈 수준 상태가 남지 않습니다.
+
+        Raises:
+            ValueError: 전략 함수가 없거나 실행 중 오류가 났을 때
+        """
+
+        if parameters is None:
+            parameters = self.parameters
+
+        # 전략 코드 실행 (같은 코드는 컴파일 결과 재사용)
+        try:
+            strategy_func = strategy_cache.resolve(
+                self.strategy_code, self._sandbox_globals()
+            )
+
+            if strategy_func.__code__.co_argcount >= 2:
+                signals = strategy_func(data, parameters)
+            else:
+                signals = strategy_func(data)
+            return to_signal_array(signals, len(data))
+
+        except Exception as e:
+            raise ValueError(f"Strategy execution error: {e}") from e
+
+    @staticmethod
+    def _sandbox_globals() -> Dict[str, Any]:
+        """안전한 실행 환경 설정"""
 
-        # 안전한 실행 환경 설정
-        safe_globals = {
+        return {
             'pd': pd,
             'np': np,
+            'BUY': BUY,
+            'SELL': SELL,
+            'HOLD': HOLD,
+            'ta': ta,  # 메모이즈된 기술 지표
             '__builtins__': {
                 'range': range,
                 'len': len,
@@ -86,39 +235,29 @@ class BacktestEngine:
             }
         }
 
-        # 전략 코드 실행
-        try:
-            exec(self.strategy_code, safe_globals)
-            strategy_func = safe_globals.get('strategy')
-
-            if not strategy_func:
-                raise ValueError("Strategy function not found")
-
-            signals = strategy_func(data)
-            return signals
-
-        except Exception as e:
-            print(f"Strategy execution error: {e}")
-            # 에러 발생 시 모든 신호를 'hold'로 설정
-            return ['hold'] * len(data)
-
     def _simulate_trading(
-        self, market_data: pd.DataFrame, signals: List[str]
-    ) -> tuple[List[Trade], List[float]]:
+        self, market_data: pd.DataFrame, signals: np.ndarray
+    ) -> tuple[TradeLog, List[float]]:
         """매매 시뮬레이션"""
 
-        trades = []
+        trades = TradeLog(tz=self._index_tz(market_data))
         equity_curve = []
 
         balance = self.initial_capital  # 현금
         position = 0.0  # 보유 주식 수
 
-        for i in range(len(market_data)):
+        online = self.online_metrics
+
+        for i, signal in enumerate(signals.tolist()):
             price = market_data['close'].iloc[i]
-            signal = signals[i] if i < len(signals) else 'hold'
+
+            if self.progress is not None and i % PROGRESS_EVERY == 0:
+                self.progress.update(
+                    done=i, message="simulation", metrics=online.snapshot()
+                )
 
             # 매수 신호
-            if signal == 'buy' and balance > 0:
+            if signal == BUY and balance > 0:
                 # 사용 가능한 현금으로 최대한 매수
                 cost = balance * 0.95  # 95% 사용 (안전 마진)
                 quantity = cost / (price * (1 + self.commission))
@@ -126,97 +265,102 @@ class BacktestEngine:
                 position += quantity
                 balance -= cost
 
-                trades.append(Trade(
+                trades.append(
                     timestamp=market_data.index[i],
-                    action='buy',
+                    bar_index=i,
+                    action=BUY,
                     price=price,
                     quantity=quantity,
+                    commission=quantity * price * self.commission,
                     balance=balance,
                     position=position,
-                ))
+                )
 
             # 매도 신호
-            elif signal == 'sell' and position > 0:
+            elif signal == SELL and position > 0:
                 # 보유 주식 전량 매도
                 proceeds = position * price * (1 - self.commission)
                 balance += proceeds
 
-                trades.append(Trade(
+                trades.append(
                     timestamp=market_data.index[i],
-                    action='sell',
+                    bar_index=i,
+                    action=SELL,
                     price=price,
                     quantity=position,
+                    commission=position * price * self.commission,
                     balance=balance,
                     position=0,
-                ))
+                )
 
                 position = 0
 
             # 포트폴리오 가치 기록
             portfolio_value = balance + (position * price)
-            equity_curve.append(portfolio_value)
+            online.update(portfolio_value)
+            if self.keep_equity:
+                equity_curve.append(portfolio_value)
 
         return trades, equity_curve
 
-    def _calculate_metrics(
-        self, trades: List[Trade], equity_curve: List[float]
-    ) -> Dict[str, Any]:
-        """성과 지표 계산"""
+    def _simulate_vectorized(
+        self, market_data: pd.DataFrame, signals: np.ndarray
+    ) -> tuple[TradeLog, List[float]]:
+        """배열 기반 매매 시뮬레이션 (_simulate_trading 과 같은 규칙, 부동소수점 오차 범위에서 일치)"""
 
-        if not equity_curve:
-            return {}
+        close = market_data['close'].to_numpy(dtype=np.float64)
 
-        # 수익률 계산
-        total_return = (
-            (equity_curve[-1] - self.initial_capital) / self.initial_capital * 100
+        sim = simulate_signals(
+            close, signals, self.initial_capital, self.commission
         )
 
-        # 최대 낙폭 (Maximum Drawdown)
-        peak = equity_curve[0]
-        max_drawdown = 0.0
-
-        for value in equity_curve:
-            if value > peak:
-                peak = value
-            drawdown = (peak - value) / peak * 100
-            if drawdown > max_drawdown:
-                max_drawdown = drawdown
-
-        # 거래 통계
-        buy_trades = [t for t in trades if t.action == 'buy']
-        sell_trades = [t for t in trades if t.action == 'sell']
-
-        total_trades = len(buy_trades)
-
-        # 승률 계산 (매수-매도 쌍)
-        winning_trades = 0
-        if len(buy_trades) > 0 and len(sell_trades) > 0:
-            for i in range(min(len(buy_trades), len(sell_trades))):
-                if sell_trades[i].price > buy_trades[i].price:
-                    winning_trades += 1
-
-        win_rate = (
-            (winning_trades / total_trades * 100)
-            if total_trades > 0
-            else 0
+        # 수수료: 체결 금액 × 수수료율 (매수 시 지불 금액 = 체결 금액 + 수수료)
+        commission = sim.quantity * sim.price * self.commission
+
+        trades = TradeLog.from_arrays(
+            timestamp=market_data.index[sim.trade_index],
+            bar_index=sim.trade_index,
+            action=sim.action,
+            price=sim.price,
+            quantity=sim.quantity,
+            commission=commission,
+            balance=sim.balance,
+            position=sim.position,
+            tz=self._index_tz(market_data),
         )
 
-        # 샤프 비율 (간단한 버전)
-        if len(equity_curve) > 1:
-            returns = np.diff(equity_curve) / equity_curve[:-1]
-            sharpe_ratio = (
-                (np.mean(returns) / np.std(returns)) * np.sqrt(252)
-                if np.std(returns) > 0
-                else 0
-            )
-        else:
-            sharpe_ratio = 0
+        online = self.online_metrics
+        for start in range(0, len(sim.equity), PROGRESS_EVERY):
+            online.update_batch(sim.equity[start:start + PROGRESS_EVERY])
+            if self.progress is not None:
+                self.progress.update(
+                    done=online.bars, message="simulation",
+                    metrics=online.snapshot()
+                )
 
-        return {
-            'total_return': round(total_return, 2),
-            'max_drawdown': round(max_drawdown, 2),
-            'total_trades': total_trades,
-            'win_rate': round(win_rate, 2),
-            'sharpe_ratio': round(sharpe_ratio, 2),
-            'final_value': round(equity_curve[-1], 2),
-        }
+        return trades, sim.equity.tolist() if self.keep_equity else []
+
+    @staticmethod
+    def _index_tz(market_data: pd.DataFrame):
+        """시장 데이터 인덱스의 시간대 이름 (없으면 None)"""
+
+        tz = getattr(market_data.index, 'tz', None)
+        return str(tz) if tz is not None else None
+
+    def _calculate_metrics(
+        self, trades: TradeLog, online: OnlineMetrics
+    ) -> Dict[str, Any]:
+        """성과 지표 계산 (수익 곡선 지표는 누적기 값, 거래 지표는 체결 배열로)"""
+
+        if online.bars == 0:
+            return {}
+
+        return online.snapshot(trade_metrics(
+            action=trades.action,
+            price=trades.price,
+            quantity=trades.quantity,
+            trade_index=trades.bar_index,
+            position=trades.position,
+            n_bars=online.bars,
+            commission=self.commission,
+        ))
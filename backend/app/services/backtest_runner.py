@@ -0,0 +1,299 @@
+"""
+백테스트 실행·저장 서비스
+
+API 의 동기 실행과 Celery 워커의 비동기 실행이 같은 코드를 사용합니다.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from app.config import settings
+from app.services.backtest_engine import BacktestEngine, BacktestResult
+from app.services.data_collector import DataCollector
+from app.services.portfolio import PanelData, PortfolioEngine, PortfolioResult
+from app.services.progress import ProgressReporter
+from app.services.result_cache import make_result_key
+from app.services.streaming import StreamingBacktestEngine, StreamingResult
+from app.utils.fingerprint import dataset_fingerprint
+
+
+def get_strategy(supabase, strategy_id: str) -> Optional[Dict[str, Any]]:
+    """전략 조회 (없으면 None)"""
+
+    response = supabase.table("bt_strategies")\
+        .select("*")\
+        .eq("id", strategy_id)\
+        .execute()
+
+    return response.data[0] if response.data else None
+
+
+async def run_backtest(
+    supabase,
+    data_collector: DataCollector,
+    strategy: Dict[str, Any],
+    symbol: str,
+    start_date: str,
+    end_date: str,
+    initial_capital: float,
+    commission: float,
+    progress: Optional[ProgressReporter] = None,
+    market_data: Optional[pd.DataFrame] = None
+) -> BacktestResult:
+    """시장 데이터를 불러와 백테스트 실행 (엔진은 스레드에서 실행)"""
+
+    # 시장 데이터 조회 (로컬 캐시 → Yahoo Finance → DB)
+    if market_data is None:
+        market_data = await data_collector.load_market_data(
+            supabase, symbol, start_date, end_date
+        )
+
+    engine = BacktestEngine(
+        strategy_code=strategy['code'],
+        parameters=strategy['parameters'],
+        initial_capital=initial_capital,
+        commission=commission,
+        progress=progress
+    )
+
+    # CPU 작업이 이벤트 루프를 막지 않도록 스레드에서 실행
+    return await asyncio.to_thread(engine.execute, market_data)
+
+
+async def load_panel(
+    supabase,
+    data_collector: DataCollector,
+    symbols: List[str],
+    start_date: str,
+    end_date: str,
+    concurrency: Optional[int] = None
+) -> Tuple[PanelData, Dict[str, str]]:
+    """
+    여러 종목의 시장 데이터를 동시에 불러와 패널로 정렬
+
+    Returns:
+        (패널, 불러오지 못한 종목 → 오류 메시지)
+    """
+
+    semaphore = asyncio.Semaphore(concurrency or settings.DATA_IMPORT_CONCURRENCY)
+
+    async def load(symbol: str):
+        async with semaphore:
+            return await data_collector.load_market_data(
+                supabase, symbol, start_date, end_date
+            )
+
+    results = await asyncio.gather(
+        *(load(symbol) for symbol in symbols), return_exceptions=True
+    )
+
+    frames, failures = {}, {}
+    for symbol, result in zip(symbols, results):
+        if isinstance(result, Exception):
+            failures[symbol] = str(result)
+        elif len(result):
+            frames[symbol] = result
+        else:
+            failures[symbol] = "No data"
+
+    panel = await asyncio.to_thread(PanelData.from_frames, frames)
+    return panel, failures
+
+
+async def run_portfolio_backtest(
+    strategy: Dict[str, Any],
+    panel: PanelData,
+    initial_capital: float,
+    commission: float,
+    progress: Optional[ProgressReporter] = None
+) -> PortfolioResult:
+    """포트폴리오 백테스트 실행 (엔진은 스레드에서 실행)"""
+
+    engine = PortfolioEngine(
+        strategy_code=strategy['code'],
+        parameters=strategy['parameters'],
+        initial_capital=initial_capital,
+        commission=commission,
+        progress=progress
+    )
+
+    return await asyncio.to_thread(engine.execute, panel)
+
+
+async def run_streaming_backtest(
+    supabase,
+    data_collector: DataCollector,
+    strategy: Dict[str, Any],
+    symbol: str,
+    start_date: str,
+    end_date: str,
+    initial_capital: float,
+    commission: float,
+    progress: Optional[ProgressReporter] = None
+) -> StreamingResult:
+    """로컬 캐시의 봉을 하나씩 흘려보내는 스트리밍 백테스트 (엔진은 스레드에서 실행)"""
+
+    engine = StreamingBacktestEngine(
+        strategy_code=strategy['code'],
+        parameters=strategy['parameters'],
+        initial_capital=initial_capital,
+        commission=commission,
+        progress=progress
+    )
+
+    bars = await data_collector.iter_market_bars(
+        supabase, symbol, start_date, end_date
+    )
+    return await asyncio.to_thread(engine.run, bars)
+
+
+def backtest_cache_key(
+    strategy: Dict[str, Any],
+    market_data: pd.DataFrame,
+    symbol: str,
+    start_date: str,
+    end_date: str,
+    initial_capital: float,
+    commission: float
+) -> str:
+    """백테스트 결과 캐시 키"""
+
+    return make_result_key(
+        'backtest',
+        strategy['code'],
+        strategy['parameters'] or {},
+        # 데이터 구간 + 내용 지문 (같은 구간이라도 데이터가 바뀌면 다른 키)
+        f"{symbol}:{start_date}:{end_date}:{dataset_fingerprint(market_data)}",
+        {
+            'initial_capital': float(initial_capital),
+            'commission': float(commission),
+            'mode': 'loop',
+        }
+    )
+
+
+def backtest_exists(supabase, backtest_id: str) -> bool:
+    """저장된 백테스트가 남아 있는지 확인"""
+
+    response = supabase.table("bt_backtests")\
+        .select("id")\
+        .eq("id", backtest_id)\
+        .execute()
+
+    return bool(response.data)
+
+
+def build_result_data(result: BacktestResult, commission: float) -> Dict[str, Any]:
+    """bt_backtests.result JSONB 필드 값"""
+
+    return {
+        "final_capital": result.final_capital,
+        "total_return": result.metrics.get('total_return', 0),
+        "total_return_pct": result.metrics.get('total_return_pct', 0),
+        "max_drawdown": result.metrics.get('max_drawdown', 0),
+        "sharpe_ratio": result.metrics.get('sharpe_ratio', 0),
+        "total_trades": result.metrics.get('total_trades', 0),
+        "win_rate": result.metrics.get('win_rate', 0),
+        "commission": commission,
+        **result.metrics  # 나머지 메트릭도 포함
+    }
+
+
+def save_trades(supabase, backtest_id: str, result: BacktestResult):
+    """거래 기록 저장"""
+
+    if not result.trades:
+        return
+
+    # 열 기반 거래 기록을 한 번에 레코드로 변환
+    # action -> trade_type, balance -> portfolio_value
+    trade_records = [
+        {
+            "backtest_id": backtest_id,
+            "timestamp": trade["timestamp"],
+            "trade_type": trade["action"],
+            "price": trade["price"],
+            "quantity": trade["quantity"],
+            "commission": trade["commission"],
+            "portfolio_value": trade["balance"],
+        }
+        for trade in result.trades.to_records()
+    ]
+
+    supabase.table("bt_backtest_trades")\
+        .insert(trade_records)\
+        .execute()
+
+
+def update_backtest(supabase, backtest_id: str, fields: Dict[str, Any]):
+    """bt_backtests 행 갱신"""
+
+    supabase.table("bt_backtests")\
+        .update(fields)\
+        .eq("id", backtest_id)\
+        .execute()
+
+
+async def run_pending_backtest(
+    supabase,
+    data_collector: DataCollector,
+    backtest_id: str,
+    request: Dict[str, Any]
+) -> str:
+    """
+    대기 중인 백테스트를 실행하고 결과 저장 (워커용)
+
+    상태를 running → completed / failed 로 갱신하고, 진행 상황은
+    backtest_id 를 작업 ID 로 하여 진행 상황 저장소에 남깁니다.
+
+    Returns:
+        최종 상태
+    """
+
+    progress = ProgressReporter(backtest_id, kind="backtest")
+    progress.update(message="loading data", force=True)
+
+    update_backtest(supabase, backtest_id, {
+        "status": "running",
+        "started_at": datetime.now().isoformat(),
+    })
+
+    try:
+        strategy = get_strategy(supabase, request['strategy_id'])
+        if strategy is None:
+            raise ValueError(f"Strategy {request['strategy_id']} not found")
+
+        result = await run_backtest(
+            supabase,
+            data_collector,
+            strategy,
+            request['symbol'],
+            request['start_date'],
+            request['end_date'],
+            request['initial_capital'],
+            request['commission'],
+            progress=progress
+        )
+
+        progress.update(message="saving", force=True)
+        save_trades(supabase, backtest_id, result)
+        update_backtest(supabase, backtest_id, {
+            "status": "completed",
+            "result": build_result_data(result, request['commission']),
+            "completed_at": datetime.now().isoformat(),
+        })
+        progress.finish("completed")
+        return "completed"
+
+    except Exception as e:
+        print(f"Error running backtest {backtest_id}: {e}")
+        update_backtest(supabase, backtest_id, {
+            "status": "failed",
+            "error_message": str(e),
+            "completed_at": datetime.now().isoformat(),
+        })
+        progress.finish("failed", message=str(e))
+        return "failed"
@@ -0,0 +1,102 @@
+"""
+최적화 체크포인트
+
+오래 걸리는 최적화가 워커 재시작으로 처음부터 다시 돌지 않도록 진행
+상태(평가한 결과 수·상위 결과, 평가 메모, 난수 상태, skopt Optimizer)를
+주기적으로 로컬 파일에 저장합니다. 같은 ID 로 다시 실행하면 저장된 지점부터
+이어서 평가합니다.
+
+    {OPTIMIZER_CHECKPOINT_DIR}/{checkpoint_id}.pkl
+        meta  (호출자가 남긴 요청 정보, 재개 API 용)
+        state (StrategyOptimizer 가 남긴 진행 상태)
+"""
+
+import os
+import pickle
+import re
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from app.config import settings
+
+
+# 저장 형식이 바뀌면 올려서 이전 체크포인트를 무시
+CHECKPOINT_VERSION = 1
+
+
+def checkpoint_path(checkpoint_id: str) -> str:
+    """체크포인트 파일 경로"""
+
+    safe_id = re.sub(r'[^A-Za-z0-9._-]', '_', checkpoint_id)
+    return os.path.join(settings.OPTIMIZER_CHECKPOINT_DIR, f'{safe_id}.pkl')
+
+
+def _read(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, 'rb') as f:
+            payload = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    if payload.get('version') != CHECKPOINT_VERSION:
+        return None
+    return payload
+
+
+class OptimizationCheckpoint:
+    """최적화 하나의 체크포인트 파일"""
+
+    def __init__(
+        self,
+        checkpoint_id: str,
+        meta: Optional[Dict[str, Any]] = None,
+        interval: Optional[float] = None  # None = 설정값 (초)
+    ):
+        self.checkpoint_id = checkpoint_id
+        self.path = checkpoint_path(checkpoint_id)
+        self.meta = meta or {}
+        self.interval = (
+            settings.OPTIMIZER_CHECKPOINT_INTERVAL if interval is None else interval
+        )
+        self._last_saved = time.monotonic()
+
+    def due(self) -> bool:
+        """마지막 저장 후 interval 이 지났는지"""
+
+        return time.monotonic() - self._last_saved >= self.interval
+
+    def save(self, state: Dict[str, Any]):
+        """진행 상태 저장 (임시 파일에 쓴 뒤 교체하므로 중간에 죽어도 이전 파일 유지)"""
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        payload = {
+            'version': CHECKPOINT_VERSION,
+            'meta': self.meta,
+            'state': state,
+            'saved_at': datetime.now(timezone.utc).isoformat(),
+        }
+        with open(self.path + '.tmp', 'wb') as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(self.path + '.tmp', self.path)
+        self._last_saved = time.monotonic()
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """저장된 진행 상태 (없으면 None)"""
+
+        payload = _read(self.path)
+        return payload['state'] if payload is not None else None
+
+    def delete(self):
+        """최적화가 끝나면 체크포인트 삭제"""
+
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def read_meta(checkpoint_id: str) -> Optional[Dict[str, Any]]:
+        """저장된 요청 정보 (체크포인트가 없으면 None)"""
+
+        payload = _read(checkpoint_path(checkpoint_id))
+        return payload['meta'] if payload is not None else None
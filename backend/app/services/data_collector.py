@@ -2,17 +2,150 @@
 시장 데이터 수집 서비스
 """
 
-import yfinance as yf
+import asyncio
+import logging
+import os
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from app.config import settings
+from app.services.data_source import OHLCV_COLUMNS, MarketDataSource, YahooDataSource
+from app.services.market_store import ParquetMarketStore, to_utc
+from app.services.mmap_store import MmapMarketStore
+from app.services.market_writer import (
+    copy_to_postgres,
+    iter_record_chunks,
+    upsert_chunks,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def _inclusive_end(end_date) -> pd.Timestamp:
+    """
+    end_date 를 포함하는 반열린 구간 [start, end) 의 끝
+
+    날짜만 주면 그 날 전체(다음 날 0시 전까지), 시각까지 주면 그 시각의
+    봉까지 포함합니다.
+    """
+
+    end = to_utc(end_date)
+    if end == end.normalize():
+        return end + pd.Timedelta(days=1)
+    return end + pd.Timedelta(1, unit='ns')
+
+
+@dataclass
+class ImportResult:
+    """심볼별 가져오기 결과"""
+    symbol: str
+    success: bool
+    records: int = 0
+    error: Optional[str] = None
 
 
 class DataCollector:
     """시장 데이터 수집기"""
 
-    def __init__(self):
-        pass
+    def __init__(
+        self,
+        store: Optional[ParquetMarketStore] = None,
+        source: Optional[MarketDataSource] = None,
+        max_workers: Optional[int] = None,
+        mmap_store: Optional[MmapMarketStore] = None
+    ):
+        # 로컬 Parquet 캐시 (설정된 경우 업스트림보다 먼저 조회)
+        if store is None and settings.MARKET_DATA_CACHE_DIR:
+            store = ParquetMarketStore(settings.MARKET_DATA_CACHE_DIR)
+        self.store = store
+
+        # Parquet 캐시의 메모리 맵 사본 (프로세스끼리 페이지 캐시를 공유하는 조회용)
+        if mmap_store is None and store is not None and settings.MARKET_DATA_MMAP:
+            mmap_store = MmapMarketStore(os.path.join(store.root, '_mmap'))
+        self.mmap_store = mmap_store
+        self.source = source or YahooDataSource()
+
+        # 블로킹 다운로드·저장용 스레드 풀 (이벤트 루프를 막지 않도록)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or settings.DATA_IMPORT_WORKERS,
+            thread_name_prefix="data-collector"
+        )
+
+    async def _run_blocking(self, func: Callable, *args):
+        """블로킹 함수를 스레드 풀에서 실행"""
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def _missing_ranges(
+        self,
+        symbol: str,
+        interval: str,
+        start_date: str,
+        end_date: str
+    ) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """로컬 캐시에 없는 구간 목록"""
+
+        return self.store.coverage(symbol, interval).gaps(start_date, end_date)
+
+    def _store_gap(
+        self,
+        symbol: str,
+        interval: str,
+        start: pd.Timestamp,
+        end: pd.Timestamp,
+        data: Optional[pd.DataFrame]
+    ):
+        """받아 온 구간을 저장하고 coverage 에 기록"""
+
+        if data is not None and not data.empty:
+            self.store.write(symbol, interval, data)
+
+        now = pd.Timestamp.now(tz='UTC')
+        if data is None or data.empty:
+            # 빈 응답은 일시 장애나 늦은 게시일 수 있으므로 충분히 지난 구간만
+            # '데이터 없음'으로 기록 (그 밖에는 다음 조회 때 다시 요청)
+            if end > now - pd.Timedelta(days=settings.MARKET_DATA_SETTLE_DAYS):
+                return
+        elif end > now:
+            # 아직 끝나지 않은 구간은 마지막 봉 직전까지만 기록
+            # (진행 중인 마지막 봉은 다음 수집 때 다시 받아 덮어씀)
+            end = to_utc(pd.DatetimeIndex(data.index).max())
+
+        self.store.mark_covered(symbol, interval, start, end)
+
+    def _sync_mirror(self, symbol: str, interval: str) -> bool:
+        """메모리 맵 사본을 Parquet 캐시에 맞춤 (사본을 쓸 수 없으면 False)"""
+
+        if self.mmap_store is None:
+            return False
+
+        # Parquet 파일이 바뀌었으면 사본을 다시 만듦
+        version = self.store.version(symbol, interval)
+        if not version:
+            return False
+        self.mmap_store.mirror(
+            symbol, interval, version,
+            lambda: self.store.read_all(symbol, interval)
+        )
+        return True
+
+    def _read_store(
+        self,
+        symbol: str,
+        interval: str,
+        start_date,
+        end_date
+    ) -> pd.DataFrame:
+        """로컬 캐시 [start, end) 조회 (메모리 맵 사본이 있으면 복사 없는 읽기 전용 뷰)"""
+
+        if self._sync_mirror(symbol, interval):
+            return self.mmap_store.read(symbol, interval, start_date, end_date).to_frame()
+        return self.store.read(symbol, interval, start_date, end_date)
 
     async def fetch_stock_data(
         self,
@@ -21,31 +154,207 @@ class DataCollector:
         end_date: str,
         interval: str = "1d"
     ) -> pd.DataFrame:
-        """주식 데이터 수집 (Yahoo Finance)"""
+        """주식 데이터 수집 (로컬 캐시 → Yahoo Finance)"""
 
-        try:
-            # yfinance를 사용하여 데이터 다운로드
-            ticker = yf.Ticker(symbol)
-            data = ticker.history(
-                start=start_date,
-                end=end_date,
-                interval=interval
-            )
+        return await self._run_blocking(
+            self._fetch_stock_data, symbol, start_date, end_date, interval
+        )
 
-            if data.empty:
-                raise ValueError(f"No data found for symbol {symbol}")
+    def _fetch_stock_data(
+        self,
+        symbol: str,
+        start_date: str,
+        end_date: str,
+        interval: str
+    ) -> pd.DataFrame:
+        if self.store is None:
+            return self._download(symbol, start_date, end_date, interval)
+
+        # 캐시에 없는 구간만 받아서 병합
+        self._fetch_gaps(symbol, interval, start_date, end_date)
+
+        data = self._read_store(symbol, interval, start_date, end_date)
+        if data.empty:
+            raise ValueError(f"No data found for symbol {symbol}")
+        return data
+
+    def _fetch_gaps(
+        self,
+        symbol: str,
+        interval: str,
+        start_date: str,
+        end_date: str
+    ) -> List[pd.DataFrame]:
+        """캐시에 없는 구간을 받아 저장하고, 새로 받은 데이터 목록 반환"""
+
+        downloaded = []
+        for start, end in self._missing_ranges(
+            symbol, interval, start_date, end_date
+        ):
+            try:
+                data = self._download(symbol, start, end, interval)
+            except ValueError:
+                # 휴장 등으로 데이터가 없는 구간 (정산 기간이 지난 것만 기록)
+                data = None
 
-            # 컬럼명을 소문자로 변경
-            data.columns = data.columns.str.lower()
+            self._store_gap(symbol, interval, start, end, data)
+            if data is not None and not data.empty:
+                downloaded.append(data)
+        return downloaded
 
-            # 필요한 컬럼만 선택 (OHLCV)
-            data = data[['open', 'high', 'low', 'close', 'volume']]
+    def _fetch_new_stock_data(
+        self,
+        symbol: str,
+        start_date: str,
+        end_date: str,
+        interval: str
+    ) -> List[pd.DataFrame]:
+        """
+        가져오기용: 이번에 새로 받은 구간의 데이터 목록
+
+        로컬 캐시가 있으면 이미 받은 구간은 다시 받지도 DB 에 다시 쓰지도
+        않습니다. 구간 전체에 데이터가 없으면 ValueError.
+        """
+
+        if self.store is None:
+            return [self._download(symbol, start_date, end_date, interval)]
+
+        downloaded = self._fetch_gaps(symbol, interval, start_date, end_date)
+        if not downloaded and self._read_store(
+            symbol, interval, start_date, end_date
+        ).empty:
+            raise ValueError(f"No data found for symbol {symbol}")
+        return downloaded
+
+    async def load_market_data(
+        self,
+        supabase,
+        symbol: str,
+        start_date: str,
+        end_date: str,
+        interval: str = "1d"
+    ) -> pd.DataFrame:
+        """백테스트용 시장 데이터 조회 (로컬 캐시 → Yahoo Finance → DB)"""
 
+        if self.store is None:
+            data = self._query_database(supabase, symbol, start_date, end_date)
+            if data.empty:
+                # DB에 데이터가 없으면 자동으로 수집하여 저장
+                data = await self._run_blocking(
+                    self._download, symbol, start_date, end_date, interval
+                )
+                await self.save_to_database(supabase, symbol, data)
             return data
 
-        except Exception as e:
-            print(f"Error fetching stock data: {e}")
-            raise
+        # DB 조회(lte)와 같이 end_date 봉까지 포함
+        end_bound = _inclusive_end(end_date)
+
+        await self._fill_cache(supabase, symbol, start_date, end_bound, interval)
+
+        data = self._read_store(symbol, interval, start_date, end_bound)
+        if data.empty:
+            raise ValueError(f"No data found for symbol {symbol}")
+        return data
+
+    async def iter_market_bars(
+        self,
+        supabase,
+        symbol: str,
+        start_date: str,
+        end_date: str,
+        interval: str = "1d"
+    ) -> Iterator[tuple]:
+        """
+        스트리밍 백테스트용 봉 이터레이터 (end_date 포함)
+
+        로컬 캐시를 채운 뒤 Parquet 파일을 배치 단위로 읽으므로 구간 전체를
+        메모리에 올리지 않습니다. 봉은 (timestamp, open, high, low, close, volume).
+        """
+
+        if self.store is None:
+            data = await self.load_market_data(
+                supabase, symbol, start_date, end_date, interval
+            )
+            return data[OHLCV_COLUMNS].itertuples(name=None)
+
+        end_bound = _inclusive_end(end_date)
+        await self._fill_cache(supabase, symbol, start_date, end_bound, interval)
+        return self.store.iter_bars(symbol, interval, start_date, end_bound)
+
+    async def _fill_cache(
+        self,
+        supabase,
+        symbol: str,
+        start_date: str,
+        end_bound: pd.Timestamp,
+        interval: str
+    ):
+        """캐시에 없는 구간만 Yahoo Finance 에서 받아 병합 (DB 에도 저장)"""
+
+        for start, end in self._missing_ranges(
+            symbol, interval, start_date, end_bound
+        ):
+            try:
+                data = await self._run_blocking(
+                    self._download, symbol, start, end, interval
+                )
+            except ValueError:
+                # 휴장 등으로 데이터가 없는 구간 (정산 기간이 지난 것만 기록)
+                self._store_gap(symbol, interval, start, end, None)
+                continue
+            except Exception:
+                # 업스트림 장애 시 DB 데이터로 대체. DB 는 구간 일부만 가지고
+                # 있을 수 있으므로 coverage 에는 기록하지 않음
+                data = self._query_database(
+                    supabase, symbol, start.isoformat(), end.isoformat(),
+                    inclusive_end=False
+                )
+                self.store.write(symbol, interval, data)
+                continue
+
+            await self.save_to_database(supabase, symbol, data)
+            self._store_gap(symbol, interval, start, end, data)
+
+    def _query_database(
+        self,
+        supabase,
+        symbol: str,
+        start_date: str,
+        end_date: str,
+        inclusive_end: bool = True
+    ) -> pd.DataFrame:
+        """bt_market_data 조회 결과를 DataFrame 으로 변환"""
+
+        query = supabase.table("bt_market_data")\
+            .select("timestamp, open, high, low, close, volume")\
+            .eq("symbol", symbol)\
+            .gte("timestamp", start_date)
+
+        if inclusive_end:
+            query = query.lte("timestamp", end_date)
+        else:
+            query = query.lt("timestamp", end_date)
+
+        response = query.order("timestamp").execute()
+
+        if not response.data:
+            return pd.DataFrame(columns=['open', 'high', 'low', 'close', 'volume'])
+
+        data = pd.DataFrame(response.data)
+        data['timestamp'] = pd.to_datetime(data['timestamp'], utc=True)
+        data = data.set_index('timestamp')
+        return data[['open', 'high', 'low', 'close', 'volume']]
+
+    def _download(
+        self,
+        symbol: str,
+        start_date,
+        end_date,
+        interval: str = "1d"
+    ) -> pd.DataFrame:
+        """업스트림 소스에서 OHLCV 다운로드 (블로킹)"""
+
+        return self.source.download(symbol, start_date, end_date, interval)
 
     async def fetch_crypto_data(
         self,
@@ -59,15 +368,76 @@ class DataCollector:
         try:
             # 암호화폐는 Yahoo Finance에서도 가능
             # 예: BTC-USD, ETH-USD
-            if not symbol.endswith('-USD'):
-                symbol = f"{symbol}-USD"
-
-            return await self.fetch_stock_data(symbol, start_date, end_date, interval)
+            return await self.fetch_stock_data(
+                self._crypto_symbol(symbol), start_date, end_date, interval
+            )
 
         except Exception as e:
             print(f"Error fetching crypto data: {e}")
             raise
 
+    @staticmethod
+    def _crypto_symbol(symbol: str) -> str:
+        """Yahoo Finance 암호화폐 심볼 (예: BTC -> BTC-USD)"""
+
+        return symbol if symbol.endswith('-USD') else f"{symbol}-USD"
+
+    async def import_symbols(
+        self,
+        supabase,
+        symbols: List[str],
+        start_date: str,
+        end_date: str,
+        interval: str = "1d",
+        asset_type: str = "stock",
+        concurrency: Optional[int] = None,
+        on_progress: Optional[Callable[[int, int, ImportResult], None]] = None
+    ) -> List[ImportResult]:
+        """
+        여러 심볼을 동시에 가져와 DB에 저장
+
+        다운로드는 스레드 풀에서 최대 concurrency 개까지 동시에 실행되고,
+        먼저 끝난 심볼의 DB 저장은 나머지 다운로드와 겹쳐 진행됩니다.
+        로컬 캐시가 있으면 새로 받은 구간만 DB 에 저장합니다.
+        한 심볼이 실패해도 나머지는 계속 진행합니다.
+
+        Args:
+            on_progress: 심볼 하나가 끝날 때마다 (완료 수, 전체 수, 결과) 로 호출
+
+        Returns:
+            입력 순서대로의 심볼별 결과
+        """
+
+        semaphore = asyncio.Semaphore(concurrency or settings.DATA_IMPORT_CONCURRENCY)
+        completed = 0
+
+        async def import_one(symbol: str) -> ImportResult:
+            nonlocal completed
+
+            source_symbol = (
+                self._crypto_symbol(symbol) if asset_type == "crypto" else symbol
+            )
+            try:
+                async with semaphore:
+                    downloaded = await self._run_blocking(
+                        self._fetch_new_stock_data,
+                        source_symbol, start_date, end_date, interval
+                    )
+                # 저장은 세마포어 밖에서 진행 (다음 다운로드와 겹침)
+                records = 0
+                for data in downloaded:
+                    records += await self.save_to_database(supabase, symbol, data)
+                result = ImportResult(symbol=symbol, success=True, records=records)
+            except Exception as e:
+                result = ImportResult(symbol=symbol, success=False, error=str(e))
+
+            completed += 1
+            if on_progress is not None:
+                on_progress(completed, len(symbols), result)
+            return result
+
+        return list(await asyncio.gather(*(import_one(s) for s in symbols)))
+
     def get_available_symbols(self, asset_type: str = "stock") -> list:
         """사용 가능한 심볼 목록"""
 
@@ -96,29 +466,53 @@ class DataCollector:
         else:
             return []
 
-    async def save_to_database(self, supabase, symbol: str, data: pd.DataFrame):
-        """Supabase bt_market_data 테이블에 저장"""
+    async def save_to_database(
+        self,
+        supabase,
+        symbol: str,
+        data: pd.DataFrame,
+        chunk_size: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        retries: Optional[int] = None
+    ) -> int:
+        """
+        bt_market_data 테이블에 청크 단위로 저장
+
+        MARKET_DATA_USE_COPY 와 DATABASE_URL 이 설정되어 있으면 Postgres COPY 로, 아니면 Supabase
+        upsert 를 동시에 max_in_flight 개까지 보내 저장합니다.
+
+        Returns:
+            저장한 레코드 수
+        """
+
+        if data.empty:
+            return 0
+
+        chunk_size = chunk_size or settings.MARKET_DATA_UPSERT_CHUNK_SIZE
+
+        use_copy = settings.MARKET_DATA_USE_COPY and bool(settings.DATABASE_URL)
+        logger.info(
+            "Saving %d %s rows via %s", len(data), symbol,
+            "Postgres COPY" if use_copy else "Supabase upsert"
+        )
 
         try:
-            # DataFrame을 레코드 리스트로 변환
-            records = []
-            for timestamp, row in data.iterrows():
-                records.append({
-                    "symbol": symbol,
-                    "timestamp": timestamp.isoformat(),
-                    "open": float(row['open']),
-                    "high": float(row['high']),
-                    "low": float(row['low']),
-                    "close": float(row['close']),
-                    "volume": int(row['volume']),
-                })
-
-            # Supabase에 배치 삽입
+            if use_copy:
+                return await copy_to_postgres(symbol, data, chunk_size)
+
             # 중복 데이터 방지를 위해 upsert 사용
-            response = supabase.table("bt_market_data").upsert(records).execute()
+            async def upsert(records):
+                await self._run_blocking(
+                    supabase.table("bt_market_data").upsert(records).execute
+                )
 
-            return len(records)
+            return await upsert_chunks(
+                upsert,
+                iter_record_chunks(symbol, data, chunk_size),
+                max_in_flight=max_in_flight or settings.MARKET_DATA_UPSERT_IN_FLIGHT,
+                retries=settings.MARKET_DATA_UPSERT_RETRIES if retries is None else retries
+            )
 
         except Exception as e:
-            print(f"Error saving to database: {e}")
+            logger.error("Error saving %s to database: %s", symbol, e)
             raise
@@ -0,0 +1,105 @@
+"""
+시장 데이터 업스트림 소스
+
+DataCollector 는 소스의 download 만 호출하므로 Yahoo Finance 대신
+다른 소스(테스트용 메모리 소스 등)를 끼워 넣을 수 있습니다.
+download 는 블로킹 호출이며 DataCollector 가 스레드 풀에서 실행합니다.
+"""
+
+import logging
+from typing import Dict
+
+import pandas as pd
+
+
+logger = logging.getLogger(__name__)
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+
+class MarketDataSource:
+    """업스트림 시장 데이터 소스"""
+
+    def download(
+        self,
+        symbol: str,
+        start_date,
+        end_date,
+        interval: str = "1d"
+    ) -> pd.DataFrame:
+        """
+        [start_date, end_date) 구간 OHLCV 다운로드
+
+        Raises:
+            ValueError: 구간에 데이터가 없는 경우
+        """
+        raise NotImplementedError
+
+
+class YahooDataSource(MarketDataSource):
+    """Yahoo Finance (yfinance)"""
+
+    def download(
+        self,
+        symbol: str,
+        start_date,
+        end_date,
+        interval: str = "1d"
+    ) -> pd.DataFrame:
+        import yfinance as yf
+
+        try:
+            # yfinance를 사용하여 데이터 다운로드
+            ticker = yf.Ticker(symbol)
+            data = ticker.history(
+                start=start_date,
+                end=end_date,
+                interval=interval
+            )
+
+            if data.empty:
+                raise ValueError(f"No data found for symbol {symbol}")
+
+            # 컬럼명을 소문자로 변경
+            data.columns = data.columns.str.lower()
+
+            # 필요한 컬럼만 선택 (OHLCV)
+            data = data[OHLCV_COLUMNS]
+
+            return data
+
+        except Exception as e:
+            logger.error("Error fetching stock data for %s: %s", symbol, e)
+            raise
+
+
+class FrameDataSource(MarketDataSource):
+    """메모리 DataFrame 소스 (테스트·오프라인용)"""
+
+    def __init__(self, frames: Dict[str, pd.DataFrame]):
+        self.frames = frames
+
+    def download(
+        self,
+        symbol: str,
+        start_date,
+        end_date,
+        interval: str = "1d"
+    ) -> pd.DataFrame:
+        if symbol not in self.frames:
+            raise KeyError(f"Unknown symbol {symbol}")
+
+        data = self.frames[symbol]
+        index = pd.DatetimeIndex(data.index)
+        start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+        if index.tz is not None:
+            start = start.tz_localize(index.tz) if start.tzinfo is None else start
+            end = end.tz_localize(index.tz) if end.tzinfo is None else end
+        else:
+            start = start.tz_convert(None) if start.tzinfo is not None else start
+            end = end.tz_convert(None) if end.tzinfo is not None else end
+
+        data = data[(index >= start) & (index < end)]
+        if data.empty:
+            raise ValueError(f"No data found for symbol {symbol}")
+        return data[OHLCV_COLUMNS]
@@ -0,0 +1,146 @@
+"""
+최적화 평가 메모
+
+(정규화한 파라미터, 평가 구간) 키로 이미 평가한 조합의 지표를 저장합니다.
+무작위 서치의 중복 조합이나 베이지안 최적화가 다시 제안한 점은 백테스트를
+다시 돌리지 않습니다. 범위(scope)는 전략 코드, 데이터 지문, 엔진 설정으로
+정하므로 persistent 저장소를 쓰면 같은 조건의 다른 최적화와도 공유됩니다.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.services.result_cache import MemoryResultCache, RedisResultCache
+from app.utils.fingerprint import stable_hash
+
+
+def normalize_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    """NumPy 스칼라를 파이썬 값으로 (키 순서는 해시에서 정렬)"""
+
+    return {
+        name: value.item() if isinstance(value, np.generic) else value
+        for name, value in params.items()
+    }
+
+
+class EvaluationMemo:
+    """
+    파라미터 세트 → 성과 지표 메모 (최적화 하나 단위, 선택적으로 공유 저장소)
+
+    최근 maxsize 개 항목만 유지 (LRU) 하므로 탐색 크기와 무관하게 메모리가
+    일정합니다.
+    """
+
+    def __init__(self, scope: str, store=None, maxsize: Optional[int] = None):
+        self.scope = scope
+        self.store = store  # get / set 을 가진 공유 저장소 (None = 이번 최적화만)
+        self.maxsize = maxsize or settings.EVALUATION_MEMO_SIZE
+        self.hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def key(self, params: Dict[str, Any], rows: Optional[Tuple[int, int]] = None) -> str:
+        return stable_hash({
+            'scope': self.scope,
+            'params': normalize_params(params),
+            'rows': list(rows) if rows is not None else None,
+        })
+
+    def lookup(self, keys: List[str]) -> List[str]:
+        """
+        메모에 없는 키 목록 (중복 제거, 처음 나온 순서)
+
+        공유 저장소에 있는 값은 이번 메모로 가져옵니다. 통계는 중복 키를
+        포함해 한 번 평가로 충분한 횟수만큼 hits 로 셉니다.
+        """
+
+        missing = []
+        seen = set()
+        for key in keys:
+            if key in self._entries or key in seen:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                self.hits += 1
+                continue
+
+            if self.store is not None:
+                stored = self.store.get(key)
+                if stored is not None:
+                    self._remember(key, stored)
+                    self.hits += 1
+                    self.persistent_hits += 1
+                    continue
+
+            seen.add(key)
+            missing.append(key)
+            self.misses += 1
+
+        return missing
+
+    def _remember(self, key: str, metrics: Dict[str, Any]):
+        self._entries[key] = metrics
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def set(self, key: str, metrics: Dict[str, Any]):
+        self._remember(key, metrics)
+        if self.store is not None:
+            self.store.set(key, metrics)
+
+    def get(self, key: str) -> Dict[str, Any]:
+        return dict(self._entries[key])
+
+    def checkpoint(self) -> Dict[str, Any]:
+        """메모 항목과 통계 (restore 로 복원)"""
+
+        return {
+            'entries': list(self._entries.items()),
+            'hits': self.hits,
+            'persistent_hits': self.persistent_hits,
+            'misses': self.misses,
+        }
+
+    def restore(self, state: Dict[str, Any]):
+        self._entries = OrderedDict(state['entries'])
+        self.hits = state['hits']
+        self.persistent_hits = state['persistent_hits']
+        self.misses = state['misses']
+
+    def stats(self) -> Dict[str, int]:
+        """평가 통계 (saved = 백테스트를 생략한 횟수)"""
+
+        return {
+            'evaluated': self.misses,
+            'saved': self.hits,
+            'persistent_hits': self.persistent_hits,
+        }
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_evaluation_store():
+    """최적화 간 공유 평가 저장소 (프로세스당 하나)"""
+
+    global _store
+    with _store_lock:
+        if _store is None:
+            if settings.RESULT_CACHE_REDIS_URL:
+                _store = RedisResultCache(
+                    settings.RESULT_CACHE_REDIS_URL,
+                    ttl=settings.RESULT_CACHE_TTL_SECONDS,
+                    prefix="evaluation:"
+                )
+            else:
+                _store = MemoryResultCache(
+                    maxsize=settings.EVALUATION_MEMO_SIZE,
+                    ttl=settings.RESULT_CACHE_TTL_SECONDS
+                )
+        return _store
@@ -0,0 +1,391 @@
+"""
+기술 지표 라이브러리 (전략 샌드박스에 `ta` 로 노출)
+
+    def strategy(data, params):
+        short = ta.sma(data['close'], params['short_period'])
+        long = ta.sma(data['close'], params['long_period'])
+        return np.where(short > long, BUY, SELL)
+
+결과는 (입력 버퍼 식별자, 지표, 파라미터) 키로 프로세스 전역 LRU 캐시에
+저장되므로, 그리드 서치에서 같은 기간의 이동평균은 한 번만 계산됩니다.
+식별자는 전체 내용을 해시하지 않고 입력이 가리키는 기반 배열(살아 있는
+동안 고유한 토큰)과 그 안의 위치·길이·간격, 그리고 처음·마지막을 포함한
+표본 값 몇 개의 해시로 정합니다. 표본 덕분에 같은 버퍼를 제자리에서 고쳐도
+대부분 다른 키가 되어 이전 결과를 돌려주지 않습니다. 입력은 pandas Series
+또는 NumPy 배열이며, Series 를 넣으면 같은 인덱스의 Series / DataFrame 을
+반환합니다 (캐시 배열을 공유하므로 읽기 전용).
+
+표본에 들지 않은 위치만 바뀌면 알아채지 못하므로, 같은 버퍼의 내용을
+바꿔 가며 쓰는 경우(스트리밍 링 버퍼 등)에는 uncached() 안에서 호출해
+캐시를 거치지 않게 합니다.
+
+parent_window() 안에서는 입력이 부모 데이터셋 열의 연속 구간 뷰이면 지표를
+부모 전체에 대해 한 번 계산하고 잘라서 반환합니다. 지표는 모두 인과적이라
+(봉 t 값은 t 이전 데이터만 사용) 잘라도 미래 정보가 섞이지 않으며, 겹치는
+워크포워드 구간들이 같은 캐시 항목을 공유합니다.
+"""
+
+import contextvars
+import itertools
+import threading
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from app.config import settings
+
+
+ArrayLike = Union[pd.Series, np.ndarray]
+
+
+class IndicatorCache:
+    """지표 계산 결과 LRU 캐시 (결과 배열의 총 바이트 수로 용량 제한)"""
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        self.max_bytes = (
+            max_bytes if max_bytes is not None
+            else settings.INDICATOR_CACHE_MB * 1024 * 1024
+        )
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._entries: "OrderedDict[tuple, Dict[str, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(
+        self,
+        key: tuple,
+        compute: Callable[[], Dict[str, np.ndarray]]
+    ) -> Dict[str, np.ndarray]:
+        with self._lock:
+            columns = self._entries.get(key)
+            if columns is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return columns
+            self.misses += 1
+
+        columns = compute()
+        for values in columns.values():
+            values.flags.writeable = False
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = columns
+                self.nbytes += _nbytes(columns)
+            self._entries.move_to_end(key)
+            while self.nbytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self.nbytes -= _nbytes(evicted)
+
+        return columns
+
+    def stats(self) -> Dict[str, int]:
+        """캐시 통계"""
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._entries),
+            'nbytes': self.nbytes,
+            'max_bytes': self.max_bytes,
+        }
+
+    def clear(self):
+        """캐시 비우기 (통계 포함)"""
+
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+
+def _nbytes(columns: Dict[str, np.ndarray]) -> int:
+    return sum(values.nbytes for values in columns.values())
+
+
+# 프로세스 전역 캐시
+indicator_cache = IndicatorCache()
+
+
+def _values(series: ArrayLike) -> np.ndarray:
+    return np.asarray(series, dtype=np.float64)
+
+
+class _BufferTokens:
+    """기반 배열 → 토큰 (배열이 해제되면 항목 제거, 토큰은 재사용하지 않음)"""
+
+    def __init__(self):
+        self._tokens: Dict[int, int] = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def token(self, base: np.ndarray) -> int:
+        key = id(base)
+        with self._lock:
+            token = self._tokens.get(key)
+            if token is None:
+                token = next(self._counter)
+                self._tokens[key] = token
+                weakref.finalize(base, self._tokens.pop, key, None)
+        return token
+
+
+_buffer_tokens = _BufferTokens()
+
+
+# 내용 확인용 표본 수 (처음·마지막 포함, 길이와 무관하게 일정한 비용)
+_CONTENT_SAMPLES = 64
+
+
+def _content_sample(values: np.ndarray) -> int:
+    """처음·마지막과 고르게 고른 표본 값의 해시"""
+
+    n = len(values)
+    if n <= _CONTENT_SAMPLES:
+        return hash(values.tobytes())
+    positions = np.linspace(0, n - 1, _CONTENT_SAMPLES).astype(np.intp)
+    return hash(values[positions].tobytes())
+
+
+def _identity(values: np.ndarray) -> tuple:
+    """배열 식별자 (기반 배열 토큰, 바이트 위치, 길이, 간격, dtype, 표본 해시)"""
+
+    base = values
+    while isinstance(base.base, np.ndarray):
+        base = base.base
+    offset = (
+        values.__array_interface__['data'][0] - base.__array_interface__['data'][0]
+    )
+    return (
+        _buffer_tokens.token(base), offset, len(values), values.strides, values.dtype.str,
+        _content_sample(values)
+    )
+
+
+class _ParentWindow:
+    """부모 데이터셋 열과 현재 구간 [start, stop)"""
+
+    def __init__(self, columns: List[np.ndarray], start: int, stop: int):
+        self.columns = columns
+        self.start = start
+        self.stop = stop
+
+    def locate(self, values: np.ndarray) -> Optional[np.ndarray]:
+        """values 가 부모 열의 [start, stop) 뷰이면 그 부모 열 (아니면 None)"""
+
+        if len(values) != self.stop - self.start:
+            return None
+
+        address = values.__array_interface__['data'][0]
+        for column in self.columns:
+            offset = column.__array_interface__['data'][0] + self.start * column.strides[0]
+            if address == offset and values.strides == column.strides:
+                return column
+        return None
+
+
+_parent_window: contextvars.ContextVar = contextvars.ContextVar(
+    'indicator_parent_window', default=None
+)
+_cache_disabled: contextvars.ContextVar = contextvars.ContextVar(
+    'indicator_cache_disabled', default=False
+)
+
+
+@contextmanager
+def uncached():
+    """캐시 없이 지표 계산 (버퍼 내용이 호출마다 바뀌는 경우)"""
+
+    token = _cache_disabled.set(True)
+    try:
+        yield
+    finally:
+        _cache_disabled.reset(token)
+
+
+@contextmanager
+def parent_window(parent: pd.DataFrame, start: int, stop: int):
+    """
+    parent.iloc[start:stop] 에 대한 전략 실행 동안 지표를 부모 기준으로 계산
+
+    구간 앞부분도 이전 데이터로 워밍업된 지표 값을 받습니다.
+    """
+
+    columns = [
+        _values(parent[column]) for column in parent.columns
+        if pd.api.types.is_numeric_dtype(parent[column])
+    ]
+    token = _parent_window.set(_ParentWindow(columns, start, stop))
+    try:
+        yield
+    finally:
+        _parent_window.reset(token)
+
+
+def _memoized(
+    name: str,
+    inputs: Tuple[ArrayLike, ...],
+    params: tuple,
+    compute: Callable[..., Dict[str, np.ndarray]]
+):
+    """캐시를 거쳐 지표 계산 후 입력 형태에 맞춰 반환"""
+
+    arrays = tuple(_values(series) for series in inputs)
+
+    window = _parent_window.get()
+    parents = (
+        [window.locate(values) for values in arrays] if window is not None
+        else [None]
+    )
+
+    if _cache_disabled.get():
+        columns = compute(*arrays)
+    elif all(parent is not None for parent in parents):
+        # 부모 열 전체로 계산한 결과를 현재 구간으로 잘라 사용
+        key = (tuple(_identity(parent) for parent in parents), name, params)
+        columns = indicator_cache.get_or_compute(key, lambda: compute(*parents))
+        columns = {
+            column: values[window.start:window.stop]
+            for column, values in columns.items()
+        }
+    else:
+        key = (tuple(_identity(values) for values in arrays), name, params)
+        columns = indicator_cache.get_or_compute(key, lambda: compute(*arrays))
+
+    # 캐시 배열을 복사하지 않고 감싸서 반환 (읽기 전용)
+    index = inputs[0].index if isinstance(inputs[0], pd.Series) else None
+    if len(columns) == 1:
+        values = next(iter(columns.values()))
+        return pd.Series(values, index=index, copy=False) if index is not None else values
+    if index is None:
+        return dict(columns)
+    return pd.DataFrame(columns, index=index)
+
+
+def _rolling(values: np.ndarray, period: int):
+    return pd.Series(values).rolling(period)
+
+
+def _wilder(values: np.ndarray, period: int) -> np.ndarray:
+    """와일더 평활 (alpha = 1 / period)"""
+
+    return pd.Series(values).ewm(alpha=1 / period, adjust=False).mean().to_numpy()
+
+
+def sma(series: ArrayLike, period: int):
+    """단순 이동평균"""
+
+    return _memoized('sma', (series,), (int(period),), lambda x: {
+        'sma': _rolling(x, int(period)).mean().to_numpy()
+    })
+
+
+def ema(series: ArrayLike, period: int):
+    """지수 이동평균 (span = period)"""
+
+    return _memoized('ema', (series,), (int(period),), lambda x: {
+        'ema': pd.Series(x).ewm(span=int(period), adjust=False).mean().to_numpy()
+    })
+
+
+def rsi(series: ArrayLike, period: int = 14):
+    """상대강도지수 (와일더 평활, 0 ~ 100)"""
+
+    def compute(x):
+        delta = np.diff(x, prepend=np.nan)
+        gain = _wilder(np.where(delta > 0, delta, 0.0), int(period))
+        loss = _wilder(np.where(delta < 0, -delta, 0.0), int(period))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values = 100 - 100 / (1 + gain / loss)
+        values[:int(period)] = np.nan
+        return {'rsi': values}
+
+    return _memoized('rsi', (series,), (int(period),), compute)
+
+
+def macd(series: ArrayLike, fast: int = 12, slow: int = 26, signal: int = 9):
+    """MACD (macd, signal, hist 열)"""
+
+    def compute(x):
+        line = ema(x, fast) - ema(x, slow)
+        signal_line = pd.Series(line).ewm(span=int(signal), adjust=False).mean().to_numpy()
+        return {'macd': line, 'signal': signal_line, 'hist': line - signal_line}
+
+    return _memoized(
+        'macd', (series,), (int(fast), int(slow), int(signal)), compute
+    )
+
+
+def bollinger(series: ArrayLike, period: int = 20, num_std: float = 2.0):
+    """볼린저 밴드 (middle, upper, lower 열, 모표준편차 기준)"""
+
+    def compute(x):
+        middle = sma(x, period)
+        std = rolling_std(x, period)
+        return {
+            'middle': middle,
+            'upper': middle + num_std * std,
+            'lower': middle - num_std * std,
+        }
+
+    return _memoized(
+        'bollinger', (series,), (int(period), float(num_std)), compute
+    )
+
+
+def atr(high: ArrayLike, low: ArrayLike, close: ArrayLike, period: int = 14):
+    """평균 실제 범위 (와일더 평활)"""
+
+    def compute(h, l, c):
+        prev_close = np.concatenate(([np.nan], c[:-1]))
+        true_range = np.fmax(
+            h - l, np.fmax(np.abs(h - prev_close), np.abs(l - prev_close))
+        )
+        return {'atr': _wilder(true_range, int(period))}
+
+    return _memoized('atr', (high, low, close), (int(period),), compute)
+
+
+def rolling_std(series: ArrayLike, period: int, ddof: int = 0):
+    """이동 표준편차"""
+
+    return _memoized('rolling_std', (series,), (int(period), int(ddof)), lambda x: {
+        'std': _rolling(x, int(period)).std(ddof=int(ddof)).to_numpy()
+    })
+
+
+def rolling_min(series: ArrayLike, period: int):
+    """이동 최솟값"""
+
+    return _memoized('rolling_min', (series,), (int(period),), lambda x: {
+        'min': _rolling(x, int(period)).min().to_numpy()
+    })
+
+
+def rolling_max(series: ArrayLike, period: int):
+    """이동 최댓값"""
+
+    return _memoized('rolling_max', (series,), (int(period),), lambda x: {
+        'max': _rolling(x, int(period)).max().to_numpy()
+    })
+
+
+# 샌드박스에 노출하는 지표 함수 묶음
+ta = SimpleNamespace(
+    sma=sma,
+    ema=ema,
+    rsi=rsi,
+    macd=macd,
+    bollinger=bollinger,
+    atr=atr,
+    rolling_std=rolling_std,
+    rolling_min=rolling_min,
+    rolling_max=rolling_max,
+)
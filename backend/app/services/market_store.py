@@ -0,0 +1,341 @@
+"""
+로컬 열 기반 시장 데이터 저장소 (Parquet)
+
+심볼·주기마다 하나의 Parquet 데이터셋을 두고 연도별로 분할합니다.
+
+    {root}/{interval}/{symbol}/year=2024/data.parquet
+    {root}/{interval}/{symbol}/_coverage.json   (받아 온 구간 목록)
+    {root}/{interval}/{symbol}/.lock            (쓰기 잠금)
+
+API 프로세스와 Celery 워커가 같은 디렉터리를 쓰므로, 읽고-병합하고-교체하는
+쓰기는 데이터셋 단위 파일 잠금(flock) 안에서 writer 마다 다른 임시 파일로
+진행합니다.
+"""
+
+import fcntl
+import json
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+SCHEMA = pa.schema([
+    ('timestamp', pa.timestamp('ns', tz='UTC')),
+    ('open', pa.float64()),
+    ('high', pa.float64()),
+    ('low', pa.float64()),
+    ('close', pa.float64()),
+    ('volume', pa.float64()),
+])
+
+
+def to_utc(timestamp) -> pd.Timestamp:
+    """타임스탬프를 UTC 로 변환 (시간대가 없으면 UTC 로 간주)"""
+
+    timestamp = pd.Timestamp(timestamp)
+    if timestamp.tzinfo is None:
+        return timestamp.tz_localize('UTC')
+    return timestamp.tz_convert('UTC')
+
+
+@contextmanager
+def dataset_lock(path: str):
+    """데이터셋 디렉터리 쓰기 잠금 (프로세스·스레드 간 배타)"""
+
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, '.lock'), 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _replace_file(target: str, write: Callable[[str], None]):
+    """
+    같은 디렉터리의 고유한 임시 파일에 쓴 뒤 target 으로 교체
+
+    '.' 로 시작하는 임시 파일은 pyarrow 데이터셋 탐색에서 제외되므로 동시에
+    읽는 쪽이 쓰는 중인 파일을 보지 않습니다.
+    """
+
+    directory, name = os.path.split(target)
+    fd, tmp_filename = tempfile.mkstemp(dir=directory, prefix=f'.{name}.', suffix='.tmp')
+    os.close(fd)
+    try:
+        write(tmp_filename)
+        os.replace(tmp_filename, target)
+    except BaseException:
+        if os.path.exists(tmp_filename):
+            os.remove(tmp_filename)
+        raise
+
+
+class CoverageIndex:
+    """
+    업스트림에서 받아 온 시간 구간 집합
+
+    구간은 [start, end) 이며 겹치거나 맞닿은 구간은 하나로 합칩니다.
+    """
+
+    def __init__(self, ranges: List[Tuple[pd.Timestamp, pd.Timestamp]] = None):
+        self.ranges: List[Tuple[pd.Timestamp, pd.Timestamp]] = []
+        for start, end in ranges or []:
+            self.add(start, end)
+
+    def add(self, start, end):
+        """구간 추가"""
+
+        start, end = to_utc(start), to_utc(end)
+        if start >= end:
+            return
+
+        merged = []
+        for range_start, range_end in self.ranges:
+            if range_end < start or range_start > end:
+                merged.append((range_start, range_end))
+            else:
+                start, end = min(start, range_start), max(end, range_end)
+        merged.append((start, end))
+        self.ranges = sorted(merged)
+
+    def gaps(self, start, end) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """[start, end) 중 아직 받지 않은 구간 목록"""
+
+        start, end = to_utc(start), to_utc(end)
+        missing = []
+        cursor = start
+        for range_start, range_end in self.ranges:
+            if range_end <= cursor:
+                continue
+            if range_start >= end:
+                break
+            if range_start > cursor:
+                missing.append((cursor, range_start))
+            cursor = max(cursor, range_end)
+        if cursor < end:
+            missing.append((cursor, end))
+        return missing
+
+    def to_json(self) -> list:
+        return [[start.isoformat(), end.isoformat()] for start, end in self.ranges]
+
+    @classmethod
+    def from_json(cls, ranges: list) -> "CoverageIndex":
+        return cls([(to_utc(start), to_utc(end)) for start, end in ranges])
+
+
+class ParquetMarketStore:
+    """
+    심볼·주기별 Parquet 데이터셋
+
+    조회는 연도 분할 디렉터리와 타임스탬프 조건을 pyarrow 에 넘겨
+    필요한 파일과 행 그룹만 읽습니다. 조회 구간은 [start, end) 입니다.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def dataset_path(self, symbol: str, interval: str) -> str:
+        """데이터셋 디렉터리 경로"""
+
+        safe_symbol = re.sub(r'[^A-Za-z0-9._-]', '_', symbol)
+        return os.path.join(self.root, interval, safe_symbol)
+
+    def read(
+        self,
+        symbol: str,
+        interval: str,
+        start,
+        end
+    ) -> pd.DataFrame:
+        """[start, end) 구간의 OHLCV 데이터 (UTC 인덱스)"""
+
+        path = self.dataset_path(symbol, interval)
+        if not self._year_directories(path):
+            return self._empty_frame()
+
+        start, end = to_utc(start), to_utc(end)
+        dataset = ds.dataset(path, format='parquet', partitioning='hive')
+
+        # 연도 분할 디렉터리 + 타임스탬프 조건 (predicate pushdown)
+        years = list(range(start.year, end.year + 1))
+        condition = (
+            ds.field('year').isin(years)
+            & (ds.field('timestamp') >= pa.scalar(start, SCHEMA.field('timestamp').type))
+            & (ds.field('timestamp') < pa.scalar(end, SCHEMA.field('timestamp').type))
+        )
+        table = dataset.to_table(
+            columns=['timestamp'] + OHLCV_COLUMNS, filter=condition
+        )
+
+        frame = table.to_pandas().set_index('timestamp').sort_index()
+        return frame[OHLCV_COLUMNS]
+
+    def read_all(self, symbol: str, interval: str) -> pd.DataFrame:
+        """데이터셋 전체 OHLCV (UTC 인덱스)"""
+
+        path = self.dataset_path(symbol, interval)
+        if not self._year_directories(path):
+            return self._empty_frame()
+
+        dataset = ds.dataset(path, format='parquet', partitioning='hive')
+        table = dataset.to_table(columns=['timestamp'] + OHLCV_COLUMNS)
+        frame = table.to_pandas().set_index('timestamp').sort_index()
+        return frame[OHLCV_COLUMNS]
+
+    def version(self, symbol: str, interval: str) -> str:
+        """
+        데이터 파일 버전 (쓰기마다 달라짐)
+
+        연도 파일은 쓸 때마다 새 파일로 교체되므로 파일별 inode·수정 시각·
+        크기로 변경을 감지합니다. 파생 저장소 동기화용입니다.
+        """
+
+        path = self.dataset_path(symbol, interval)
+        parts = []
+        for name in self._year_directories(path):
+            try:
+                stat = os.stat(os.path.join(path, name, 'data.parquet'))
+            except FileNotFoundError:
+                continue
+            parts.append(f'{name}:{stat.st_ino}:{stat.st_mtime_ns}:{stat.st_size}')
+        return ','.join(parts)
+
+    @staticmethod
+    def _year_directories(path: str) -> List[str]:
+        """연도 분할 디렉터리 이름 (coverage 만 기록된 데이터셋이면 빈 목록)"""
+
+        if not os.path.isdir(path):
+            return []
+        return sorted(name for name in os.listdir(path) if name.startswith('year='))
+
+    def iter_bars(
+        self,
+        symbol: str,
+        interval: str,
+        start,
+        end,
+        batch_size: int = 65536
+    ) -> Iterator[tuple]:
+        """
+        [start, end) 구간 봉을 (timestamp_ns, open, high, low, close, volume) 로 순회
+
+        연도 파일을 차례로 batch_size 행씩 읽으므로 구간 전체를 메모리에
+        올리지 않습니다 (분 단위 데이터 재생용).
+        """
+
+        path = self.dataset_path(symbol, interval)
+        if not os.path.isdir(path):
+            return
+
+        start, end = to_utc(start), to_utc(end)
+        timestamp_type = SCHEMA.field('timestamp').type
+
+        for year in range(start.year, end.year + 1):
+            filename = os.path.join(path, f'year={year}', 'data.parquet')
+            if not os.path.exists(filename):
+                continue
+
+            # 연도 파일은 타임스탬프 순으로 저장됨
+            dataset = ds.dataset(filename, format='parquet')
+            condition = (
+                (ds.field('timestamp') >= pa.scalar(start, timestamp_type))
+                & (ds.field('timestamp') < pa.scalar(end, timestamp_type))
+            )
+            for batch in dataset.to_batches(
+                columns=['timestamp'] + OHLCV_COLUMNS,
+                filter=condition,
+                batch_size=batch_size
+            ):
+                yield from zip(
+                    batch.column(0).cast(pa.int64()).to_pylist(),
+                    *(batch.column(i + 1).to_pylist() for i in range(len(OHLCV_COLUMNS)))
+                )
+
+    def write(self, symbol: str, interval: str, data: pd.DataFrame) -> int:
+        """
+        OHLCV 데이터 병합 저장 (같은 타임스탬프는 새 값으로 교체)
+
+        Returns:
+            저장한 행 수
+        """
+
+        if data.empty:
+            return 0
+
+        frame = data[OHLCV_COLUMNS].astype('float64')
+        index = pd.DatetimeIndex(frame.index)
+        frame.index = (
+            index.tz_localize('UTC') if index.tz is None
+            else index.tz_convert('UTC')
+        ).as_unit('ns')
+        frame.index.name = 'timestamp'
+
+        path = self.dataset_path(symbol, interval)
+
+        with dataset_lock(path):
+            for year, part in frame.groupby(frame.index.year):
+                directory = os.path.join(path, f'year={year}')
+                filename = os.path.join(directory, 'data.parquet')
+                os.makedirs(directory, exist_ok=True)
+
+                if os.path.exists(filename):
+                    existing = pq.read_table(filename).to_pandas()
+                    existing = existing.set_index('timestamp')
+                    part = pd.concat([existing, part])
+                    part = part[~part.index.duplicated(keep='last')]
+
+                table = pa.Table.from_pandas(
+                    part.sort_index().reset_index(),
+                    schema=SCHEMA,
+                    preserve_index=False
+                )
+                _replace_file(
+                    filename,
+                    lambda tmp: pq.write_table(table, tmp, row_group_size=65536)
+                )
+
+        return len(frame)
+
+    def coverage(self, symbol: str, interval: str) -> CoverageIndex:
+        """업스트림에서 이미 받아 온 구간 인덱스"""
+
+        filename = os.path.join(self.dataset_path(symbol, interval), '_coverage.json')
+        if not os.path.exists(filename):
+            return CoverageIndex()
+
+        with open(filename) as f:
+            return CoverageIndex.from_json(json.load(f)['ranges'])
+
+    def mark_covered(self, symbol: str, interval: str, start, end):
+        """업스트림에서 받아 온 구간 기록 (기존 구간과 병합)"""
+
+        path = self.dataset_path(symbol, interval)
+
+        with dataset_lock(path):
+            coverage = self.coverage(symbol, interval)
+            coverage.add(start, end)
+
+            def write(tmp_filename):
+                with open(tmp_filename, 'w') as f:
+                    json.dump({'ranges': coverage.to_json()}, f)
+
+            _replace_file(os.path.join(path, '_coverage.json'), write)
+
+    @staticmethod
+    def _empty_frame() -> pd.DataFrame:
+        index = pd.DatetimeIndex([], tz='UTC', name='timestamp')
+        return pd.DataFrame(
+            {column: pd.Series(dtype='float64') for column in OHLCV_COLUMNS},
+            index=index
+        )
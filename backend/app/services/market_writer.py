@@ -0,0 +1,178 @@
+"""
+bt_market_data 일괄 저장
+
+DataFrame 을 청크 단위로 레코드로 변환해 흘려보내므로 전체 페이로드를
+한 번에 메모리에 만들지 않습니다.
+
+- Supabase REST: 청크별 upsert (동시 요청 수 제한, 실패 시 재시도)
+- Postgres COPY: DATABASE_URL 이 설정된 경우 임시 테이블로 COPY 후 병합
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+COPY_COLUMNS = ['symbol', 'timestamp'] + OHLCV_COLUMNS
+
+UPSERT_FROM_STAGING = """
+INSERT INTO bt_market_data (symbol, timestamp, open, high, low, close, volume)
+SELECT symbol, timestamp, open, high, low, close, volume FROM {staging}
+ON CONFLICT (symbol, timestamp) DO UPDATE SET
+    open = EXCLUDED.open,
+    high = EXCLUDED.high,
+    low = EXCLUDED.low,
+    close = EXCLUDED.close,
+    volume = EXCLUDED.volume
+"""
+
+
+def _timestamp_strings(index: pd.DatetimeIndex) -> np.ndarray:
+    """ISO 8601 문자열 (시간대가 있으면 UTC 오프셋 포함)"""
+
+    if index.tz is None:
+        return np.datetime_as_string(index.to_numpy(), unit='s')
+    utc = index.tz_convert('UTC').tz_localize(None).to_numpy()
+    return np.char.add(np.datetime_as_string(utc, unit='s'), '+00:00')
+
+
+def _chunk_columns(data: pd.DataFrame, chunk_size: int) -> Iterator[Tuple[slice, List]]:
+    """청크 구간과 OHLCV 열 배열 (거래량은 정수)"""
+
+    values = [data[column].to_numpy(dtype=np.float64) for column in OHLCV_COLUMNS]
+    values[-1] = np.nan_to_num(values[-1]).astype(np.int64)
+
+    for start in range(0, len(data), chunk_size):
+        rows = slice(start, start + chunk_size)
+        yield rows, [column[rows].tolist() for column in values]
+
+
+def iter_record_chunks(
+    symbol: str,
+    data: pd.DataFrame,
+    chunk_size: int
+) -> Iterator[List[Dict[str, Any]]]:
+    """upsert 용 레코드 청크 (열 단위 변환)"""
+
+    index = pd.DatetimeIndex(data.index)
+
+    for rows, columns in _chunk_columns(data, chunk_size):
+        timestamps = _timestamp_strings(index[rows]).tolist()
+        yield [
+            {
+                "symbol": symbol,
+                "timestamp": timestamp,
+                "open": open_,
+                "high": high,
+                "low": low,
+                "close": close,
+                "volume": volume,
+            }
+            for timestamp, open_, high, low, close, volume
+            in zip(timestamps, *columns)
+        ]
+
+
+def iter_copy_rows(symbol: str, data: pd.DataFrame, chunk_size: int) -> Iterator[tuple]:
+    """COPY 용 행 튜플 (청크 단위로 생성)"""
+
+    index = pd.DatetimeIndex(data.index)
+    if index.tz is None:
+        index = index.tz_localize('UTC')
+
+    for rows, columns in _chunk_columns(data, chunk_size):
+        timestamps = index[rows].to_pydatetime()
+        for row in zip(timestamps, *columns):
+            yield (symbol,) + row
+
+
+async def upsert_chunks(
+    upsert: Callable[[List[Dict[str, Any]]], Awaitable[Any]],
+    chunks: Iterator[List[Dict[str, Any]]],
+    max_in_flight: int = 4,
+    retries: int = 3,
+    retry_delay: float = 0.5
+) -> int:
+    """
+    청크를 동시에 최대 max_in_flight 개까지 upsert
+
+    다음 청크는 자리가 날 때만 만들므로 메모리에는 진행 중인 청크만
+    남습니다. 실패한 청크는 지수 백오프로 retries 번까지 다시 보냅니다.
+
+    Returns:
+        저장한 레코드 수
+    """
+
+    slots = asyncio.Semaphore(max_in_flight)
+    pending = set()
+    errors = []
+    written = 0
+
+    async def send(chunk):
+        nonlocal written
+        try:
+            for attempt in range(retries + 1):
+                try:
+                    await upsert(chunk)
+                    written += len(chunk)
+                    return
+                except Exception as e:
+                    if attempt == retries:
+                        errors.append(e)
+                        return
+                    await asyncio.sleep(retry_delay * 2 ** attempt)
+        finally:
+            slots.release()
+
+    for chunk in chunks:
+        await slots.acquire()
+        if errors:
+            slots.release()
+            break
+        task = asyncio.create_task(send(chunk))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+
+    if pending:
+        await asyncio.gather(*pending)
+    if errors:
+        raise errors[0]
+
+    return written
+
+
+async def copy_to_postgres(symbol: str, data: pd.DataFrame, chunk_size: int) -> int:
+    """
+    asyncpg COPY 로 임시 테이블에 적재한 뒤 bt_market_data 에 병합
+
+    app.database 엔진(DATABASE_URL)을 사용합니다.
+
+    Returns:
+        저장한 레코드 수
+    """
+
+    from app.database import engine
+
+    staging = "bt_market_data_staging"
+
+    async with engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        connection = raw.driver_connection
+
+        async with connection.transaction():
+            await connection.execute(
+                f"CREATE TEMP TABLE {staging} "
+                f"(LIKE bt_market_data INCLUDING DEFAULTS) ON COMMIT DROP"
+            )
+            await connection.copy_records_to_table(
+                staging,
+                records=iter_copy_rows(symbol, data, chunk_size),
+                columns=COPY_COLUMNS
+            )
+            await connection.execute(UPSERT_FROM_STAGING.format(staging=staging))
+
+    return len(data)
@@ -0,0 +1,382 @@
+"""
+성과 지표 계산
+
+수익 곡선과 체결 배열로 성과 지표를 계산합니다. 수익 곡선 함수는
+1차원(봉) 또는 2차원(봉 × 파라미터 세트) 배열을 모두 받으며 axis 0 을
+시간 축으로 사용합니다.
+"""
+
+import numpy as np
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+
+# 연율화 기준 봉 수 (일봉)
+PERIODS_PER_YEAR = 252
+
+
+def _safe_divide(numerator, denominator, default=0.0):
+    """분모가 0 이면 default"""
+
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    ok = denominator != 0
+    return np.where(
+        ok, numerator / np.where(ok, denominator, 1.0), default
+    )
+
+
+def total_return(equity: np.ndarray, initial_capital: float) -> np.ndarray:
+    """총 수익률 (%)"""
+
+    return (equity[-1] - initial_capital) / initial_capital * 100
+
+
+def drawdown(equity: np.ndarray) -> np.ndarray:
+    """봉별 낙폭 (%): 누적 최고점 대비 하락률"""
+
+    peak = np.maximum.accumulate(equity, axis=0)
+    return (peak - equity) / peak * 100
+
+
+def max_drawdown(equity: np.ndarray) -> np.ndarray:
+    """최대 낙폭 (%)"""
+
+    return drawdown(equity).max(axis=0)
+
+
+def max_drawdown_duration(equity: np.ndarray) -> np.ndarray:
+    """최고점을 회복하지 못한 최장 기간 (봉 수)"""
+
+    peak = np.maximum.accumulate(equity, axis=0)
+    rows = np.arange(equity.shape[0]).reshape((-1,) + (1,) * (equity.ndim - 1))
+
+    # 마지막으로 최고점이었던 봉 위치
+    last_peak = np.where(equity >= peak, rows, 0)
+    np.maximum.accumulate(last_peak, axis=0, out=last_peak)
+    return (rows - last_peak).max(axis=0)
+
+
+def returns(equity: np.ndarray) -> np.ndarray:
+    """봉별 수익률"""
+
+    return np.diff(equity, axis=0) / equity[:-1]
+
+
+def sharpe_ratio(
+    equity: np.ndarray, periods_per_year: int = PERIODS_PER_YEAR
+) -> np.ndarray:
+    """샤프 비율 (무위험 수익률 0, 연율화)"""
+
+    if equity.shape[0] < 2:
+        return np.zeros(equity.shape[1:])
+
+    r = returns(equity)
+    return _safe_divide(r.mean(axis=0), r.std(axis=0)) * np.sqrt(periods_per_year)
+
+
+def sortino_ratio(
+    equity: np.ndarray, periods_per_year: int = PERIODS_PER_YEAR
+) -> np.ndarray:
+    """소르티노 비율 (하방 편차 기준, 연율화)"""
+
+    if equity.shape[0] < 2:
+        return np.zeros(equity.shape[1:])
+
+    r = returns(equity)
+    downside = np.sqrt((np.minimum(r, 0.0) ** 2).mean(axis=0))
+    return _safe_divide(r.mean(axis=0), downside) * np.sqrt(periods_per_year)
+
+
+def cagr(
+    equity: np.ndarray,
+    initial_capital: float,
+    periods_per_year: int = PERIODS_PER_YEAR
+) -> np.ndarray:
+    """연평균 복리 수익률 (%)"""
+
+    years = equity.shape[0] / periods_per_year
+    if years <= 0 or initial_capital <= 0:
+        return np.zeros(equity.shape[1:])
+
+    growth = np.maximum(equity[-1] / initial_capital, 0.0)
+    return (growth ** (1 / years) - 1) * 100
+
+
+def calmar_ratio(
+    equity: np.ndarray,
+    initial_capital: float,
+    periods_per_year: int = PERIODS_PER_YEAR
+) -> np.ndarray:
+    """칼마 비율 (CAGR / 최대 낙폭)"""
+
+    return _safe_divide(
+        cagr(equity, initial_capital, periods_per_year), max_drawdown(equity)
+    )
+
+
+def exposure(trade_index: np.ndarray, position: np.ndarray, n_bars: int) -> float:
+    """
+    시장 노출 비율 (%): 포지션을 보유한 봉의 비율
+
+    체결마다 다음 체결(또는 마지막 봉)까지의 보유 구간 길이를 더하므로
+    봉 수가 아닌 체결 수에 비례하는 비용으로 계산합니다.
+
+    Args:
+        trade_index: 체결 봉 위치 (오름차순)
+        position: 체결 직후 보유 수량
+        n_bars: 전체 봉 수
+    """
+
+    if n_bars == 0 or len(trade_index) == 0:
+        return 0.0
+
+    trade_index = np.asarray(trade_index, dtype=np.int64)
+    next_index = np.append(trade_index[1:], n_bars)
+    held = (next_index - trade_index)[np.asarray(position) > 0].sum()
+    return float(held * 100 / n_bars)
+
+
+def paired_win_rate(
+    buy_prices: np.ndarray, sell_prices: np.ndarray, total_trades
+) -> np.ndarray:
+    """
+    승률 (%): i 번째 매수가와 i 번째 매도가 비교
+
+    buy_prices / sell_prices 는 (…, 체결 순서) 모양이며 빈 칸은 NaN 입니다.
+    """
+
+    k = min(buy_prices.shape[-1], sell_prices.shape[-1])
+    winning_trades = (sell_prices[..., :k] > buy_prices[..., :k]).sum(axis=-1)
+    return _safe_divide(winning_trades * 100, total_trades)
+
+
+@dataclass
+class RoundTrips:
+    """FIFO 로 짝지은 왕복 거래"""
+    buy_index: np.ndarray  # 매수 체결 번호
+    sell_index: np.ndarray  # 매도 체결 번호
+    quantity: np.ndarray
+    buy_price: np.ndarray
+    sell_price: np.ndarray
+    pnl: np.ndarray  # 수수료 반영 손익
+
+
+def pair_round_trips(
+    action: np.ndarray,
+    price: np.ndarray,
+    quantity: np.ndarray,
+    commission: float = 0.0
+) -> RoundTrips:
+    """
+    매수 수량을 매도 수량에 선입선출(FIFO)로 배분
+
+    누적 매수/매도 수량의 경계점을 합친 구간마다 해당 매수 로트와 매도
+    체결을 searchsorted 로 찾습니다.
+
+    Args:
+        action: 체결 방향 (1 = 매수, -1 = 매도)
+        price: 체결 가격
+        quantity: 체결 수량
+        commission: 수수료율
+    """
+
+    buys = np.flatnonzero(action == 1)
+    sells = np.flatnonzero(action == -1)
+
+    cum_buy = np.cumsum(quantity[buys])
+    cum_sell = np.cumsum(quantity[sells])
+    matched = min(
+        cum_buy[-1] if len(cum_buy) else 0.0,
+        cum_sell[-1] if len(cum_sell) else 0.0,
+    )
+
+    bounds = np.union1d(cum_buy, cum_sell)
+    bounds = np.concatenate(([0.0], bounds[bounds <= matched]))
+    size = np.diff(bounds)
+
+    # 부동소수점 누적 오차로 생기는 극소 조각 제거
+    keep = size > max(matched, 1.0) * 1e-12
+    middle = (bounds[:-1] + size / 2)[keep]
+    size = size[keep]
+
+    lot = buys[np.searchsorted(cum_buy, middle)]
+    fill = sells[np.searchsorted(cum_sell, middle)]
+
+    buy_price = price[lot]
+    sell_price = price[fill]
+    pnl = size * (sell_price * (1 - commission) - buy_price * (1 + commission))
+
+    return RoundTrips(
+        buy_index=lot,
+        sell_index=fill,
+        quantity=size,
+        buy_price=buy_price,
+        sell_price=sell_price,
+        pnl=pnl,
+    )
+
+
+def trade_statistics(round_trips: RoundTrips) -> Dict[str, Optional[float]]:
+    """
+    왕복 거래 손익 통계 (매도 체결 단위로 집계)
+
+    손실 거래 없이 이익만 있으면 profit_factor 는 정의되지 않으므로 None
+    (JSON null) 입니다. 거래가 없거나 손익이 모두 0 이면 0.0 입니다.
+    """
+
+    # 한 번의 전량 매도로 닫힌 로트들은 하나의 거래로 봄
+    sells, group = np.unique(round_trips.sell_index, return_inverse=True)
+    pnl = np.bincount(group, weights=round_trips.pnl, minlength=len(sells))
+
+    wins = pnl[pnl > 0]
+    losses = pnl[pnl < 0]
+    gross_profit = wins.sum()
+    gross_loss = -losses.sum()
+
+    if gross_loss == 0 and gross_profit > 0:
+        profit_factor = None
+    else:
+        profit_factor = float(_safe_divide(gross_profit, gross_loss))
+
+    return {
+        'round_trips': int(len(pnl)),
+        'profit_factor': profit_factor,
+        'avg_win': float(wins.mean()) if len(wins) else 0.0,
+        'avg_loss': float(losses.mean()) if len(losses) else 0.0,
+    }
+
+
+def compute_metrics(
+    equity: np.ndarray,
+    initial_capital: float,
+    action: np.ndarray,
+    price: np.ndarray,
+    quantity: np.ndarray,
+    trade_index: Optional[np.ndarray] = None,
+    position: Optional[np.ndarray] = None,
+    commission: float = 0.0,
+    periods_per_year: int = PERIODS_PER_YEAR
+) -> Dict[str, Any]:
+    """
+    단일 백테스트의 성과 지표
+
+    Args:
+        equity: 봉별 포트폴리오 가치
+        initial_capital: 초기 자본
+        action / price / quantity: 체결 방향·가격·수량
+        trade_index / position: 체결 봉 위치와 체결 직후 보유 수량
+            (노출 비율 계산용, 없으면 생략)
+        commission: 수수료율
+        periods_per_year: 연율화 기준 봉 수
+    """
+
+    equity = np.asarray(equity, dtype=np.float64)
+    if len(equity) == 0:
+        return {}
+
+    trades = trade_metrics(
+        action, price, quantity, trade_index, position, len(equity), commission
+    )
+
+    metrics = {
+        'total_return': round(float(total_return(equity, initial_capital)), 2),
+        'max_drawdown': round(float(max_drawdown(equity)), 2),
+        'total_trades': trades.pop('total_trades'),
+        'win_rate': trades.pop('win_rate'),
+        'sharpe_ratio': round(float(sharpe_ratio(equity, periods_per_year)), 2),
+        'final_value': round(float(equity[-1]), 2),
+        'sortino_ratio': round(float(sortino_ratio(equity, periods_per_year)), 2),
+        'cagr': round(float(cagr(equity, initial_capital, periods_per_year)), 2),
+        'calmar_ratio': round(
+            float(calmar_ratio(equity, initial_capital, periods_per_year)), 2
+        ),
+        'max_drawdown_duration': int(max_drawdown_duration(equity)),
+    }
+    metrics.update(trades)
+
+    return metrics
+
+
+def trade_metrics(
+    action: np.ndarray,
+    price: np.ndarray,
+    quantity: np.ndarray,
+    trade_index: Optional[np.ndarray],
+    position: Optional[np.ndarray],
+    n_bars: int,
+    commission: float = 0.0
+) -> Dict[str, Any]:
+    """
+    체결 배열만으로 계산하는 지표 (거래 수, 승률, 노출 비율, 왕복 거래 통계)
+
+    수익 곡선이 필요 없으므로 온라인 지표 누적기와 함께 사용합니다.
+    """
+
+    action = np.asarray(action)
+    price = np.asarray(price, dtype=np.float64)
+    quantity = np.asarray(quantity, dtype=np.float64)
+
+    total_trades = int((action == 1).sum())
+    win_rate = paired_win_rate(
+        price[action == 1], price[action == -1], total_trades
+    )
+
+    metrics = {
+        'total_trades': total_trades,
+        'win_rate': round(float(win_rate), 2),
+    }
+
+    if trade_index is not None and position is not None:
+        metrics['exposure'] = round(
+            exposure(np.asarray(trade_index), np.asarray(position), n_bars), 2
+        )
+
+    stats = trade_statistics(
+        pair_round_trips(action, price, quantity, commission)
+    )
+    metrics.update({
+        key: round(value, 2) if isinstance(value, float) else value
+        for key, value in stats.items()
+    })
+
+    return metrics
+
+
+def positions_from_trades(action: np.ndarray, quantity: np.ndarray) -> np.ndarray:
+    """체결 직후 보유 수량: 마지막 매도 이후 매수 수량의 합 (매도 시 0)"""
+
+    action = np.asarray(action)
+    if len(action) == 0:
+        return np.zeros(0, dtype=np.float64)
+
+    last_sell = np.maximum.accumulate(
+        np.where(action == -1, np.arange(len(action)), -1)
+    )
+    bought = np.cumsum(np.where(action == 1, quantity, 0.0))
+    sold_base = np.where(last_sell >= 0, bought[np.maximum(last_sell, 0)], 0.0)
+    return np.where(action == -1, 0.0, bought - sold_base)
+
+
+def equity_from_trades(
+    bar_timestamps: np.ndarray,
+    close: np.ndarray,
+    trade_timestamps: np.ndarray,
+    action: np.ndarray,
+    quantity: np.ndarray,
+    balance: np.ndarray,
+    initial_capital: float
+) -> np.ndarray:
+    """
+    저장된 체결 기록과 종가로 봉별 수익 곡선 복원
+
+    체결 직후 현금 잔고와 보유 수량을 봉 시점으로 전방 채움하여
+    잔고 + 보유 수량 × 종가를 계산합니다.
+    """
+
+    position = positions_from_trades(action, quantity)
+
+    last_trade = np.searchsorted(trade_timestamps, bar_timestamps, side='right') - 1
+    balance_path = np.concatenate(([float(initial_capital)], balance))
+    position_path = np.concatenate(([0.0], position))
+    return balance_path[last_trade + 1] + position_path[last_trade + 1] * close
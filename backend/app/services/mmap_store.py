@@ -0,0 +1,348 @@
+"""
+메모리 맵 시장 데이터 저장소
+
+심볼·주기마다 고정 폭 바이너리 열 파일을 세대(generation) 디렉터리에
+기록합니다.
+
+    {root}/{interval}/{symbol}/CURRENT   (현재 세대 이름과 원본 버전, JSON)
+    {root}/{interval}/{symbol}/g*/timestamp.i8   (int64, UTC ns, 오름차순)
+    {root}/{interval}/{symbol}/g*/open.f8 ... volume.f8   (float64)
+
+조회는 np.memmap 뷰를 반환하므로 API 프로세스와 Celery 워커의 여러
+백테스트가 OS 페이지 캐시에 올라간 같은 데이터를 복사 없이 함께 사용합니다.
+DataCollector 는 이 저장소를 Parquet 캐시의 읽기 전용 사본으로 씁니다.
+
+쓰기는 데이터셋 파일 잠금 안에서 진행합니다. 마지막 타임스탬프 이후의
+행은 현재 세대에 이어 쓰고, 그 밖의 변경은 새 세대를 만든 뒤 CURRENT 를
+교체합니다. 이전 세대 파일은 지워도 이미 매핑한 쪽은 계속 읽을 수 있습니다.
+"""
+
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.services.market_store import dataset_lock
+
+
+OHLCV_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+@dataclass(frozen=True)
+class OHLCVArrays:
+    """OHLCV 열 배열 묶음 (보통 메모리 맵 뷰)"""
+    timestamp: np.ndarray  # int64, UTC ns
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def slice(self, start: int, stop: int) -> "OHLCVArrays":
+        """위치 기준 구간 뷰"""
+
+        return OHLCVArrays(**{
+            name: getattr(self, name)[start:stop]
+            for name in ('timestamp',) + OHLCV_COLUMNS
+        })
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame 으로 감싸기 (열 배열을 복사하지 않음)"""
+
+        index = pd.DatetimeIndex(
+            self.timestamp.view('datetime64[ns]'), name='timestamp'
+        ).tz_localize('UTC')
+        return pd.DataFrame(
+            {name: getattr(self, name) for name in OHLCV_COLUMNS},
+            index=index,
+            copy=False
+        )
+
+
+def as_market_frame(market_data) -> pd.DataFrame:
+    """DataFrame 또는 OHLCVArrays 를 DataFrame 으로 (뷰 유지)"""
+
+    if isinstance(market_data, OHLCVArrays):
+        return market_data.to_frame()
+    return market_data
+
+
+class MmapMarketStore:
+    """
+    심볼·주기별 메모리 맵 저장소
+
+    이어 쓰기는 OHLCV 열을 먼저 쓰고 타임스탬프 열을 마지막에 쓰므로,
+    타임스탬프 파일 길이가 완전히 기록된 행 수가 됩니다.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._maps: Dict[Tuple[str, str], Tuple[str, int, OHLCVArrays]] = {}
+        self._lock = threading.Lock()
+
+    def dataset_path(self, symbol: str, interval: str) -> str:
+        """데이터셋 디렉터리 경로"""
+
+        safe_symbol = re.sub(r'[^A-Za-z0-9._-]', '_', symbol)
+        return os.path.join(self.root, interval, safe_symbol)
+
+    @staticmethod
+    def _column_path(generation_path: str, column: str) -> str:
+        suffix = 'i8' if column == 'timestamp' else 'f8'
+        return os.path.join(generation_path, f'{column}.{suffix}')
+
+    def _current(self, symbol: str, interval: str) -> Dict[str, Optional[str]]:
+        """현재 세대 정보 (없으면 generation 이 None)"""
+
+        try:
+            with open(os.path.join(self.dataset_path(symbol, interval), 'CURRENT')) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {'generation': None, 'source_version': None}
+
+    def _generation_length(self, generation_path: str) -> int:
+        return os.path.getsize(self._column_path(generation_path, 'timestamp')) // 8
+
+    def length(self, symbol: str, interval: str) -> int:
+        """기록된 행 수"""
+
+        generation = self._current(symbol, interval)['generation']
+        if generation is None:
+            return 0
+        return self._generation_length(
+            os.path.join(self.dataset_path(symbol, interval), generation)
+        )
+
+    def source_version(self, symbol: str, interval: str) -> Optional[str]:
+        """마지막으로 mirror 한 원본 버전 (없거나 write 로 바뀌었으면 None)"""
+
+        return self._current(symbol, interval)['source_version']
+
+    def write(self, symbol: str, interval: str, data: pd.DataFrame) -> int:
+        """
+        OHLCV 데이터 병합 저장 (같은 타임스탬프는 새 값으로 교체)
+
+        모든 행이 마지막 타임스탬프 이후면 현재 세대에 이어 쓰고, 아니면
+        기존 행과 병합한 새 세대를 만듭니다.
+
+        Returns:
+            저장한 행 수
+        """
+
+        timestamps, columns = _normalize(data)
+        if len(timestamps) == 0:
+            return 0
+
+        path = self.dataset_path(symbol, interval)
+        with dataset_lock(path):
+            current = self._current(symbol, interval)
+            generation = current['generation']
+            generation_path = (
+                os.path.join(path, generation) if generation is not None else None
+            )
+
+            if generation_path is not None and self._generation_length(generation_path):
+                existing = self._load(generation_path)
+                if timestamps[0] > existing.timestamp[-1]:
+                    for column in OHLCV_COLUMNS:
+                        with open(self._column_path(generation_path, column), 'ab') as f:
+                            columns[column].tofile(f)
+                    with open(self._column_path(generation_path, 'timestamp'), 'ab') as f:
+                        timestamps.tofile(f)
+                    self._set_current(path, generation, source_version=None)
+                    return len(timestamps)
+
+                # 기존 행 중 새 데이터와 겹치지 않는 것만 남기고 병합
+                keep = ~np.isin(existing.timestamp, timestamps)
+                merged = np.concatenate((existing.timestamp[keep], timestamps))
+                order = np.argsort(merged, kind='stable')
+                timestamps = merged[order]
+                columns = {
+                    column: np.concatenate(
+                        (getattr(existing, column)[keep], columns[column])
+                    )[order]
+                    for column in OHLCV_COLUMNS
+                }
+
+            self._write_generation(path, timestamps, columns, source_version=None)
+
+        return len(data)
+
+    def mirror(
+        self,
+        symbol: str,
+        interval: str,
+        source_version: str,
+        load: Callable[[], pd.DataFrame]
+    ) -> bool:
+        """
+        원본 저장소 버전이 바뀌었으면 load() 결과로 전체 교체
+
+        Returns:
+            다시 만들었으면 True
+        """
+
+        path = self.dataset_path(symbol, interval)
+        with dataset_lock(path):
+            if self.source_version(symbol, interval) == source_version:
+                return False
+            timestamps, columns = _normalize(load())
+            self._write_generation(path, timestamps, columns, source_version)
+        return True
+
+    def _write_generation(
+        self,
+        path: str,
+        timestamps: np.ndarray,
+        columns: Dict[str, np.ndarray],
+        source_version: Optional[str]
+    ):
+        """새 세대 기록 후 CURRENT 교체, 이전 세대 삭제 (잠금 안에서 호출)"""
+
+        generation_path = tempfile.mkdtemp(prefix='g', dir=path)
+        for column in OHLCV_COLUMNS:
+            columns[column].tofile(self._column_path(generation_path, column))
+        timestamps.tofile(self._column_path(generation_path, 'timestamp'))
+
+        generation = os.path.basename(generation_path)
+        self._set_current(path, generation, source_version)
+
+        for name in os.listdir(path):
+            if name != generation and name.startswith('g'):
+                shutil.rmtree(os.path.join(path, name), ignore_errors=True)
+
+    @staticmethod
+    def _set_current(path: str, generation: str, source_version: Optional[str]):
+        filename = os.path.join(path, 'CURRENT')
+        with open(filename + '.tmp', 'w') as f:
+            json.dump({'generation': generation, 'source_version': source_version}, f)
+        os.replace(filename + '.tmp', filename)
+
+    def _load(self, generation_path: str) -> OHLCVArrays:
+        n = self._generation_length(generation_path)
+        if n == 0:
+            return self._load_empty()
+        return OHLCVArrays(
+            timestamp=np.memmap(
+                self._column_path(generation_path, 'timestamp'),
+                dtype=np.int64, mode='r', shape=(n,)
+            ),
+            **{
+                column: np.memmap(
+                    self._column_path(generation_path, column),
+                    dtype=np.float64, mode='r', shape=(n,)
+                )
+                for column in OHLCV_COLUMNS
+            }
+        )
+
+    def arrays(self, symbol: str, interval: str) -> OHLCVArrays:
+        """전체 구간의 메모리 맵 뷰 (세대가 바뀌거나 파일이 커지면 다시 매핑)"""
+
+        key = (symbol, interval)
+        path = self.dataset_path(symbol, interval)
+
+        # 세대를 읽은 직후 다른 writer 가 그 세대를 지울 수 있으므로 다시 시도
+        for _ in range(3):
+            generation = self._current(symbol, interval)['generation']
+            if generation is None:
+                return self._load_empty()
+
+            generation_path = os.path.join(path, generation)
+            try:
+                n = self._generation_length(generation_path)
+                with self._lock:
+                    cached = self._maps.get(key)
+                    if cached is not None and cached[:2] == (generation, n):
+                        return cached[2]
+                arrays = self._load(generation_path)
+            except FileNotFoundError:
+                continue
+
+            with self._lock:
+                self._maps[key] = (generation, n, arrays)
+            return arrays
+
+        raise RuntimeError(f"Memory-mapped dataset {symbol} {interval} keeps changing")
+
+    @staticmethod
+    def _load_empty() -> OHLCVArrays:
+        empty = np.zeros(0)
+        return OHLCVArrays(
+            timestamp=np.zeros(0, dtype=np.int64),
+            **{column: empty for column in OHLCV_COLUMNS}
+        )
+
+    def read(self, symbol: str, interval: str, start, end) -> OHLCVArrays:
+        """[start, end) 구간 뷰 (타임스탬프 이진 탐색, 복사 없음)"""
+
+        arrays = self.arrays(symbol, interval)
+        lo, hi = np.searchsorted(
+            arrays.timestamp, [_to_ns(start), _to_ns(end)], side='left'
+        )
+        return arrays.slice(int(lo), int(hi))
+
+    def iter_bars(
+        self,
+        symbol: str,
+        interval: str,
+        start,
+        end,
+        batch_size: int = 65536
+    ) -> Iterator[tuple]:
+        """[start, end) 구간 봉을 (timestamp_ns, open, high, low, close, volume) 로 순회
+
+        batch_size 행씩 메모리 맵에서 복사하므로 구간이 메모리보다 커도 됩니다.
+        """
+
+        arrays = self.read(symbol, interval, start, end)
+        for lo in range(0, len(arrays.timestamp), batch_size):
+            batch = arrays.slice(lo, lo + batch_size)
+            yield from zip(
+                batch.timestamp.tolist(),
+                *(getattr(batch, column).tolist() for column in OHLCV_COLUMNS)
+            )
+
+
+def _normalize(data: pd.DataFrame) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """UTC ns 타임스탬프 오름차순 열 배열 (같은 타임스탬프는 마지막 행 사용)"""
+
+    index = pd.DatetimeIndex(data.index)
+    index = (
+        index.tz_localize('UTC') if index.tz is None
+        else index.tz_convert('UTC')
+    )
+    timestamps = index.as_unit('ns').asi8
+
+    order = np.argsort(timestamps, kind='stable')
+    timestamps = timestamps[order]
+    last = np.ones(len(timestamps), dtype=bool)
+    last[:-1] = timestamps[:-1] != timestamps[1:]
+
+    rows = order[last]
+    columns = {
+        column: np.ascontiguousarray(
+            data[column].to_numpy(dtype=np.float64)[rows]
+        )
+        for column in OHLCV_COLUMNS
+    }
+    return np.ascontiguousarray(timestamps[last]), columns
+
+
+def _to_ns(timestamp) -> int:
+    """타임스탬프를 UTC ns 정수로 변환 (시간대가 없으면 UTC 로 간주)"""
+
+    timestamp = pd.Timestamp(timestamp)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.tz_localize('UTC')
+    return timestamp.as_unit('ns').value
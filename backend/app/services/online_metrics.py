@@ -0,0 +1,165 @@
+"""
+온라인 성과 지표 누적기
+
+수익 곡선 전체를 저장하지 않고 봉마다 포트폴리오 가치를 받아 지표를
+갱신합니다. 봉별 수익률의 평균·분산은 Welford 방식으로, 낙폭은 누적
+최고점으로 계산하며 결과는 metrics 모듈의 전체 곡선 계산과 같습니다.
+
+봉 하나씩(update) 또는 배열 단위(update_batch, Chan 병합 공식)로 갱신할
+수 있고, snapshot() 은 실행 중 언제든 호출할 수 있습니다.
+"""
+
+import math
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from app.services.metrics import PERIODS_PER_YEAR
+
+
+class OnlineMetrics:
+    """봉 단위 성과 지표 누적기 (메모리 O(1))"""
+
+    def __init__(
+        self,
+        initial_capital: float,
+        periods_per_year: int = PERIODS_PER_YEAR
+    ):
+        self.initial_capital = initial_capital
+        self.periods_per_year = periods_per_year
+
+        self.bars = 0
+        self.last_equity = None
+        self.peak = -math.inf
+        self.max_drawdown = 0.0  # %
+        self.max_drawdown_duration = 0  # 봉 수
+        self._last_peak_bar = 0
+
+        # 봉별 수익률 통계 (Welford)
+        self.returns_count = 0
+        self.returns_mean = 0.0
+        self._returns_m2 = 0.0
+        self._downside_sq_sum = 0.0
+
+    def update(self, equity: float):
+        """봉 하나의 포트폴리오 가치 반영"""
+
+        if self.last_equity is not None:
+            r = (equity - self.last_equity) / self.last_equity
+            self.returns_count += 1
+            delta = r - self.returns_mean
+            self.returns_mean += delta / self.returns_count
+            self._returns_m2 += delta * (r - self.returns_mean)
+            if r < 0:
+                self._downside_sq_sum += r * r
+
+        if equity >= self.peak:
+            self.peak = equity
+            self._last_peak_bar = self.bars
+        else:
+            drawdown = (self.peak - equity) / self.peak * 100
+            if drawdown > self.max_drawdown:
+                self.max_drawdown = drawdown
+
+        duration = self.bars - self._last_peak_bar
+        if duration > self.max_drawdown_duration:
+            self.max_drawdown_duration = duration
+
+        self.last_equity = equity
+        self.bars += 1
+
+    def update_batch(self, equity: np.ndarray):
+        """연속된 봉들의 포트폴리오 가치를 한 번에 반영"""
+
+        equity = np.asarray(equity, dtype=np.float64)
+        n = len(equity)
+        if n == 0:
+            return
+
+        # 봉별 수익률 (직전 배치의 마지막 봉과 연결)
+        path = (
+            equity if self.last_equity is None
+            else np.concatenate(([self.last_equity], equity))
+        )
+        r = np.diff(path) / path[:-1]
+
+        if len(r):
+            count = self.returns_count + len(r)
+            batch_mean = float(r.mean())
+            batch_m2 = float(((r - batch_mean) ** 2).sum())
+            delta = batch_mean - self.returns_mean
+            self.returns_mean += delta * len(r) / count
+            self._returns_m2 += (
+                batch_m2 + delta * delta * self.returns_count * len(r) / count
+            )
+            self.returns_count = count
+            self._downside_sq_sum += float((np.minimum(r, 0.0) ** 2).sum())
+
+        peak = np.maximum.accumulate(np.concatenate(([self.peak], equity)))[1:]
+        self.max_drawdown = max(
+            self.max_drawdown, float(((peak - equity) / peak * 100).max())
+        )
+
+        rows = np.arange(self.bars, self.bars + n)
+        last_peak = np.where(equity >= peak, rows, self._last_peak_bar)
+        np.maximum.accumulate(last_peak, out=last_peak)
+        self.max_drawdown_duration = max(
+            self.max_drawdown_duration, int((rows - last_peak).max())
+        )
+
+        self.peak = float(peak[-1])
+        self._last_peak_bar = int(last_peak[-1])
+        self.last_equity = float(equity[-1])
+        self.bars += n
+
+    def snapshot(self, trades: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        현재까지의 수익 곡선 지표
+
+        Args:
+            trades: metrics.trade_metrics 결과 (주면 compute_metrics 와 같은
+                키 순서로 합침)
+        """
+
+        if self.bars == 0:
+            return {}
+
+        final_value = self.last_equity
+        total_return = (final_value - self.initial_capital) / self.initial_capital * 100
+
+        sharpe = sortino = 0.0
+        if self.returns_count > 0:
+            annualize = math.sqrt(self.periods_per_year)
+            std = math.sqrt(self._returns_m2 / self.returns_count)
+            downside = math.sqrt(self._downside_sq_sum / self.returns_count)
+            if std != 0:
+                sharpe = self.returns_mean / std * annualize
+            if downside != 0:
+                sortino = self.returns_mean / downside * annualize
+
+        cagr = 0.0
+        years = self.bars / self.periods_per_year
+        if years > 0 and self.initial_capital > 0:
+            growth = max(final_value / self.initial_capital, 0.0)
+            cagr = (growth ** (1 / years) - 1) * 100
+
+        calmar = cagr / self.max_drawdown if self.max_drawdown != 0 else 0.0
+
+        trades = dict(trades or {})
+        metrics = {
+            'total_return': round(total_return, 2),
+            'max_drawdown': round(self.max_drawdown, 2),
+            **{
+                key: trades.pop(key)
+                for key in ('total_trades', 'win_rate') if key in trades
+            },
+            'sharpe_ratio': round(sharpe, 2),
+            'final_value': round(final_value, 2),
+            'sortino_ratio': round(sortino, 2),
+            'cagr': round(cagr, 2),
+            'calmar_ratio': round(calmar, 2),
+            'max_drawdown_duration': int(self.max_drawdown_duration),
+        }
+        metrics.update(trades)
+
+        return metrics
@@ -4,47 +4,373 @@
 
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Any, Tuple
-from skopt import gp_minimize
-from skopt.space import Real, Integer
-from skopt.utils import use_named_args
+from typing import Dict, Iterable, Iterator, List, Any, Tuple, Optional, Union
+from skopt import Optimizer
+from skopt.space import Integer
 from app.services.backtest_engine import BacktestEngine
+from app.services.checkpoint import OptimizationCheckpoint
+from app.services.evaluation_memo import EvaluationMemo, get_evaluation_store
+from app.services.indicators import parent_window
+from app.services.online_metrics import OnlineMetrics
+from app.services.parallel import ParallelEvaluator
+from app.services.mmap_store import OHLCVArrays, as_market_frame
+from app.config import settings
+from app.services.progress import ProgressReporter
+from app.services.result_cache import get_result_cache, make_result_key
+from app.services.result_sink import ResultSink, link_results, results_path
+from app.utils.fingerprint import dataset_fingerprint, stable_hash
 import itertools
 
 
+# 행 구간 [start, stop)
+Rows = Tuple[int, int]
+
+
+def walk_forward_folds(
+    n_rows: int,
+    train_size: int,
+    test_size: int,
+    step: Optional[int] = None,
+    anchored: bool = False
+) -> List[Tuple[Rows, Rows]]:
+    """
+    워크포워드 (학습 구간, 검증 구간) 행 범위
+
+    Args:
+        train_size / test_size: 학습·검증 봉 수
+        step: 다음 구간까지 이동할 봉 수 (기본 test_size, 검증 구간이 겹치지 않음)
+        anchored: True 면 학습 구간 시작을 0 에 고정하고 끝만 늘림
+    """
+
+    if train_size < 1 or test_size < 1:
+        raise ValueError("train_size and test_size must be positive")
+
+    step = step or test_size
+    folds = []
+    start = 0
+    while start + train_size + test_size <= n_rows:
+        train_end = start + train_size
+        folds.append((
+            (0 if anchored else start, train_end),
+            (train_end, train_end + test_size)
+        ))
+        start += step
+
+    if not folds:
+        raise ValueError("Not enough market data for walk-forward folds")
+    return folds
+
+
 class StrategyOptimizer:
     """전략 파라미터 최적화기"""
 
     def __init__(
         self,
         strategy_code: str,
-        market_data: pd.DataFrame,
-        initial_capital: float = 10000.0
+        market_data: Union[pd.DataFrame, OHLCVArrays],
+        initial_capital: float = 10000.0,
+        n_jobs: Optional[int] = None,  # None = 설정값, -1 = 모든 코어
+        random_state: Optional[int] = None,
+        progress: Optional[ProgressReporter] = None,
+        commission: float = 0.001,
+        use_cache: bool = True,  # 같은 최적화 결과가 캐시에 있으면 재사용
+        persistent_memo: Optional[bool] = None,  # None = 설정값 (평가 메모 공유)
+        top_k: Optional[int] = None,  # 결과에 담을 상위 조합 수 (None = 설정값)
+        results_id: Optional[str] = None,  # 전체 결과를 Parquet 로 기록할 이름 (None = 기록 안 함)
+        checkpoint: Optional[OptimizationCheckpoint] = None  # 진행 상태 저장·재개 (None = 사용 안 함)
     ):
         self.strategy_code = strategy_code
-        self.market_data = market_data
+        # OHLCVArrays 뷰는 복사 없이 DataFrame 으로 감쌈
+        self.market_data = as_market_frame(market_data)
         self.initial_capital = initial_capital
-        self.optimization_results = []
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+        self.progress = progress  # 평가 수와 현재 최고 결과 보고 (없으면 생략)
+        self.commission = commission
+        self.result_cache = get_result_cache() if use_cache else None
+        self.persistent_memo = persistent_memo
+        self.top_k = top_k or settings.OPTIMIZER_TOP_K
+        self.results_id = results_id
+        self.checkpoint = checkpoint
+        self.optimization_results = []  # 상위 결과 (top_k 개)
+        self._best_return = float('-inf')
+        self._data_fingerprint = None
+        self._memo: Optional[EvaluationMemo] = None
+
+    def _create_evaluator(self) -> ParallelEvaluator:
+        """파라미터 평가용 병렬 실행기 생성"""
+
+        return ParallelEvaluator(
+            strategy_code=self.strategy_code,
+            market_data=self.market_data,
+            initial_capital=self.initial_capital,
+            commission=self.commission,
+            n_jobs=self.n_jobs
+        )
 
-    def grid_search(
+    def _cache_key(self, method: str, spec: Dict[str, Any]) -> Optional[str]:
+        """최적화 결과 캐시 키 (캐시를 쓰지 않으면 None)"""
+
+        if self.result_cache is None:
+            return None
+
+        return make_result_key(
+            'optimization',
+            self.strategy_code,
+            {'method': method, 'top_k': self.top_k, **spec},
+            self._fingerprint(),
+            self._engine_settings()
+        )
+
+    def _fingerprint(self) -> str:
+        """시장 데이터 지문 (한 번만 계산)"""
+
+        if self._data_fingerprint is None:
+            self._data_fingerprint = dataset_fingerprint(self.market_data)
+        return self._data_fingerprint
+
+    def _engine_settings(self) -> Dict[str, Any]:
+        return {
+            'initial_capital': float(self.initial_capital),
+            'commission': float(self.commission),
+        }
+
+    def _create_memo(self) -> EvaluationMemo:
+        """최적화 한 번의 평가 메모 (설정에 따라 공유 저장소 사용)"""
+
+        persistent = self.persistent_memo
+        if persistent is None:
+            persistent = settings.EVALUATION_MEMO_PERSISTENT
+
+        scope = make_result_key(
+            'evaluation', self.strategy_code, {},
+            self._fingerprint(), self._engine_settings()
+        )
+        self._memo = EvaluationMemo(
+            scope, get_evaluation_store() if persistent else None
+        )
+        return self._memo
+
+    def _cached_result(self, cache_key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """캐시된 최적화 결과"""
+
+        if cache_key is None:
+            return None
+
+        cached = self.result_cache.get(cache_key)
+        if cached is None:
+            return None
+
+        # 전체 결과 파일을 요청했으면 캐시된 실행의 파일을 이번 ID 로 연결
+        # (파일이 없으면 다시 실행)
+        if 'results_total' in cached and self._spill_path() is not None:
+            source_id = cached.get('results_id')
+            if not source_id or not link_results(source_id, self.results_id):
+                return None
+            cached = {**cached, 'results_id': self.results_id}
+
+        self.optimization_results = cached.get('top_results', [])
+        return cached
+
+    def _store_result(
+        self, cache_key: Optional[str], result: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """최적화 결과를 캐시에 저장"""
+
+        if cache_key is not None:
+            self.result_cache.set(cache_key, result)
+        return result
+
+    def _spill_path(self) -> Optional[str]:
+        """전체 결과 파일 경로 (results_id 가 없거나 저장하지 않으면 None)"""
+
+        if self.results_id and settings.OPTIMIZER_RESULTS_DIR:
+            return results_path(self.results_id)
+        return None
+
+    def _create_sink(self) -> ResultSink:
+        """상위 결과 수집기 (results_id 가 있으면 전체 결과를 파일로 기록)"""
+
+        return ResultSink(top_k=self.top_k, spill_path=self._spill_path())
+
+    def _finish(
         self,
-        param_grid: Dict[str, List[Any]]
+        cache_key: Optional[str],
+        sink: ResultSink,
+        result: Dict[str, Any]
     ) -> Dict[str, Any]:
-        """
-        그리드 서치 최적화
+        """수집기를 닫고 최고 결과·상위 결과를 담아 저장"""
 
-        Args:
-            param_grid: 파라미터 그리드
-                예: {"short_period": [10, 20, 30], "long_period": [40, 50, 60]}
+        sink.close()
+        best_params, best_metrics = sink.best()
+        top_results = sink.top()
+        self.optimization_results = top_results
+
+        if self.checkpoint is not None:
+            self.checkpoint.delete()
+
+        return self._store_result(cache_key, {
+            **result,
+            'best_params': best_params,
+            'best_metrics': best_metrics,
+            'evaluation_stats': self._memo.stats(),
+            'results_total': sink.total,
+            'results_id': self.results_id if sink.spill_path else None,
+            'top_results': top_results,
+        })
+
+    def _resume(
+        self,
+        method: str,
+        spec: Dict[str, Any],
+        sink: ResultSink
+    ) -> Dict[str, Any]:
+        """
+        체크포인트가 있으면 평가 메모·수집기·진행 상황 복원
 
         Returns:
-            최적 파라미터 및 결과
+            저장된 진행 상태 (체크포인트가 없으면 빈 dict)
         """
 
-        # 모든 파라미터 조합 생성
-        param_names = list(param_grid.keys())
-        param_values = list(param_grid.values())
-        param_combinations = list(itertools.product(*param_values))
+        if self.checkpoint is None:
+            return {}
+
+        state = self.checkpoint.load()
+        if state is None:
+            return {}
+
+        saved = (state['method'], state['spec'], state['scope'])
+        if saved != (method, stable_hash(spec), self._memo.scope):
+            raise ValueError(
+                f"Checkpoint {self.checkpoint.checkpoint_id} does not match this optimization"
+            )
+
+        self._memo.restore(state['memo'])
+        sink.restore(state['sink'])
+
+        best_params, best_metrics = sink.best()
+        best = None
+        if best_metrics is not None:
+            self._best_return = best_metrics.get('total_return', 0)
+            best = {'params': best_params, 'total_return': self._best_return}
+        if self.progress is not None:
+            self.progress.update(
+                done=sink.total, best=best,
+                message=f"resumed after {sink.total} evaluations", force=True
+            )
+
+        return state
+
+    def _save_checkpoint(
+        self,
+        method: str,
+        spec: Dict[str, Any],
+        sink: ResultSink,
+        **extra: Any
+    ):
+        """설정한 간격이 지났으면 진행 상태 저장 (extra = 탐색 방법별 상태)"""
+
+        if self.checkpoint is None or not self.checkpoint.due():
+            return
+
+        self.checkpoint.save({
+            'method': method,
+            'spec': stable_hash(spec),
+            'scope': self._memo.scope,
+            'memo': self._memo.checkpoint(),
+            'sink': sink.checkpoint(),
+            **extra,
+        })
+
+    @staticmethod
+    def _blocks(parameter_sets: Iterable[dict], size: int) -> Iterator[List[dict]]:
+        """파라미터 세트를 size 개씩 나누어 생성 (전체 목록을 만들지 않음)"""
+
+        iterator = iter(parameter_sets)
+        while True:
+            block = list(itertools.islice(iterator, size))
+            if not block:
+                return
+            yield block
+
+    def _start_progress(self, total: int):
+        """진행 상황과 평가 메모 초기화"""
+
+        self._create_memo()
+        self._best_return = float('-inf')
+        if self.progress is not None:
+            self.progress.update(done=0, total=total, force=True)
+
+    def _evaluate(
+        self,
+        evaluator: ParallelEvaluator,
+        parameter_sets: List[dict],
+        done: int = 0,
+        rows: Optional[Tuple[int, int]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        파라미터 세트 평가 (묶음마다 진행 상황 보고)
+
+        평가 메모에 있는 조합과 같은 호출 안의 중복 조합은 다시 백테스트하지
+        않습니다.
+
+        Args:
+            done: 이전까지 평가한 수 (반복 최적화용)
+            rows: 평가할 행 구간 (None = 전체)
+        """
+
+        memo = self._memo or self._create_memo()
+        keys = [memo.key(params, rows) for params in parameter_sets]
+        missing = memo.lookup(keys)
+
+        first = {}
+        for key, params in zip(keys, parameter_sets):
+            first.setdefault(key, params)
+        pending = [first[key] for key in missing]
+
+        def report(params_list: List[dict], offset: int, metric_rows: List[Dict[str, Any]]):
+            best = None
+            for i, metrics in enumerate(metric_rows):
+                total_return = metrics.get('total_return', 0)
+                if total_return > self._best_return:
+                    self._best_return = total_return
+                    best = {
+                        'params': params_list[offset + i],
+                        'total_return': total_return
+                    }
+            self.progress.update(done=done + offset + len(metric_rows), best=best)
+
+        # 메모 크기를 넘는 호출에서도 밀려나지 않도록 이번 호출 값은 따로 보관
+        missing_keys = set(missing)
+        known = {
+            key: memo.get(key) for key in first if key not in missing_keys
+        }
+
+        if pending:
+            on_chunk = None
+            if self.progress is not None:
+                def on_chunk(offset: int, metric_rows: List[Dict[str, Any]]):
+                    report(pending, offset, metric_rows)
+
+            metric_rows = evaluator.evaluate(pending, on_chunk=on_chunk, rows=rows)
+            for key, metrics in zip(missing, metric_rows):
+                memo.set(key, metrics)
+                known[key] = metrics
+
+        results = [dict(known[key]) for key in keys]
+
+        # 메모에서 가져온 조합까지 포함해 진행 상황 갱신
+        if self.progress is not None and len(pending) < len(parameter_sets):
+            report(parameter_sets, 0, results)
+
+        return results
+
+    @staticmethod
+    def _collect_results(
+        parameter_sets: List[dict],
+        metric_rows: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], Optional[dict], Optional[dict]]:
+        """평가 결과를 파라미터와 묶고 최고 수익률 조합 선택"""
 
         best_return = float('-inf')
         best_params = None
@@ -52,47 +378,83 @@ class StrategyOptimizer:
 
         results = []
 
-        for i, combination in enumerate(param_combinations):
-            # 파라미터 딕셔너리 생성
-            params = dict(zip(param_names, combination))
-
-            # 백테스트 실행
-            engine = BacktestEngine(
-                strategy_code=self.strategy_code,
-                parameters=params,
-                initial_capital=self.initial_capital
-            )
-
-            result = engine.execute(self.market_data)
-
+        for params, metrics in zip(parameter_sets, metric_rows):
             # 결과 저장
-            total_return = result.metrics.get('total_return', 0)
+            total_return = metrics.get('total_return', 0)
             results.append({
                 'params': params,
-                'metrics': result.metrics,
+                'metrics': metrics,
                 'total_return': total_return
             })
 
-            # 최고 수익률 업데이트
+            # 최고 수익률 업데이트 (동률이면 먼저 평가된 조합 유지)
             if total_return > best_return:
                 best_return = total_return
                 best_params = params
-                best_metrics = result.metrics
+                best_metrics = metrics
 
-        self.optimization_results = results
+        return results, best_params, best_metrics
 
-        return {
+    @staticmethod
+    def _grid_parameter_sets(param_grid: Dict[str, List[Any]]) -> List[dict]:
+        """모든 파라미터 조합 생성"""
+
+        return list(StrategyOptimizer._iter_grid(param_grid))
+
+    @staticmethod
+    def _iter_grid(param_grid: Dict[str, List[Any]]) -> Iterator[dict]:
+        """파라미터 조합을 하나씩 생성"""
+
+        param_names = list(param_grid.keys())
+        for combination in itertools.product(*param_grid.values()):
+            yield dict(zip(param_names, combination))
+
+    def grid_search(
+        self,
+        param_grid: Dict[str, List[Any]]
+    ) -> Dict[str, Any]:
+        """
+        그리드 서치 최적화
+
+        Args:
+            param_grid: 파라미터 그리드
+                예: {"short_period": [10, 20, 30], "long_period": [40, 50, 60]}
+
+        Returns:
+            최적 파라미터 및 결과
+        """
+
+        spec = {'param_grid': param_grid}
+        cache_key = self._cache_key('grid_search', spec)
+        cached = self._cached_result(cache_key)
+        if cached is not None:
+            return cached
+
+        total = int(np.prod([len(values) for values in param_grid.values()]))
+        self._start_progress(total)
+        sink = self._create_sink()
+        self._resume('grid_search', spec, sink)
+
+        # 평가한 조합 수(sink.total)가 그리드 커서
+        grid = itertools.islice(self._iter_grid(param_grid), sink.total, None)
+
+        # 조합을 블록 단위로 만들어 워커에서 배치 백테스트 (메모리 일정)
+        with self._create_evaluator() as evaluator:
+            for block in self._blocks(grid, settings.OPTIMIZER_BLOCK_SIZE):
+                metric_rows = self._evaluate(evaluator, block, done=sink.total)
+                sink.add_many(block, metric_rows)
+                self._save_checkpoint('grid_search', spec, sink)
+
+        return self._finish(cache_key, sink, {
             'method': 'grid_search',
-            'best_params': best_params,
-            'best_metrics': best_metrics,
-            'total_iterations': len(param_combinations),
-            'all_results': results
-        }
+            'total_iterations': total,
+        })
 
     def bayesian_optimization(
         self,
         param_space: Dict[str, Tuple[float, float]],
-        n_calls: int = 50
+        n_calls: int = 50,
+        n_points: int = 8
     ) -> Dict[str, Any]:
         """
         베이지안 최적화
@@ -101,11 +463,19 @@ class StrategyOptimizer:
             param_space: 파라미터 범위
                 예: {"short_period": (5, 30), "long_period": (30, 100)}
             n_calls: 최적화 반복 횟수
+            n_points: 한 번에 제안받아 병렬 평가할 파라미터 수.
+                워커 수와 무관하게 고정되므로 결과가 재현됩니다.
 
         Returns:
             최적 파라미터 및 결과
         """
 
+        spec = {'param_space': param_space, 'n_calls': n_calls, 'n_points': n_points}
+        cache_key = self._cache_key('bayesian', spec)
+        cached = self._cached_result(cache_key)
+        if cached is not None:
+            return cached
+
         # skopt 공간 정의
         param_names = list(param_space.keys())
         dimensions = [
@@ -113,62 +483,45 @@ class StrategyOptimizer:
             for name, bounds in param_space.items()
         ]
 
-        results = []
-
-        @use_named_args(dimensions)
-        def objective(**params):
-            """최소화할 목적 함수 (음수 수익률)"""
-
-            # 백테스트 실행
-            engine = BacktestEngine(
-                strategy_code=self.strategy_code,
-                parameters=params,
-                initial_capital=self.initial_capital
-            )
-
-            result = engine.execute(self.market_data)
-            total_return = result.metrics.get('total_return', 0)
-
-            # 결과 저장
-            results.append({
-                'params': params.copy(),
-                'metrics': result.metrics,
-                'total_return': total_return
-            })
-
-            # 음수 반환 (최소화 문제로 변환)
-            return -total_return
-
-        # 베이지안 최적화 실행
-        res = gp_minimize(
-            objective,
+        optimizer = Optimizer(
             dimensions,
-            n_calls=n_calls,
-            random_state=42,
-            verbose=False
-        )
-
-        # 최적 파라미터
-        best_params = dict(zip(param_names, res.x))
-        best_return = -res.fun
-
-        # 최적 파라미터로 재실행하여 메트릭 얻기
-        engine = BacktestEngine(
-            strategy_code=self.strategy_code,
-            parameters=best_params,
-            initial_capital=self.initial_capital
+            base_estimator="GP",
+            n_initial_points=min(10, n_calls),
+            random_state=42
         )
-        result = engine.execute(self.market_data)
-
-        self.optimization_results = results
 
-        return {
+        self._start_progress(n_calls)
+        sink = self._create_sink()
+
+        # 재개하면 저장된 Optimizer (관측값·대리 모델·난수 상태 포함) 로 이어서 제안
+        state = self._resume('bayesian', spec, sink)
+        optimizer = state.get('optimizer', optimizer)
+
+        with self._create_evaluator() as evaluator:
+            while sink.total < n_calls:
+                # 제안받은 파라미터 묶음을 병렬 평가
+                batch = min(n_points, n_calls - sink.total)
+                points = optimizer.ask(n_points=batch)
+                parameter_sets = [
+                    {name: int(value) for name, value in zip(param_names, point)}
+                    for point in points
+                ]
+                metric_rows = self._evaluate(
+                    evaluator, parameter_sets, done=sink.total
+                )
+                sink.add_many(parameter_sets, metric_rows)
+
+                # 음수 수익률을 전달 (최소화 문제로 변환)
+                optimizer.tell(
+                    [list(point) for point in points],
+                    [-float(m.get('total_return', 0)) for m in metric_rows]
+                )
+                self._save_checkpoint('bayesian', spec, sink, optimizer=optimizer)
+
+        return self._finish(cache_key, sink, {
             'method': 'bayesian',
-            'best_params': best_params,
-            'best_metrics': result.metrics,
             'total_iterations': n_calls,
-            'all_results': results
-        }
+        })
 
     def random_search(
         self,
@@ -186,50 +539,290 @@ class StrategyOptimizer:
             최적 파라미터 및 결과
         """
 
-        best_return = float('-inf')
-        best_params = None
-        best_metrics = None
-        results = []
+        # 시드가 없으면 결과가 매번 달라지므로 캐시하지 않음
+        spec = {
+            'param_space': param_space,
+            'n_iter': n_iter,
+            'random_state': self.random_state
+        }
+        cache_key = None
+        if self.random_state is not None:
+            cache_key = self._cache_key('random_search', spec)
+        cached = self._cached_result(cache_key)
+        if cached is not None:
+            return cached
+
+        # 무작위 파라미터는 메인 프로세스에서 순서대로 생성 (워커 수와 무관)
+        rng = np.random.RandomState(self.random_state)
+
+        def draw(count: int) -> Iterator[dict]:
+            for _ in range(count):
+                params = {}
+                for name, (min_val, max_val) in param_space.items():
+                    # 정수형 파라미터인지 확인
+                    if isinstance(min_val, int) and isinstance(max_val, int):
+                        params[name] = int(rng.randint(min_val, max_val + 1))
+                    else:
+                        params[name] = float(rng.uniform(min_val, max_val))
+                yield params
+
+        self._start_progress(n_iter)
+        sink = self._create_sink()
+
+        # 재개하면 저장된 난수 상태에서 남은 조합만 생성
+        state = self._resume('random_search', spec, sink)
+        if 'rng' in state:
+            rng.set_state(state['rng'])
+
+        # 블록 단위로 생성·백테스트 (블록을 만든 만큼만 난수를 소비)
+        with self._create_evaluator() as evaluator:
+            for block in self._blocks(
+                draw(n_iter - sink.total), settings.OPTIMIZER_BLOCK_SIZE
+            ):
+                metric_rows = self._evaluate(evaluator, block, done=sink.total)
+                sink.add_many(block, metric_rows)
+                self._save_checkpoint(
+                    'random_search', spec, sink, rng=rng.get_state()
+                )
+
+        return self._finish(cache_key, sink, {
+            'method': 'random_search',
+            'total_iterations': n_iter,
+        })
 
-        for i in range(n_iter):
-            # 무작위 파라미터 생성
-            params = {}
-            for name, (min_val, max_val) in param_space.items():
-                # 정수형 파라미터인지 확인
-                if isinstance(min_val, int) and isinstance(max_val, int):
-                    params[name] = np.random.randint(min_val, max_val + 1)
-                else:
-                    params[name] = np.random.uniform(min_val, max_val)
-
-            # 백테스트 실행
-            engine = BacktestEngine(
-                strategy_code=self.strategy_code,
-                parameters=params,
-                initial_capital=self.initial_capital
-            )
+    def successive_halving(
+        self,
+        param_grid: Dict[str, List[Any]],
+        eta: int = 3,
+        min_bars: int = 252
+    ) -> Dict[str, Any]:
+        """
+        연속 반감(successive halving) 그리드 서치
 
-            result = engine.execute(self.market_data)
-            total_return = result.metrics.get('total_return', 0)
+        모든 조합을 데이터 앞부분(짧은 구간)에서 평가하고 상위 1/eta 만 남겨
+        구간을 eta 배씩 늘리며 전체 기간까지 반복합니다.
 
-            # 결과 저장
-            results.append({
-                'params': params,
-                'metrics': result.metrics,
-                'total_return': total_return
+        단계마다 살아남은 조합을 봉 0 부터 다시 시뮬레이션하며, 이전 단계
+        끝의 잔고·포지션을 이어받지 않습니다. 재사용되는 것은 지표(ta)뿐으로,
+        구간은 같은 데이터의 iloc 뷰이고 지표는 전체 데이터 기준 캐시를 잘라
+        쓰므로 다시 계산하지 않습니다. cost_ratio 도 이렇게 다시 평가한 봉 수를
+        기준으로 셉니다.
+
+        Args:
+            param_grid: 파라미터 그리드
+            eta: 단계마다 남길 비율의 역수 (3 = 상위 1/3)
+            min_bars: 첫 단계의 최소 봉 수
+
+        Returns:
+            최적 파라미터 및 결과 (top_results 는 마지막 단계의 전체 기간 결과)
+        """
+
+        if eta < 2:
+            raise ValueError("eta must be at least 2")
+
+        cache_key = self._cache_key('halving', {
+            'param_grid': param_grid, 'eta': eta, 'min_bars': min_bars
+        })
+        cached = self._cached_result(cache_key)
+        if cached is not None:
+            return cached
+
+        candidates = self._grid_parameter_sets(param_grid)
+        n_rows = len(self.market_data)
+
+        # 단계 수: 구간이 min_bars 이상이고 후보가 1개 이상 남는 동안
+        n_rungs = 1
+        while (
+            n_rows // eta ** n_rungs >= min_bars
+            and len(candidates) > eta ** n_rungs
+        ):
+            n_rungs += 1
+
+        spans = [n_rows // eta ** (n_rungs - 1 - k) for k in range(n_rungs)]
+        counts = [len(candidates)]
+        for _ in range(n_rungs - 1):
+            counts.append(-(-counts[-1] // eta))
+        total = sum(counts)
+        self._start_progress(total)
+
+        rungs = []
+        done = 0
+        with self._create_evaluator() as evaluator:
+            for k, span in enumerate(spans):
+                metric_rows = self._evaluate(
+                    evaluator, candidates, done=done, rows=(0, span)
+                )
+                results, _, _ = self._collect_results(candidates, metric_rows)
+                rungs.append({'bars': span, 'candidates': len(candidates)})
+
+                done += len(candidates)
+                if self.progress is not None:
+                    self.progress.update(
+                        done=done, message=f"{span} bars, {len(candidates)} candidates"
+                    )
+
+                if k == len(spans) - 1:
+                    break
+
+                # 수익률 상위 1/eta 유지 (동률이면 먼저 평가된 조합 우선)
+                keep = -(-len(candidates) // eta)
+                order = sorted(
+                    range(len(results)),
+                    key=lambda i: -results[i]['total_return']
+                )[:keep]
+                candidates = [candidates[i] for i in sorted(order)]
+
+        sink = self._create_sink()
+        sink.add_many(candidates, metric_rows)
+        best_params, best_metrics = sink.best()
+
+        if self.progress is not None and best_metrics is not None:
+            self.progress.update(best={
+                'params': best_params,
+                'total_return': best_metrics.get('total_return', 0)
             })
 
-            # 최고 수익률 업데이트
-            if total_return > best_return:
-                best_return = total_return
-                best_params = params
-                best_metrics = result.metrics
+        # 전체 기간 그리드 서치 대비 평가한 봉 수 비율
+        cost = sum(rung['bars'] * rung['candidates'] for rung in rungs)
+        full_cost = n_rows * counts[0]
 
-        self.optimization_results = results
+        return self._finish(cache_key, sink, {
+            'method': 'halving',
+            'total_iterations': total,
+            'rungs': rungs,
+            'cost_ratio': round(cost / full_cost, 4) if full_cost else 0.0,
+        })
 
-        return {
-            'method': 'random_search',
-            'best_params': best_params,
-            'best_metrics': best_metrics,
-            'total_iterations': n_iter,
-            'all_results': results
-        }
+    def walk_forward(
+        self,
+        param_grid: Dict[str, List[Any]],
+        n_folds: int = 5,
+        train_size: Optional[int] = None,
+        test_size: Optional[int] = None,
+        step: Optional[int] = None,
+        anchored: bool = False
+    ) -> Dict[str, Any]:
+        """
+        워크포워드 최적화
+
+        학습 구간마다 그리드 서치로 최적 파라미터를 고르고, 바로 다음 검증
+        구간에서 표본 외(OOS) 성과를 측정한 뒤 검증 구간 수익 곡선을 이어
+        붙입니다. 모든 구간은 같은 시장 데이터(워커에서는 공유 메모리)의
+        iloc 뷰이며, 학습 구간 × 파라미터 묶음을 한 번에 워커에 나눠 줍니다.
+        지표(ta)는 전체 데이터 기준으로 한 번 계산해 구간마다 잘라 씁니다.
+
+        Args:
+            param_grid: 파라미터 그리드
+            n_folds: train_size / test_size 를 주지 않았을 때의 구간 수
+                (학습:검증 = 4:1)
+            train_size / test_size / step / anchored: walk_forward_folds 참고
+
+        Returns:
+            구간별 최적 파라미터·학습/검증 지표와 이어 붙인 OOS 수익 곡선·지표
+        """
+
+        n_rows = len(self.market_data)
+        if test_size is None:
+            test_size = n_rows // (n_folds + 4)
+        if train_size is None:
+            train_size = n_rows - n_folds * test_size
+
+        folds = walk_forward_folds(n_rows, train_size, test_size, step, anchored)
+
+        cache_key = self._cache_key('walk_forward', {
+            'param_grid': param_grid, 'folds': folds
+        })
+        cached = self._cached_result(cache_key)
+        if cached is not None:
+            return cached
+
+        parameter_sets = self._grid_parameter_sets(param_grid)
+        total = len(parameter_sets) * len(folds)
+        self._start_progress(total + len(folds))
+        evaluated = 0
+
+        def report(fold: int, offset: int, rows: List[Dict[str, Any]]):
+            nonlocal evaluated
+            evaluated += len(rows)
+            if self.progress is not None:
+                self.progress.update(
+                    done=evaluated, message=f"training fold {fold + 1}/{len(folds)}"
+                )
+
+        # 1. 학습 구간 최적화 (구간 × 파라미터 묶음 병렬)
+        with self._create_evaluator() as evaluator:
+            train_rows = evaluator.evaluate_folds(
+                [train for train, _ in folds], parameter_sets, on_chunk=report
+            )
+
+        # 2. 검증 구간 평가와 OOS 수익 곡선 연결 (구간 시작 자본 = 이전 구간 종료 가치)
+        index = self.market_data.index
+        fold_results = []
+        oos_equity = []
+        oos_trades = 0
+        capital = self.initial_capital
+
+        for i, ((train, test), metric_rows) in enumerate(zip(folds, train_rows)):
+            _, best_params, best_metrics = self._collect_results(
+                parameter_sets, metric_rows
+            )
+
+            engine = BacktestEngine(
+                strategy_code=self.strategy_code,
+                parameters=best_params or {},
+                initial_capital=self.initial_capital,
+                commission=self.commission,
+            )
+            with parent_window(self.market_data, *test):
+                result = engine.execute(self.market_data.iloc[test[0]:test[1]])
+
+            # 엔진 결과는 자본에 비례하므로 연결 시 배율만 조정
+            scale = capital / self.initial_capital
+            equity = np.asarray(result.equity_curve, dtype=np.float64) * scale
+            if len(equity):
+                capital = float(equity[-1])
+            oos_equity.append(equity)
+            oos_trades += result.metrics.get('total_trades', 0)
+
+            fold_results.append({
+                'fold': i,
+                'train_start': index[train[0]].isoformat(),
+                'train_end': index[train[1] - 1].isoformat(),
+                'test_start': index[test[0]].isoformat(),
+                'test_end': index[test[1] - 1].isoformat(),
+                'best_params': best_params,
+                'train_metrics': best_metrics,
+                'test_metrics': result.metrics,
+            })
+
+            if self.progress is not None:
+                self.progress.update(
+                    done=total + i + 1, best={
+                        'fold': i,
+                        'params': best_params,
+                        'test_return': result.metrics.get('total_return', 0),
+                    }
+                )
+
+        equity = np.concatenate(oos_equity)
+        online = OnlineMetrics(self.initial_capital)
+        online.update_batch(equity)
+        oos_metrics = online.snapshot()
+        oos_metrics['total_trades'] = int(oos_trades)
+
+        oos_index = index[np.concatenate([np.arange(*test) for _, test in folds])]
+        self.optimization_results = fold_results
+
+        return self._store_result(cache_key, {
+            'method': 'walk_forward',
+            # 가장 최근 학습 구간의 최적 파라미터 (다음 구간에 사용할 값)
+            'best_params': fold_results[-1]['best_params'],
+            'best_metrics': fold_results[-1]['test_metrics'],
+            'oos_metrics': oos_metrics,
+            'oos_equity': [
+                {'timestamp': timestamp.isoformat(), 'value': float(value)}
+                for timestamp, value in zip(oos_index, equity)
+            ],
+            'folds': fold_results,
+            'total_iterations': total,
+        })
@@ -0,0 +1,245 @@
+"""
+최적화용 병렬 백테스트 실행기
+"""
+
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Any, Optional, Tuple
+
+import pandas as pd
+
+from app.config import settings
+from app.services.backtest_engine import BacktestEngine
+from app.services.indicators import parent_window
+from app.services.shared_data import (
+    SharedMarketData,
+    SharedMarketDataHandle,
+    attach_market_data,
+)
+
+
+# 워커 프로세스별 상태 (initializer 에서 한 번만 설정)
+_worker_state: Dict[str, Any] = {}
+
+# 시장 데이터의 행 구간 [start, stop) (None = 전체)
+Rows = Optional[Tuple[int, int]]
+
+
+def resolve_n_jobs(n_jobs: Optional[int] = None) -> int:
+    """n_jobs 설정값을 실제 워커 수로 변환 (-1 = 모든 코어)"""
+
+    if n_jobs is None:
+        n_jobs = settings.OPTIMIZER_N_JOBS
+    if n_jobs is None or n_jobs < 1:
+        return os.cpu_count() or 1
+    return n_jobs
+
+
+def _init_worker(
+    strategy_code: str,
+    data_handle: SharedMarketDataHandle,
+    initial_capital: float,
+    commission: float,
+):
+    """워커 초기화: 공유 메모리의 시장 데이터에 연결 (복사 없음)"""
+
+    shm, market_data = attach_market_data(data_handle)
+
+    _worker_state['shm'] = shm
+    _worker_state['engine'] = BacktestEngine(
+        strategy_code=strategy_code,
+        parameters={},
+        initial_capital=initial_capital,
+        commission=commission,
+    )
+    _worker_state['market_data'] = market_data
+
+
+def _evaluate_chunk(task: Tuple[Rows, List[dict]]) -> List[Dict[str, Any]]:
+    """워커에서 파라미터 세트 묶음을 백테스트하여 지표 목록 반환"""
+
+    rows, parameter_sets = task
+    return _run_batch(
+        _worker_state['engine'], _worker_state['market_data'], parameter_sets, rows
+    )
+
+
+def _run_batch(
+    engine: BacktestEngine,
+    market_data: pd.DataFrame,
+    parameter_sets: List[dict],
+    rows: Rows = None,
+) -> List[Dict[str, Any]]:
+    """
+    파라미터 세트 묶음을 배치 엔진으로 실행
+
+    rows 가 있으면 그 구간의 iloc 뷰로 실행하고, 지표는 전체 데이터 기준
+    캐시를 잘라 사용합니다.
+    """
+
+    if rows is None:
+        table = engine.execute_batch(market_data, parameter_sets)
+    else:
+        start, stop = rows
+        with parent_window(market_data, start, stop):
+            table = engine.execute_batch(
+                market_data.iloc[start:stop], parameter_sets
+            )
+    param_names = {name for params in parameter_sets for name in params}
+    return table.drop(columns=list(param_names)).to_dict('records')
+
+
+class ParallelEvaluator:
+    """
+    파라미터 세트를 프로세스 풀에 나누어 백테스트
+
+    결과는 항상 입력 파라미터 순서대로 반환되며, 각 파라미터 세트의 결과는
+    다른 세트와 독립적으로 계산되므로 워커 수와 무관하게 동일합니다.
+    """
+
+    def __init__(
+        self,
+        strategy_code: str,
+        market_data: pd.DataFrame,
+        initial_capital: float = 10000.0,
+        commission: float = 0.001,
+        n_jobs: Optional[int] = None,
+        chunk_size: int = 64,
+    ):
+        self.strategy_code = strategy_code
+        self.market_data = market_data
+        self.initial_capital = initial_capital
+        self.commission = commission
+        self.n_jobs = resolve_n_jobs(n_jobs)
+        self.chunk_size = chunk_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._shared_data: Optional[SharedMarketData] = None
+
+    def evaluate(
+        self,
+        parameter_sets: List[dict],
+        on_chunk: Optional[Callable[[int, List[Dict[str, Any]]], None]] = None,
+        rows: Rows = None
+    ) -> List[Dict[str, Any]]:
+        """
+        파라미터 세트별 성과 지표 (입력 순서 유지)
+
+        Args:
+            on_chunk: 묶음이 끝날 때마다 (묶음 시작 위치, 묶음 결과) 로
+                입력 순서대로 호출 (진행 상황 보고용)
+            rows: 평가할 행 구간 [start, stop) (None = 전체)
+        """
+
+        callback = None
+        if on_chunk is not None:
+            def callback(fold: int, offset: int, chunk: List[Dict[str, Any]]):
+                on_chunk(offset, chunk)
+
+        return self.evaluate_folds([rows], parameter_sets, callback)[0]
+
+    def evaluate_folds(
+        self,
+        folds: List[Rows],
+        parameter_sets: List[dict],
+        on_chunk: Optional[Callable[[int, int, List[Dict[str, Any]]], None]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        여러 행 구간에서 같은 파라미터 세트들을 평가 (구간 × 묶음을 한 번에 분배)
+
+        Args:
+            folds: 행 구간 목록 (워커는 공유 데이터의 뷰를 사용하므로 복사 없음)
+            on_chunk: (구간 번호, 묶음 시작 위치, 묶음 결과) 로 입력 순서대로 호출
+
+        Returns:
+            구간별 지표 목록
+        """
+
+        results: List[List[Dict[str, Any]]] = [[] for _ in folds]
+        if not parameter_sets or not folds:
+            return results
+
+        if self.n_jobs == 1:
+            engine = BacktestEngine(
+                strategy_code=self.strategy_code,
+                parameters={},
+                initial_capital=self.initial_capital,
+                commission=self.commission,
+            )
+            if on_chunk is None:
+                return [
+                    _run_batch(engine, self.market_data, parameter_sets, rows)
+                    for rows in folds
+                ]
+
+            tasks = [
+                (i, (rows, chunk))
+                for i, rows in enumerate(folds)
+                for chunk in self._split(parameter_sets, self.chunk_size)
+            ]
+            chunk_results = (
+                _run_batch(engine, self.market_data, chunk, rows)
+                for _, (rows, chunk) in tasks
+            )
+        else:
+            # 워커마다 여러 묶음이 돌아가도록 묶음 크기 결정
+            size = -(-len(parameter_sets) * len(folds) // (self.n_jobs * 4))
+            size = max(1, min(self.chunk_size, size))
+            tasks = [
+                (i, (rows, chunk))
+                for i, rows in enumerate(folds)
+                for chunk in self._split(parameter_sets, size)
+            ]
+            chunk_results = self._get_executor().map(
+                _evaluate_chunk, [task for _, task in tasks]
+            )
+
+        for (fold, _), chunk_result in zip(tasks, chunk_results):
+            if on_chunk is not None:
+                on_chunk(fold, len(results[fold]), chunk_result)
+            results[fold].extend(chunk_result)
+        return results
+
+    @staticmethod
+    def _split(parameter_sets: List[dict], size: int) -> List[List[dict]]:
+        return [
+            parameter_sets[i:i + size]
+            for i in range(0, len(parameter_sets), size)
+        ]
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """프로세스 풀 (처음 사용할 때 생성)"""
+
+        if self._executor is None:
+            # 시장 데이터는 공유 메모리에 한 번만 게시하고 이름만 전달
+            self._shared_data = SharedMarketData(self.market_data)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.n_jobs,
+                mp_context=multiprocessing.get_context(
+                    settings.OPTIMIZER_MP_CONTEXT
+                ),
+                initializer=_init_worker,
+                initargs=(
+                    self.strategy_code,
+                    self._shared_data.handle,
+                    self.initial_capital,
+                    self.commission,
+                ),
+            )
+        return self._executor
+
+    def close(self):
+        """프로세스 풀 종료 및 공유 메모리 해제"""
+
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if self._shared_data is not None:
+            self._shared_data.close()
+            self._shared_data = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
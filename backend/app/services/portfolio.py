@@ -0,0 +1,392 @@
+"""
+다중 종목 포트폴리오 백테스트 엔진
+
+여러 종목의 시세를 (시간 × 종목) 2차원 배열로 정렬한 패널에 대해 전략이
+목표 비중을 반환하면, 리밸런싱 시점마다 종목 전체를 배열 연산으로 한 번에
+매매하고 포트폴리오·종목별 성과를 계산합니다.
+
+전략 코드 형식:
+
+    def strategy(panel, params):
+        close = panel.frame('close')  # 시간 × 종목 DataFrame
+        momentum = close.pct_change(params['lookback'])
+        top = momentum.rank(axis=1, ascending=False) <= params['top_n']
+        return top.div(top.sum(axis=1), axis=0)  # 목표 비중
+
+반환값은 (시간 × 종목) 배열 또는 종목 열을 가진 DataFrame 입니다. 행 전체가
+NaN 이면 그 봉에서는 리밸런싱하지 않고 보유 수량을 유지합니다. 비중 절댓값의
+합이 1 을 넘는 행은 1 로 축소합니다 (레버리지 없음).
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from app.services.backtest_engine import BacktestEngine
+from app.services.mmap_store import OHLCV_COLUMNS, OHLCVArrays
+from app.services.online_metrics import OnlineMetrics
+from app.services.progress import ProgressReporter
+from app.services.strategy_cache import strategy_cache
+
+
+@dataclass(frozen=True)
+class PanelData:
+    """시간 × 종목으로 정렬된 OHLCV 패널"""
+    timestamp: np.ndarray  # int64, UTC ns (T,)
+    symbols: tuple  # (N,)
+    open: np.ndarray  # float64 (T, N), 상장 전 NaN
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    @property
+    def shape(self) -> tuple:
+        return self.close.shape
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        return pd.DatetimeIndex(
+            self.timestamp.view('datetime64[ns]'), name='timestamp'
+        ).tz_localize('UTC')
+
+    def frame(self, column: str) -> pd.DataFrame:
+        """한 열을 시간 × 종목 DataFrame 으로 (배열을 복사하지 않음)"""
+
+        return pd.DataFrame(
+            getattr(self, column),
+            index=self.index,
+            columns=list(self.symbols),
+            copy=False
+        )
+
+    def slice(self, start: int, stop: int) -> "PanelData":
+        """위치 기준 기간 뷰"""
+
+        return PanelData(
+            timestamp=self.timestamp[start:stop],
+            symbols=self.symbols,
+            **{column: getattr(self, column)[start:stop] for column in OHLCV_COLUMNS}
+        )
+
+    @classmethod
+    def from_frames(cls, frames: Dict[str, Any]) -> "PanelData":
+        """
+        종목별 OHLCV (DataFrame 또는 OHLCVArrays) 를 합집합 시간축으로 정렬
+
+        가격 열은 직전 값으로 채우고 (상장 전은 NaN), 거래량은 0 으로 채웁니다.
+        """
+
+        symbols = tuple(frames)
+        timestamps = [_frame_timestamps(frames[symbol]) for symbol in symbols]
+        timestamp = (
+            np.unique(np.concatenate(timestamps)) if timestamps
+            else np.zeros(0, dtype=np.int64)
+        )
+
+        shape = (len(timestamp), len(symbols))
+        columns = {
+            column: np.full(shape, np.nan if column != 'volume' else 0.0)
+            for column in OHLCV_COLUMNS
+        }
+
+        for j, symbol in enumerate(symbols):
+            data = frames[symbol]
+            # 같은 타임스탬프가 여러 번 있으면 마지막 행 사용
+            rows = np.searchsorted(timestamp, timestamps[j])
+            for column in OHLCV_COLUMNS:
+                values = (
+                    getattr(data, column) if isinstance(data, OHLCVArrays)
+                    else data[column].to_numpy(dtype=np.float64)
+                )
+                columns[column][rows, j] = values
+
+        # 가격 열 전방 채움 (열마다 마지막 유효 행 위치)
+        rows = np.arange(shape[0])[:, None]
+        for column in ('open', 'high', 'low', 'close'):
+            values = columns[column]
+            last = np.where(~np.isnan(values), rows, -1)
+            np.maximum.accumulate(last, axis=0, out=last)
+            filled = np.take_along_axis(values, np.maximum(last, 0), axis=0)
+            columns[column] = np.where(last >= 0, filled, np.nan)
+
+        return cls(timestamp=timestamp, symbols=symbols, **columns)
+
+
+def _frame_timestamps(data) -> np.ndarray:
+    """DataFrame / OHLCVArrays 의 UTC ns 타임스탬프"""
+
+    if isinstance(data, OHLCVArrays):
+        return np.asarray(data.timestamp, dtype=np.int64)
+
+    index = pd.DatetimeIndex(data.index)
+    index = (
+        index.tz_localize('UTC') if index.tz is None
+        else index.tz_convert('UTC')
+    )
+    return index.as_unit('ns').asi8
+
+
+@dataclass
+class PortfolioSimulation:
+    """목표 비중 시뮬레이션 결과"""
+    equity: np.ndarray  # 봉별 포트폴리오 가치 (T,)
+    rebalance_index: np.ndarray  # 리밸런싱한 봉 위치 (R,)
+    holdings: np.ndarray  # 리밸런싱 직후 보유 수량 (R, N)
+    cash: np.ndarray  # 리밸런싱 직후 현금 (R,)
+    traded_value: np.ndarray  # 종목별 누적 매매 금액 (N,)
+    commission: np.ndarray  # 종목별 누적 수수료 (N,)
+    trades: np.ndarray  # 종목별 체결 횟수 (N,)
+
+
+def normalize_weights(weights, shape: tuple, close: np.ndarray) -> np.ndarray:
+    """
+    목표 비중을 (T, N) float64 배열로 정리
+
+    가격이 없는 (상장 전) 종목은 0, 비중 절댓값 합이 1 을 넘는 행은 1 로
+    축소합니다. 전체가 NaN 인 행(리밸런싱 안 함)은 그대로 둡니다.
+    """
+
+    weights = np.array(weights, dtype=np.float64)
+    if weights.shape != shape:
+        raise ValueError(
+            f"Strategy must return weights of shape {shape}, got {weights.shape}"
+        )
+
+    hold = np.isnan(weights).all(axis=1)
+    weights = np.where(np.isnan(close), 0.0, np.nan_to_num(weights))
+
+    gross = np.abs(weights).sum(axis=1)
+    weights /= np.maximum(gross, 1.0)[:, None]
+
+    weights[hold] = np.nan
+    return weights
+
+
+def simulate_weights(
+    close: np.ndarray,
+    weights: np.ndarray,
+    initial_capital: float,
+    commission: float,
+    progress: Optional[ProgressReporter] = None
+) -> PortfolioSimulation:
+    """
+    목표 비중 리밸런싱 시뮬레이션
+
+    리밸런싱 봉의 종가로 체결하며, 수수료 추정치를 뺀 자산 기준으로 목표
+    금액을 정하므로 전액 투자해도 현금이 (거의) 음수가 되지 않습니다.
+    리밸런싱 사이에는 보유 수량이 고정이므로 수익 곡선은 구간별 보유
+    수량으로 한 번에 계산합니다. 반복은 리밸런싱 횟수만큼이며 종목 방향은
+    모두 배열 연산입니다.
+    """
+
+    n_bars, n_symbols = close.shape
+    price = np.nan_to_num(close)
+
+    rebalance_index = np.flatnonzero(~np.isnan(weights).all(axis=1))
+    holdings = np.zeros((len(rebalance_index), n_symbols))
+    cash_path = np.zeros(len(rebalance_index))
+    traded_value = np.zeros(n_symbols)
+    fees = np.zeros(n_symbols)
+    trades = np.zeros(n_symbols, dtype=np.int64)
+
+    quantity = np.zeros(n_symbols)
+    cash = float(initial_capital)
+
+    for k, t in enumerate(rebalance_index.tolist()):
+        p = price[t]
+        value = quantity * p
+        equity = cash + value.sum()
+
+        target = weights[t] * equity
+        estimated_fee = np.abs(target - value).sum() * commission
+        target = weights[t] * (equity - estimated_fee)
+
+        trade = np.abs(target - value)
+        fee = trade * commission
+        with np.errstate(divide='ignore', invalid='ignore'):
+            quantity = np.where(p > 0, target / p, 0.0)
+        cash = equity - target.sum() - fee.sum()
+
+        traded = trade > 1e-9 * max(abs(equity), 1.0)
+        traded_value += trade
+        fees += fee
+        trades += traded
+
+        holdings[k] = quantity
+        cash_path[k] = cash
+
+        if progress is not None and k % 256 == 0:
+            progress.update(done=t, message="simulation")
+
+    # 봉마다 직전 리밸런싱의 보유 수량 · 현금
+    equity = np.full(n_bars, float(initial_capital))
+    if len(rebalance_index):
+        segment = np.searchsorted(rebalance_index, np.arange(n_bars), side='right') - 1
+        after = segment >= 0
+        held = holdings[segment[after]]
+        equity[after] = cash_path[segment[after]] + np.einsum(
+            'tn,tn->t', held, price[after]
+        )
+
+    return PortfolioSimulation(
+        equity=equity,
+        rebalance_index=rebalance_index,
+        holdings=holdings,
+        cash=cash_path,
+        traded_value=traded_value,
+        commission=fees,
+        trades=trades,
+    )
+
+
+def symbol_metrics(
+    close: np.ndarray,
+    sim: PortfolioSimulation,
+    symbols: Sequence[str],
+    initial_capital: float
+) -> Dict[str, Dict[str, Any]]:
+    """
+    종목별 성과 기여 (손익, 수익 기여도, 평균 비중, 보유 비율, 체결 수, 수수료)
+    """
+
+    n_bars = close.shape[0]
+    price = np.nan_to_num(close)
+
+    if len(sim.rebalance_index) == 0:
+        pnl = np.zeros(len(symbols))
+        avg_weight = exposure = np.zeros(len(symbols))
+    else:
+        segment = np.searchsorted(
+            sim.rebalance_index, np.arange(n_bars), side='right'
+        ) - 1
+        held = np.where(
+            (segment >= 0)[:, None], sim.holdings[np.maximum(segment, 0)], 0.0
+        )
+
+        # 봉 t-1 보유 수량 × 봉 t 가격 변화 - 수수료
+        pnl = (held[:-1] * np.diff(price, axis=0)).sum(axis=0) - sim.commission
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weight = held * price / sim.equity[:, None]
+        avg_weight = np.nan_to_num(weight).mean(axis=0) * 100
+        exposure = (held != 0).mean(axis=0) * 100
+
+    return {
+        symbol: {
+            'pnl': round(float(pnl[j]), 2),
+            'contribution': round(float(pnl[j] / initial_capital * 100), 2),
+            'avg_weight': round(float(avg_weight[j]), 2),
+            'exposure': round(float(exposure[j]), 2),
+            'trades': int(sim.trades[j]),
+            'commission': round(float(sim.commission[j]), 2),
+        }
+        for j, symbol in enumerate(symbols)
+    }
+
+
+@dataclass
+class PortfolioResult:
+    """포트폴리오 백테스트 결과"""
+    equity_curve: np.ndarray
+    metrics: Dict[str, Any]
+    symbol_metrics: Dict[str, Dict[str, Any]]
+    initial_capital: float
+    final_capital: float
+
+
+class PortfolioEngine:
+    """목표 비중 기반 다중 종목 백테스트 엔진"""
+
+    def __init__(
+        self,
+        strategy_code: str,
+        parameters: dict,
+        initial_capital: float = 10000.0,
+        commission: float = 0.001,
+        progress: Optional[ProgressReporter] = None,
+    ):
+        self.strategy_code = strategy_code
+        self.parameters = parameters
+        self.initial_capital = initial_capital
+        self.commission = commission
+        self.progress = progress
+
+    def execute(self, panel: PanelData) -> PortfolioResult:
+        """백테스트 실행"""
+
+        if self.progress is not None:
+            self.progress.update(
+                done=0, total=len(panel), message="weights", force=True
+            )
+
+        weights = normalize_weights(
+            self._execute_strategy(panel), panel.shape, panel.close
+        )
+
+        sim = simulate_weights(
+            panel.close, weights, self.initial_capital, self.commission,
+            progress=self.progress
+        )
+
+        if self.progress is not None:
+            self.progress.update(done=len(panel), message="metrics")
+
+        online = OnlineMetrics(self.initial_capital)
+        online.update_batch(sim.equity)
+
+        metrics = online.snapshot()
+        if metrics:
+            metrics.update({
+                'symbols': len(panel.symbols),
+                'rebalances': int(len(sim.rebalance_index)),
+                'total_trades': int(sim.trades.sum()),
+                'turnover': round(
+                    float(sim.traded_value.sum() / sim.equity.mean()), 2
+                ),
+                'commission_paid': round(float(sim.commission.sum()), 2),
+            })
+
+        return PortfolioResult(
+            equity_curve=sim.equity,
+            metrics=metrics,
+            symbol_metrics=symbol_metrics(
+                panel.close, sim, panel.symbols, self.initial_capital
+            ),
+            initial_capital=self.initial_capital,
+            final_capital=(
+                float(sim.equity[-1]) if len(sim.equity) else self.initial_capital
+            ),
+        )
+
+    def _execute_strategy(self, panel: PanelData):
+        """
+        전략을 실행하여 (시간 × 종목) 목표 비중 생성
+
+        Raises:
+            ValueError: 전략 함수가 없거나 실행 중 오류가 났을 때
+        """
+
+        strategy_func = strategy_cache.resolve(
+            self.strategy_code, BacktestEngine._sandbox_globals()
+        )
+
+        try:
+            if strategy_func.__code__.co_argcount >= 2:
+                weights = strategy_func(panel, self.parameters)
+            else:
+                weights = strategy_func(panel)
+        except Exception as e:
+            raise ValueError(f"Strategy execution error: {e}") from e
+
+        if isinstance(weights, pd.DataFrame):
+            weights = weights.reindex(columns=list(panel.symbols)).to_numpy(
+                dtype=np.float64
+            )
+        return weights
+
@@ -0,0 +1,190 @@
+"""
+작업 진행 상황 저장소
+
+백테스트·최적화 루프가 진행 이벤트를 남기고 API 가 이를 조회합니다.
+Redis 주소(PROGRESS_REDIS_URL, 없으면 Redis 브로커)가 있으면 Redis 에
+저장하므로 Celery 워커가 남긴 진행 상황을 API 프로세스에서 볼 수 있습니다.
+없으면 프로세스 메모리를 사용합니다.
+"""
+
+import json
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from app.config import settings
+
+
+# 더 이상 진행 이벤트가 오지 않는 상태
+FINAL_STATUSES = ("completed", "failed")
+
+
+class ProgressStore:
+    """프로세스 메모리 진행 상황 저장소"""
+
+    def __init__(self, ttl: float = 3600):
+        self.ttl = ttl
+        self._events: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def set(self, job_id: str, event: Dict[str, Any]):
+        with self._lock:
+            self._events[job_id] = event
+            self._expire()
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            event = self._events.get(job_id)
+            return dict(event) if event is not None else None
+
+    def _expire(self):
+        """TTL 이 지난 이벤트 제거"""
+
+        cutoff = time.time() - self.ttl
+        expired = [
+            job_id for job_id, event in self._events.items()
+            if event['updated_at'] < cutoff
+        ]
+        for job_id in expired:
+            del self._events[job_id]
+
+
+class RedisProgressStore:
+    """Redis 진행 상황 저장소 (프로세스 간 공유)"""
+
+    def __init__(self, url: str, ttl: float = 3600, prefix: str = "progress:"):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def set(self, job_id: str, event: Dict[str, Any]):
+        self.client.set(self.prefix + job_id, json.dumps(event), ex=int(self.ttl))
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        value = self.client.get(self.prefix + job_id)
+        return json.loads(value) if value is not None else None
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def progress_redis_url() -> str:
+    """
+    진행 상황 Redis 주소
+
+    PROGRESS_REDIS_URL 이 없으면 Celery 브로커가 Redis 일 때 그 주소를 써서
+    API 와 워커가 같은 저장소를 보게 합니다. eager 모드는 같은 프로세스에서
+    실행되므로 메모리 저장소로 충분합니다.
+    """
+
+    if settings.PROGRESS_REDIS_URL:
+        return settings.PROGRESS_REDIS_URL
+    broker = settings.CELERY_BROKER_URL
+    if not settings.CELERY_TASK_ALWAYS_EAGER and broker.startswith(("redis://", "rediss://")):
+        return broker
+    return ""
+
+
+def get_progress_store():
+    """설정에 맞는 진행 상황 저장소 (프로세스당 하나)"""
+
+    global _store
+    with _store_lock:
+        if _store is None:
+            url = progress_redis_url()
+            if url:
+                _store = RedisProgressStore(url, ttl=settings.PROGRESS_TTL_SECONDS)
+            else:
+                _store = ProgressStore(ttl=settings.PROGRESS_TTL_SECONDS)
+        return _store
+
+
+def progress_shared_with_workers() -> bool:
+    """Celery 워커가 남긴 진행 상황을 이 프로세스에서 볼 수 있는지"""
+
+    return (
+        settings.CELERY_TASK_ALWAYS_EAGER
+        or isinstance(get_progress_store(), RedisProgressStore)
+    )
+
+
+class ProgressReporter:
+    """
+    한 작업의 진행 이벤트 기록기
+
+    update 는 min_interval 초에 한 번만 저장소에 기록하므로 루프 안에서
+    자주 호출해도 됩니다 (force=True 또는 finish 는 바로 기록).
+    """
+
+    def __init__(
+        self,
+        job_id: str,
+        kind: str,
+        total: int = 0,
+        status: str = "running",
+        store=None,
+        min_interval: Optional[float] = None
+    ):
+        self.job_id = job_id
+        self.store = store or get_progress_store()
+        self.min_interval = (
+            settings.PROGRESS_MIN_INTERVAL if min_interval is None else min_interval
+        )
+        self.event: Dict[str, Any] = {
+            "job_id": job_id,
+            "kind": kind,
+            "status": status,
+            "done": 0,
+            "total": total,
+            "progress": 0.0,
+            "best": None,
+            "message": None,
+            "updated_at": 0.0,
+        }
+        self._last_write = 0.0
+
+    def update(
+        self,
+        done: Optional[int] = None,
+        total: Optional[int] = None,
+        best: Optional[Dict[str, Any]] = None,
+        message: Optional[str] = None,
+        force: bool = False,
+        metrics: Optional[Dict[str, Any]] = None
+    ):
+        """진행 상황 갱신 (throttle 적용, metrics = 실행 중 성과 지표)"""
+
+        if total is not None:
+            self.event['total'] = total
+        if done is not None:
+            self.event['done'] = done
+        if best is not None:
+            self.event['best'] = best
+        if message is not None:
+            self.event['message'] = message
+        if metrics is not None:
+            self.event['metrics'] = metrics
+
+        now = time.time()
+        if force or now - self._last_write >= self.min_interval:
+            self._write(now)
+
+    def finish(self, status: str = "completed", message: Optional[str] = None):
+        """작업 종료 기록"""
+
+        self.event['status'] = status
+        if status == "completed":
+            self.event['done'] = self.event['total']
+        self.update(message=message, force=True)
+
+    def _write(self, now: float):
+        total = self.event['total']
+        self.event['progress'] = (
+            round(min(self.event['done'] / total, 1.0), 4) if total else 0.0
+        )
+        self.event['updated_at'] = now
+        self._last_write = now
+        self.store.set(self.job_id, dict(self.event))
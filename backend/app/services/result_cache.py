@@ -0,0 +1,171 @@
+"""
+백테스트·최적화 결과 캐시 (내용 기반 키)
+
+키는 전략 코드 해시, 파라미터, 데이터 구간, 데이터 지문, 엔진 설정으로
+만들므로 입력이 같으면 다시 실행하지 않고 이전 결과를 사용합니다.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from app.config import settings
+from app.utils.fingerprint import stable_hash
+
+
+# 엔진·지표 계산 방식이 바뀌면 올려서 이전 결과를 무효화
+RESULT_CACHE_VERSION = 2
+
+
+def make_result_key(
+    kind: str,
+    strategy_code: str,
+    parameters: Dict[str, Any],
+    data_fingerprint: str,
+    engine_settings: Dict[str, Any]
+) -> str:
+    """
+    결과 캐시 키
+
+    Args:
+        kind: 'backtest', 'optimization' 등
+        parameters: 전략 파라미터 (최적화는 탐색 설정)
+        data_fingerprint: 데이터 구간과 내용의 지문
+        engine_settings: 초기 자본, 수수료, 시뮬레이션 모드 등
+    """
+
+    return stable_hash({
+        'version': RESULT_CACHE_VERSION,
+        'kind': kind,
+        'code': hashlib.sha256(strategy_code.encode('utf-8')).hexdigest(),
+        'parameters': parameters,
+        'data': data_fingerprint,
+        'engine': engine_settings,
+    })
+
+
+class MemoryResultCache:
+    """프로세스 메모리 LRU + TTL 결과 캐시"""
+
+    def __init__(self, maxsize: int = 256, ttl: float = 86400):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.time():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+        }
+
+
+def _json_default(value: Any) -> Any:
+    """NumPy 값 등 JSON 기본 형식이 아닌 값 변환"""
+
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+class RedisResultCache:
+    """
+    Redis 결과 캐시 (프로세스 간 공유, 만료는 Redis TTL, 용량은 maxmemory 정책)
+
+    공유 Redis 의 값을 그대로 역직렬화하므로 pickle 대신 JSON 으로 저장합니다.
+    튜플은 리스트로, NumPy 값은 파이썬 값으로 돌아옵니다.
+    """
+
+    def __init__(self, url: str, ttl: float = 86400, prefix: str = "result:"):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.client.get(self.prefix + key)
+        if value is None:
+            return None
+        try:
+            return json.loads(value)
+        except ValueError:
+            # 이전 형식(pickle) 등 읽을 수 없는 값은 없는 것으로
+            return None
+
+    def set(self, key: str, value: Any):
+        self.client.set(
+            self.prefix + key,
+            json.dumps(value, default=_json_default),
+            ex=int(self.ttl)
+        )
+
+    def delete(self, key: str):
+        self.client.delete(self.prefix + key)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache():
+    """설정에 맞는 결과 캐시 (프로세스당 하나, 비활성화면 None)"""
+
+    global _cache
+    if not settings.RESULT_CACHE_ENABLED:
+        return None
+
+    with _cache_lock:
+        if _cache is None:
+            if settings.RESULT_CACHE_REDIS_URL:
+                _cache = RedisResultCache(
+                    settings.RESULT_CACHE_REDIS_URL,
+                    ttl=settings.RESULT_CACHE_TTL_SECONDS
+                )
+            else:
+                _cache = MemoryResultCache(
+                    maxsize=settings.RESULT_CACHE_SIZE,
+                    ttl=settings.RESULT_CACHE_TTL_SECONDS
+                )
+        return _cache
@@ -0,0 +1,275 @@
+"""
+최적화 결과 수집기
+
+평가 결과를 모두 메모리에 쌓지 않고 상위 K 개만 힙으로 유지합니다. 전체
+결과가 필요하면 Parquet 파일로 흘려 쓰고(spill), 나중에 페이지 단위로
+읽습니다. 메모리 사용량은 탐색 크기와 무관하게 K 와 쓰기 버퍼 크기로
+정해집니다.
+
+    {OPTIMIZER_RESULTS_DIR}/{results_id}.parquet
+        index (평가 순서), params (JSON 문자열), 지표 열들
+
+체크포인트마다 쓰던 파일을 조각(.partN)으로 마감하고, 닫을 때 조각들을
+행 그룹 단위로 이어 붙여 최종 파일을 만듭니다.
+"""
+
+import heapq
+import json
+import os
+import re
+import shutil
+from typing import Any, Dict, Iterable, List, Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from app.config import settings
+
+
+def results_path(results_id: str) -> str:
+    """결과 파일 경로"""
+
+    safe_id = re.sub(r'[^A-Za-z0-9._-]', '_', results_id)
+    return os.path.join(settings.OPTIMIZER_RESULTS_DIR, f'{safe_id}.parquet')
+
+
+def link_results(source_id: str, target_id: str) -> bool:
+    """
+    기존 결과 파일을 다른 ID 로도 조회할 수 있게 연결 (하드 링크, 안 되면 복사)
+
+    Returns:
+        원본 파일이 있어 연결했으면 True
+    """
+
+    source = results_path(source_id)
+    target = results_path(target_id)
+    if source == target:
+        return os.path.exists(source)
+
+    try:
+        if os.path.exists(target):
+            os.remove(target)
+        os.link(source, target)
+    except FileNotFoundError:
+        return False
+    except OSError:
+        shutil.copyfile(source, target)
+    return True
+
+
+class ResultSink:
+    """
+    상위 K 개 결과 힙 + 선택적 Parquet 기록
+
+    순위는 metric 값 내림차순이며, 같으면 먼저 평가된 결과가 앞섭니다
+    (기존 최고 결과 선택 규칙과 동일).
+    """
+
+    def __init__(
+        self,
+        top_k: int = 100,
+        metric: str = 'total_return',
+        spill_path: Optional[str] = None,
+        buffer_size: int = 4096
+    ):
+        self.top_k = top_k
+        self.metric = metric
+        self.spill_path = spill_path
+        self.buffer_size = buffer_size
+        self.total = 0
+        self._heap: List[tuple] = []
+        self._buffer: List[Dict[str, Any]] = []
+        self._writer: Optional[pq.ParquetWriter] = None
+        self._schema: Optional[pa.Schema] = None
+        self._parts: List[str] = []
+
+    def add(self, params: dict, metrics: Dict[str, Any]):
+        """평가 결과 하나 추가"""
+
+        index = self.total
+        self.total += 1
+        value = metrics.get(self.metric, 0)
+
+        # 최소 힙: 값이 작을수록, 같으면 늦게 평가될수록 먼저 밀려남
+        entry = (value, -index, params, metrics)
+        if len(self._heap) < self.top_k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+        if self.spill_path is not None:
+            self._buffer.append({
+                'index': index,
+                'params': json.dumps(params, sort_keys=True, default=str),
+                **metrics
+            })
+            if len(self._buffer) >= self.buffer_size:
+                self._flush()
+
+    def add_many(self, parameter_sets: Iterable[dict], metric_rows: Iterable[Dict[str, Any]]):
+        for params, metrics in zip(parameter_sets, metric_rows):
+            self.add(params, metrics)
+
+    def top(self) -> List[Dict[str, Any]]:
+        """상위 결과 (순위 순서, 기존 all_results 항목 형식)"""
+
+        return [
+            {
+                'params': params,
+                'metrics': metrics,
+                'total_return': metrics.get('total_return', 0),
+            }
+            for _, _, params, metrics in sorted(self._heap, reverse=True)
+        ]
+
+    def best(self) -> tuple:
+        """(최고 파라미터, 최고 지표) (결과가 없으면 (None, None))"""
+
+        if not self._heap:
+            return None, None
+        _, _, params, metrics = max(self._heap)
+        return params, metrics
+
+    def _flush(self):
+        if not self._buffer:
+            return
+
+        table = pa.Table.from_pylist(self._buffer)
+        if self._schema is None:
+            self._schema = table.schema
+        else:
+            table = table.select(self._schema.names).cast(self._schema)
+
+        if self._writer is None:
+            os.makedirs(os.path.dirname(self.spill_path) or '.', exist_ok=True)
+            self._writer = pq.ParquetWriter(self.spill_path + '.tmp', self._schema)
+
+        self._writer.write_table(table)
+        self._buffer = []
+
+    def _seal(self):
+        """쓰던 파일을 조각으로 마감"""
+
+        self._flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            part = f'{self.spill_path}.part{len(self._parts)}'
+            os.replace(self.spill_path + '.tmp', part)
+            self._parts.append(part)
+
+    def checkpoint(self) -> Dict[str, Any]:
+        """지금까지의 상태 (restore 로 이어서 수집)"""
+
+        if self.spill_path is not None:
+            self._seal()
+        return {
+            'total': self.total,
+            'heap': list(self._heap),
+            'parts': list(self._parts),
+        }
+
+    def restore(self, state: Dict[str, Any]):
+        """checkpoint() 시점으로 되돌림 (이후에 쓴 결과는 버림)"""
+
+        self.total = state['total']
+        self._heap = list(state['heap'])
+        heapq.heapify(self._heap)
+        self._buffer = []
+        if self.spill_path is not None:
+            self._parts = [part for part in state['parts'] if os.path.exists(part)]
+            if self._parts:
+                self._schema = pq.read_schema(self._parts[0])
+
+    def close(self):
+        """남은 결과를 기록하고 파일 완성 (쓰는 중에는 .tmp / .partN 파일)"""
+
+        if self.spill_path is None:
+            return
+
+        self._seal()
+        if not self._parts:
+            return
+
+        if len(self._parts) == 1:
+            os.replace(self._parts[0], self.spill_path)
+        else:
+            # 행 그룹 단위로 이어 붙임 (메모리는 행 그룹 하나)
+            with pq.ParquetWriter(self.spill_path + '.tmp', self._schema) as writer:
+                for part in self._parts:
+                    parquet = pq.ParquetFile(part)
+                    for group in range(parquet.num_row_groups):
+                        writer.write_table(
+                            parquet.read_row_group(group).cast(self._schema)
+                        )
+            os.replace(self.spill_path + '.tmp', self.spill_path)
+            for part in self._parts:
+                os.remove(part)
+        self._parts = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def read_results(
+    path: str,
+    offset: int = 0,
+    limit: int = 100,
+    sort_by: Optional[str] = None,
+    descending: bool = True
+) -> Dict[str, Any]:
+    """
+    기록된 결과 한 페이지
+
+    정렬하지 않으면 필요한 행 그룹만 읽고, 정렬하면 정렬 열만 먼저 읽어
+    페이지에 해당하는 행을 고릅니다.
+
+    Raises:
+        FileNotFoundError: 결과 파일이 없을 때
+        KeyError: 정렬 열이 없을 때
+    """
+
+    parquet = pq.ParquetFile(path)
+    total = parquet.metadata.num_rows
+
+    if sort_by is None:
+        tables = []
+        position = 0
+        end = offset + limit
+        for group in range(parquet.num_row_groups):
+            rows = parquet.metadata.row_group(group).num_rows
+            if position + rows > offset and position < end:
+                table = parquet.read_row_group(group)
+                lo = max(offset - position, 0)
+                tables.append(table.slice(lo, end - position - lo))
+            position += rows
+            if position >= end:
+                break
+        page = (
+            pa.concat_tables(tables) if tables
+            else parquet.schema_arrow.empty_table()
+        )
+    else:
+        if sort_by not in parquet.schema_arrow.names:
+            raise KeyError(sort_by)
+        order = pq.read_table(path, columns=[sort_by]).column(0)
+        indices = pc.sort_indices(
+            pa.table({sort_by: order}),
+            sort_keys=[(sort_by, 'descending' if descending else 'ascending')]
+        )[offset:offset + limit]
+        page = pq.read_table(path).take(indices)
+
+    rows = page.to_pylist()
+    for row in rows:
+        row['params'] = json.loads(row['params'])
+
+    return {
+        'total': total,
+        'offset': offset,
+        'limit': limit,
+        'results': rows,
+    }
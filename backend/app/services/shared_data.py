@@ -0,0 +1,161 @@
+"""
+공유 메모리 시장 데이터
+
+최적화 워커 프로세스들이 시장 데이터를 복사 없이 함께 사용하도록
+multiprocessing.shared_memory 에 한 번만 게시합니다. 워커 수와 관계없이
+전략이 같은 데이터를 보도록 숫자 컬럼은 모두 원래 순서·dtype 으로
+게시합니다.
+"""
+
+import weakref
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class SharedMarketDataHandle:
+    """워커에 전달하는 공유 메모리 핸들 (이름과 형태 정보만 포함)"""
+    name: str
+    length: int
+    columns: Tuple[str, ...]
+    dtypes: Tuple[str, ...] = ()  # 컬럼별 원래 dtype (비면 모두 float64)
+    tz: Optional[str] = None
+    index_name: Optional[str] = None
+
+
+def _release(shm: shared_memory.SharedMemory):
+    """공유 메모리 해제 (게시한 프로세스에서 한 번만 호출)"""
+
+    try:
+        shm.close()
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class SharedMarketData:
+    """
+    시장 데이터를 공유 메모리 블록에 게시
+
+    블록은 [타임스탬프(int64 ns) | 컬럼1 | 컬럼2 ...] 순서의 8바이트 행들로
+    구성됩니다. 실수 컬럼은 float64, 정수·bool 컬럼은 int64 로 저장합니다.
+    close() 또는 with 블록 종료 시 해제되며, 예외나 가비지 컬렉션으로
+    객체가 사라질 때도 해제됩니다.
+
+    Raises:
+        ValueError: 숫자가 아닌 컬럼이 있을 때 (워커에서 빠지면 결과가
+            워커 수에 따라 달라지므로 조용히 버리지 않음)
+    """
+
+    def __init__(
+        self,
+        market_data: pd.DataFrame,
+        columns: Optional[List[str]] = None
+    ):
+        if columns is None:
+            columns = list(market_data.columns)
+
+        unsupported = [
+            column for column in columns
+            if not pd.api.types.is_numeric_dtype(market_data[column])
+            or pd.api.types.is_complex_dtype(market_data[column])
+        ]
+        if unsupported:
+            raise ValueError(
+                f"Cannot share non-numeric market data columns: {unsupported}"
+            )
+        dtypes = tuple(market_data[column].dtype.str for column in columns)
+
+        length = len(market_data)
+        index = pd.DatetimeIndex(market_data.index)
+
+        self._shm = shared_memory.SharedMemory(
+            create=True, size=max(1, (len(columns) + 1) * length * 8)
+        )
+        self._finalizer = weakref.finalize(self, _release, self._shm)
+
+        block = np.ndarray(
+            (len(columns) + 1, length), dtype=np.float64, buffer=self._shm.buf
+        )
+        block[0].view(np.int64)[:] = index.as_unit('ns').asi8
+        for row, column in enumerate(columns, start=1):
+            values = market_data[column].to_numpy()
+            if np.issubdtype(values.dtype, np.floating):
+                block[row] = values
+            else:
+                block[row].view(np.int64)[:] = values
+
+        self.handle = SharedMarketDataHandle(
+            name=self._shm.name,
+            length=length,
+            columns=tuple(columns),
+            dtypes=dtypes,
+            tz=str(index.tz) if index.tz is not None else None,
+            index_name=market_data.index.name,
+        )
+
+    def close(self):
+        """공유 메모리 해제"""
+
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def attach_market_data(
+    handle: SharedMarketDataHandle
+) -> Tuple[shared_memory.SharedMemory, pd.DataFrame]:
+    """
+    공유 메모리 블록에 연결하여 DataFrame 뷰 생성 (복사 없음)
+
+    반환된 SharedMemory 객체는 DataFrame 을 사용하는 동안 참조를
+    유지해야 합니다. 데이터는 읽기 전용입니다.
+    """
+
+    shm = shared_memory.SharedMemory(name=handle.name)
+    block = np.ndarray(
+        (len(handle.columns) + 1, handle.length),
+        dtype=np.float64,
+        buffer=shm.buf
+    )
+    block.flags.writeable = False
+
+    index = pd.DatetimeIndex(
+        block[0].view(np.int64).view('datetime64[ns]'), name=handle.index_name
+    )
+    if handle.tz is not None:
+        index = index.tz_localize('UTC').tz_convert(handle.tz)
+
+    dtypes = [np.dtype(dtype) for dtype in handle.dtypes] or [
+        np.dtype(np.float64)
+    ] * len(handle.columns)
+
+    if all(dtype == np.float64 for dtype in dtypes):
+        # (컬럼 × 봉) 블록의 전치 → pandas 내부 배치와 같아 복사하지 않음
+        market_data = pd.DataFrame(
+            block[1:].T, index=index, columns=list(handle.columns), copy=False
+        )
+    else:
+        # 컬럼별 뷰 (float64·int64 는 복사 없음, 그 밖의 dtype 만 변환)
+        market_data = pd.DataFrame({
+            column: _column_view(block[row], dtype)
+            for row, (column, dtype) in enumerate(
+                zip(handle.columns, dtypes), start=1
+            )
+        }, index=index, copy=False)
+    return shm, market_data
+
+
+def _column_view(row: np.ndarray, dtype: np.dtype) -> np.ndarray:
+    if np.issubdtype(dtype, np.floating):
+        return row if dtype == np.float64 else row.astype(dtype)
+    values = row.view(np.int64)
+    return values if dtype == np.int64 else values.astype(dtype)
@@ -0,0 +1,75 @@
+"""
+매매 신호 표현
+
+전략은 다음 형태 중 하나로 신호를 반환할 수 있습니다.
+    - NumPy 배열 / pandas Series: 1 = 매수, -1 = 매도, 0 = 관망
+    - 문자열 리스트 (기존 형식): 'buy' / 'sell' / 'hold'
+
+엔진 내부에서는 모두 int8 배열로 변환하여 사용합니다.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Sequence, Union
+
+
+BUY = 1
+SELL = -1
+HOLD = 0
+
+SignalLike = Union[np.ndarray, pd.Series, Sequence]
+
+
+def to_signal_array(signals: SignalLike, length: int) -> np.ndarray:
+    """
+    신호를 길이 length 의 int8 배열로 변환
+
+    Args:
+        signals: 전략이 반환한 신호
+        length: 시장 데이터 봉 수 (부족한 부분은 관망, 초과분은 무시)
+
+    Returns:
+        int8 신호 배열 (1 / -1 / 0)
+    """
+
+    if isinstance(signals, pd.Series):
+        signals = signals.to_numpy()
+
+    values = np.asarray(signals[:length])
+    codes = np.zeros(length, dtype=np.int8)
+    head = codes[:len(values)]
+
+    if values.dtype.kind in ('U', 'S', 'O'):
+        # 기존 문자열 신호: 한 번의 배열 비교로 변환
+        head[values == 'buy'] = BUY
+        head[values == 'sell'] = SELL
+    elif values.dtype.kind == 'b':
+        head[values] = BUY
+    else:
+        # 숫자 신호: 부호만 사용 (NaN = 관망)
+        head[:] = np.nan_to_num(np.sign(values.astype(np.float64)))
+
+    return codes
+
+
+def to_signal_matrix(signal_matrix: SignalLike, length: int) -> np.ndarray:
+    """
+    신호 행렬(봉 × 파라미터 세트)을 int8 행렬로 변환
+
+    DataFrame 이나 문자열 행렬도 열마다 to_signal_array 규칙으로 변환합니다.
+    """
+
+    if isinstance(signal_matrix, pd.DataFrame):
+        signal_matrix = signal_matrix.to_numpy()
+
+    values = np.asarray(signal_matrix)
+    if values.ndim == 1:
+        values = values[:, None]
+
+    if values.dtype == np.int8 and values.shape[0] == length:
+        return values
+
+    codes = np.zeros((length, values.shape[1]), dtype=np.int8)
+    for j in range(values.shape[1]):
+        codes[:, j] = to_signal_array(values[:, j], length)
+    return codes
@@ -0,0 +1,291 @@
+"""
+배열 기반 매매 시뮬레이션
+
+BacktestEngine._simulate_trading 과 동일한 전량 매수/전량 매도 규칙을
+NumPy 배열 연산으로 계산합니다.
+"""
+
+import numpy as np
+from dataclasses import dataclass
+
+from app.services import metrics
+
+
+# 매수 시 사용하는 현금 비율 (BacktestEngine 과 동일한 5% 안전 마진)
+BUY_CASH_RATIO = 0.95
+BUY_CASH_RATIO_REST = 1 - BUY_CASH_RATIO
+
+
+@dataclass
+class SimulationArrays:
+    """배열 시뮬레이션 결과"""
+    trade_index: np.ndarray  # 체결이 발생한 봉 위치 (int64)
+    action: np.ndarray  # 1 = 매수, -1 = 매도 (int8)
+    price: np.ndarray
+    quantity: np.ndarray
+    balance: np.ndarray
+    position: np.ndarray
+    equity: np.ndarray  # 봉별 포트폴리오 가치
+
+
+def simulate_signals(
+    close: np.ndarray,
+    signals: np.ndarray,
+    initial_capital: float,
+    commission: float,
+) -> SimulationArrays:
+    """
+    종가 배열과 신호 배열로 매매를 시뮬레이션
+
+    Args:
+        close: 종가 (float64, 연속 배열)
+        signals: 신호 (int8, 1 = 매수 / -1 = 매도 / 0 = 관망)
+        initial_capital: 초기 자본
+        commission: 수수료율
+
+    Returns:
+        체결 내역과 봉별 포트폴리오 가치
+
+    체결 위치와 잔고·보유 수량은 simulate_signal_matrix 와 같은 구간
+    누적곱 계산으로 한 번에 구하므로 봉 수에 비례하는 Python 반복이
+    없습니다. 결과는 기존 루프와 부동소수점 오차 범위에서 일치합니다.
+    """
+
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    states = _simulate_columns(
+        close, _fit_signals(signals, len(close)), initial_capital, commission
+    )
+
+    buys = states.buys[:, 0]
+    trade_index = np.flatnonzero(buys | states.sells[:, 0])
+    bought = buys[trade_index]
+
+    return SimulationArrays(
+        trade_index=trade_index.astype(np.int64),
+        action=np.where(bought, 1, -1).astype(np.int8),
+        price=close[trade_index],
+        quantity=np.where(
+            bought, states.bought[trade_index, 0], states.held[trade_index, 0]
+        ),
+        balance=states.balance[trade_index, 0],
+        position=states.position[trade_index, 0],
+        equity=states.balance[:, 0] + states.position[:, 0] * close,
+    )
+
+
+@dataclass
+class MatrixSimulation:
+    """신호 행렬 시뮬레이션 결과 (봉 × 파라미터 세트)"""
+    equity: np.ndarray  # 봉별 포트폴리오 가치 (float64)
+    buys: np.ndarray  # 매수 체결 여부 (bool)
+    sells: np.ndarray  # 매도 체결 여부 (bool)
+
+
+def _last_true_index(mask: np.ndarray, inclusive: bool = True) -> np.ndarray:
+    """열마다 각 봉 시점(또는 직전)까지 마지막으로 True 였던 봉 위치 (-1 = 없음)"""
+
+    rows = np.arange(mask.shape[0])[:, None]
+    index = np.where(mask, rows, -1)
+    np.maximum.accumulate(index, axis=0, out=index)
+
+    if inclusive:
+        return index
+
+    shifted = np.full_like(index, -1)
+    shifted[1:] = index[:-1]
+    return shifted
+
+
+def _value_at(values: np.ndarray, index: np.ndarray, default=0) -> np.ndarray:
+    """index 위치의 값을 열마다 조회 (index 가 -1 이면 default)"""
+
+    picked = np.take_along_axis(values, np.maximum(index, 0), axis=0)
+    return np.where(index >= 0, picked, default)
+
+
+def _buy_limit(start_balance: np.ndarray) -> np.ndarray:
+    """구간 시작 잔고에서 잔고가 0 이 될 때까지 체결되는 매수 수 (루프와 같은 연산)"""
+
+    balance = np.array(start_balance, dtype=np.float64)
+    count = np.zeros(balance.shape, dtype=np.int64)
+    active = balance > 0
+    while active.any():
+        balance[active] -= balance[active] * BUY_CASH_RATIO
+        count[active] += 1
+        active = balance > 0
+    return count
+
+
+def _fit_signals(signals: np.ndarray, n: int) -> np.ndarray:
+    """신호를 봉 × 열 int8 행렬로 맞춤 (부족한 부분은 관망)"""
+
+    signals = np.asarray(signals, dtype=np.int8)
+    if signals.ndim == 1:
+        signals = signals[:, None]
+
+    sig = np.zeros((n, signals.shape[1]), dtype=np.int8)
+    m = min(n, signals.shape[0])
+    sig[:m] = signals[:m]
+    return sig
+
+
+@dataclass
+class _ColumnStates:
+    """열별 봉 시점 상태 (봉 × 열)"""
+    buys: np.ndarray  # 매수 체결 여부
+    sells: np.ndarray  # 매도 체결 여부
+    balance: np.ndarray  # 봉 종료 시 현금
+    position: np.ndarray  # 봉 종료 시 보유 수량
+    bought: np.ndarray  # 매수 봉에서 산 수량
+    held: np.ndarray  # 매도 직전까지 보유한 수량
+
+
+def _simulate_columns(
+    close: np.ndarray,
+    sig: np.ndarray,
+    initial_capital: float,
+    commission: float,
+) -> _ColumnStates:
+    """
+    매도 체결로 구분되는 구간 안에서 잔고와 보유 수량은 구간 시작 잔고에
+    비례하므로, 구간별 배율을 누적곱으로 연결해 모든 열의 상태를 행렬
+    연산으로 계산
+    """
+
+    price = close[:, None]
+
+    if initial_capital <= 0:
+        # 현금이 없으면 어떤 체결도 일어나지 않음
+        empty = np.zeros(sig.shape, dtype=bool)
+        zeros = np.zeros(sig.shape)
+        return _ColumnStates(
+            buys=empty, sells=empty.copy(),
+            balance=np.full(sig.shape, float(initial_capital)),
+            position=zeros, bought=zeros, held=zeros,
+        )
+
+    # 매도는 직전 비관망 신호가 매수일 때만 체결됨
+    last_signal = _value_at(sig, _last_true_index(sig != 0, inclusive=False))
+    buys = sig == 1
+    sells = (sig == -1) & (last_signal == 1)
+
+    # 직전 매도 체결 이후 몇 번째 매수인지 (매도 봉은 닫는 구간에 속함)
+    prev_sell = _last_true_index(sells, inclusive=False)
+    buy_count = np.cumsum(buys, axis=0)
+    rank = buy_count - _value_at(buy_count, prev_sell)
+
+    # 구간 시작 잔고 1 당 현금 비율(cash)과 보유 수량(units)
+    cash = BUY_CASH_RATIO_REST ** rank
+    weight = np.where(
+        buys,
+        BUY_CASH_RATIO * BUY_CASH_RATIO_REST ** np.maximum(rank - 1, 0)
+        / (price * (1 + commission)),
+        0.0,
+    )
+    cum_weight = np.cumsum(weight, axis=0)
+    units = cum_weight - _value_at(cum_weight, prev_sell, 0.0)
+
+    # 매도 시 구간 잔고 배율 → 누적곱으로 다음 구간 시작 잔고 계산
+    growth = np.where(sells, cash + units * price * (1 - commission), 1.0)
+    base = np.ones_like(growth)
+    base[1:] = np.cumprod(growth, axis=0)[:-1]
+    base *= initial_capital
+
+    held = base * units
+    balance = np.where(sells, base * growth, base * cash)
+    position = np.where(sells, 0.0, held)
+
+    # 잔고가 0 으로 소진된 뒤의 매수는 체결되지 않음. 0.05 ** rank 는 루프의
+    # 잔고보다 먼저 언더플로하므로, 소진이 가까운 매수만 루프와 같은
+    # 연산으로 체결 가능 횟수를 구해 판단
+    exhausted = buys & ~(base * BUY_CASH_RATIO_REST ** np.maximum(rank - 1, 0) > 1e-200)
+    if exhausted.any():
+        buys[exhausted] = rank[exhausted] <= _buy_limit(base[exhausted])
+
+    return _ColumnStates(
+        buys=buys,
+        sells=sells,
+        balance=balance,
+        position=position,
+        bought=base * weight,
+        held=held,
+    )
+
+
+def simulate_signal_matrix(
+    close: np.ndarray,
+    signal_matrix: np.ndarray,
+    initial_capital: float,
+    commission: float,
+) -> MatrixSimulation:
+    """
+    여러 신호 열을 한 번에 시뮬레이션
+
+    Args:
+        close: 종가 (float64, 길이 T)
+        signal_matrix: 신호 행렬 (int8, T × N)
+        initial_capital: 초기 자본
+        commission: 수수료율
+
+    Returns:
+        열마다의 봉별 포트폴리오 가치와 매수/매도 체결 위치
+
+    결과는 simulate_signals 를 열마다 실행한 것과 같습니다.
+    """
+
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    states = _simulate_columns(
+        close, _fit_signals(signal_matrix, len(close)), initial_capital, commission
+    )
+
+    return MatrixSimulation(
+        equity=states.balance + states.position * close[:, None],
+        buys=states.buys,
+        sells=states.sells,
+    )
+
+
+def matrix_metrics(
+    close: np.ndarray, sim: MatrixSimulation, initial_capital: float
+) -> dict:
+    """신호 행렬 시뮬레이션 결과의 열별 성과 지표"""
+
+    equity = sim.equity
+
+    if equity.shape[0] == 0:
+        return {}
+
+    total_trades = sim.buys.sum(axis=0)
+    win_rate = metrics.paired_win_rate(
+        _ordered_prices(close, sim.buys),
+        _ordered_prices(close, sim.sells),
+        total_trades,
+    )
+
+    return {
+        'total_return': np.round(metrics.total_return(equity, initial_capital), 2),
+        'max_drawdown': np.round(metrics.max_drawdown(equity), 2),
+        'total_trades': total_trades,
+        'win_rate': np.round(win_rate, 2),
+        'sharpe_ratio': np.round(metrics.sharpe_ratio(equity), 2),
+        'final_value': np.round(equity[-1], 2),
+        'sortino_ratio': np.round(metrics.sortino_ratio(equity), 2),
+        'cagr': np.round(metrics.cagr(equity, initial_capital), 2),
+        'calmar_ratio': np.round(metrics.calmar_ratio(equity, initial_capital), 2),
+        'max_drawdown_duration': metrics.max_drawdown_duration(equity),
+    }
+
+
+def _ordered_prices(close: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """열마다 체결 가격을 시간순으로 왼쪽 정렬한 행렬 (빈 칸은 NaN)"""
+
+    cols, rows = np.nonzero(mask.T)
+    counts = np.bincount(cols, minlength=mask.shape[1])
+    width = int(counts.max()) if len(counts) else 0
+
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    order = np.arange(len(cols)) - starts[cols]
+
+    prices = np.full((mask.shape[1], width), np.nan)
+    prices[cols, order] = close[rows]
+    return prices
@@ -0,0 +1,101 @@
+"""
+컴파일된 전략 캐시
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from app.config import settings
+
+
+class StrategyCache:
+    """
+    전략 코드 → 컴파일된 코드 객체 LRU 캐시
+
+    키는 전략 소스와 샌드박스 전역 이름(내장 함수 목록 포함)의 해시입니다.
+    컴파일만 캐시하고 실행은 호출마다 새 샌드박스에서 하므로, 전략 코드가
+    모듈 수준 상태를 바꿔도 다음 실행에 남지 않습니다.
+    """
+
+    def __init__(self, maxsize: Optional[int] = None):
+        self.maxsize = maxsize if maxsize is not None else settings.STRATEGY_CACHE_SIZE
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(strategy_code: str, sandbox: Dict[str, Any]) -> str:
+        """전략 소스 + 샌드박스 이름 집합의 해시"""
+
+        builtins = sorted(sandbox.get('__builtins__', {}))
+        names = sorted(name for name in sandbox if name != '__builtins__')
+
+        digest = hashlib.sha256()
+        digest.update(strategy_code.encode('utf-8'))
+        digest.update(b'\0' + ','.join(builtins).encode('utf-8'))
+        digest.update(b'\0' + ','.join(names).encode('utf-8'))
+        return digest.hexdigest()
+
+    def namespace(self, strategy_code: str, sandbox: Dict[str, Any]) -> Dict[str, Any]:
+        """전략 코드를 sandbox 에서 실행한 전역 네임스페이스 (컴파일 결과는 재사용)"""
+
+        key = self.make_key(strategy_code, sandbox)
+
+        with self._lock:
+            code = self._entries.get(key)
+            if code is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if code is None:
+            code = compile(strategy_code, '<strategy>', 'exec')
+            with self._lock:
+                self._entries[key] = code
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+
+        exec(code, sandbox)
+        return sandbox
+
+    def resolve(self, strategy_code: str, sandbox: Dict[str, Any]) -> Callable:
+        """
+        strategy 함수 조회
+
+        Raises:
+            ValueError: 코드에 strategy 함수가 없을 때
+        """
+
+        strategy_func = self.namespace(strategy_code, sandbox).get('strategy')
+
+        if not strategy_func:
+            raise ValueError("Strategy function not found")
+
+        return strategy_func
+
+    def stats(self) -> Dict[str, int]:
+        """캐시 통계"""
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+        }
+
+    def clear(self):
+        """캐시 비우기 (통계 포함)"""
+
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# 프로세스 전역 캐시
+strategy_cache = StrategyCache()
@@ -0,0 +1,290 @@
+"""
+봉 단위 스트리밍 백테스트 엔진
+
+전체 기간을 DataFrame 으로 만들지 않고 봉 이터레이터(또는 비동기
+제너레이터)를 하나씩 소비합니다. 전략이 선언한 lookback 만큼의 최근 봉만
+링 버퍼에 유지하고, 포트폴리오 가치와 지표는 봉마다 누적 갱신하므로
+메모리 사용량이 기간 길이와 무관합니다.
+
+전략 코드 형식:
+
+    lookback = 50  # 필요한 최근 봉 수
+
+    def on_bar(window, params):  # params 는 생략 가능
+        close = window['close']  # 최근 lookback 개 봉의 NumPy 뷰
+        return BUY if close[-1] > close.mean() else SELL
+
+on_bar 가 없으면 기존 strategy(data) 를 최근 lookback 개 봉의 DataFrame 에
+대해 호출하고 마지막 신호를 사용합니다 (느린 경로).
+
+API 는 POST /backtests/streaming 이며, 로컬 캐시의 봉을 재생합니다
+(backtest_runner.run_streaming_backtest).
+"""
+
+from dataclasses import dataclass
+from typing import Any, AsyncIterable, Callable, Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.services.backtest_engine import PROGRESS_EVERY, BacktestEngine
+from app.services.indicators import uncached
+from app.services.metrics import trade_metrics
+from app.services.mmap_store import OHLCV_COLUMNS
+from app.services.online_metrics import OnlineMetrics
+from app.services.progress import ProgressReporter
+from app.services.signals import BUY, SELL, to_signal_array
+from app.services.simulation import BUY_CASH_RATIO
+from app.services.strategy_cache import strategy_cache
+from app.services.trade_log import TradeLog
+
+
+class RingBuffer:
+    """
+    최근 capacity 개 봉의 링 버퍼
+
+    값을 두 번(위치 i 와 i + capacity) 기록하므로 창(window)은 항상
+    연속된 배열 뷰이며, 추가와 조회 모두 O(1) 입니다.
+    """
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("lookback must be at least 1")
+
+        self.capacity = capacity
+        self.count = 0
+        self._pos = 0
+        self._timestamp = np.zeros(2 * capacity, dtype=np.int64)
+        self._values = np.zeros((len(OHLCV_COLUMNS), 2 * capacity), dtype=np.float64)
+
+    def append(self, timestamp: int, values):
+        pos = self._pos
+        for i in (pos, pos + self.capacity):
+            self._timestamp[i] = timestamp
+            self._values[:, i] = values
+        self._pos = (pos + 1) % self.capacity
+        self.count += 1
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    def _slice(self) -> slice:
+        n = len(self)
+        end = self._pos + self.capacity
+        return slice(end - n, end)
+
+    def window(self) -> "BarWindow":
+        rows = self._slice()
+        return BarWindow(self._timestamp[rows], self._values[:, rows])
+
+
+class BarWindow:
+    """최근 봉 창 (열 이름으로 NumPy 뷰 조회)"""
+
+    __slots__ = ('timestamp', '_values')
+
+    def __init__(self, timestamp: np.ndarray, values: np.ndarray):
+        self.timestamp = timestamp
+        self._values = values
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self._values[OHLCV_COLUMNS.index(column)]
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame 으로 변환 (UTC 인덱스)"""
+
+        index = pd.DatetimeIndex(
+            self.timestamp.view('datetime64[ns]'), name='timestamp'
+        ).tz_localize('UTC')
+        return pd.DataFrame(
+            {column: self[column] for column in OHLCV_COLUMNS}, index=index
+        )
+
+
+@dataclass
+class StreamingResult:
+    """스트리밍 백테스트 결과 (수익 곡선은 저장하지 않음)"""
+    trades: TradeLog
+    metrics: Dict[str, Any]
+    initial_capital: float
+    final_capital: float
+    bars: int
+
+
+def _to_ns(timestamp) -> int:
+    if isinstance(timestamp, (int, np.integer)):
+        return int(timestamp)
+    timestamp = pd.Timestamp(timestamp)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.tz_localize('UTC')
+    return timestamp.as_unit('ns').value
+
+
+def _split_bar(bar):
+    """봉을 (UTC ns 타임스탬프, OHLCV 튜플) 로 변환
+
+    dict / Series (timestamp 키와 OHLCV 키) 또는
+    (timestamp, open, high, low, close, volume) 튜플을 받습니다.
+    """
+
+    if isinstance(bar, (tuple, list)):
+        return _to_ns(bar[0]), tuple(bar[1:6])
+    return _to_ns(bar['timestamp']), tuple(bar[column] for column in OHLCV_COLUMNS)
+
+
+class StreamingBacktestEngine:
+    """봉 단위 스트리밍 백테스트 엔진 (BacktestEngine 의 loop 모드와 같은 체결 규칙)"""
+
+    def __init__(
+        self,
+        strategy_code: str,
+        parameters: dict,
+        initial_capital: float = 10000.0,
+        commission: float = 0.001,
+        lookback: Optional[int] = None,  # None = 전략 코드의 lookback
+        progress: Optional[ProgressReporter] = None,
+    ):
+        self.strategy_code = strategy_code
+        self.parameters = parameters
+        self.initial_capital = initial_capital
+        self.commission = commission
+        self.progress = progress
+
+        namespace = strategy_cache.namespace(
+            strategy_code, BacktestEngine._sandbox_globals()
+        )
+        self.lookback = lookback or namespace.get('lookback')
+        if not self.lookback:
+            raise ValueError("Streaming strategies must declare lookback")
+
+        self._signal_func = self._make_signal_func(namespace)
+
+    def _make_signal_func(self, namespace: Dict[str, Any]) -> Callable:
+        """창 → 신호 함수"""
+
+        on_bar = namespace.get('on_bar')
+        if on_bar is not None:
+            if on_bar.__code__.co_argcount >= 2:
+                return lambda window: on_bar(window, self.parameters)
+            return on_bar
+
+        strategy_func = namespace.get('strategy')
+        if strategy_func is None:
+            raise ValueError("Strategy function not found")
+
+        def last_signal(window: BarWindow):
+            data = window.to_frame()
+            if strategy_func.__code__.co_argcount >= 2:
+                signals = strategy_func(data, self.parameters)
+            else:
+                signals = strategy_func(data)
+            return to_signal_array(signals, len(data))[-1]
+
+        return last_signal
+
+    def _reset(self):
+        self._buffer = RingBuffer(self.lookback)
+        self._trades = TradeLog(tz='UTC')
+        self._metrics = OnlineMetrics(self.initial_capital)
+        self._balance = self.initial_capital
+        self._position = 0.0
+
+    def _step(self, bar):
+        """봉 하나 처리"""
+
+        timestamp, values = _split_bar(bar)
+        self._buffer.append(timestamp, values)
+        i = self._buffer.count - 1
+        price = float(values[3])
+
+        try:
+            # 창은 봉마다 내용이 바뀌는 버퍼이므로 지표 캐시를 거치지 않음
+            with uncached():
+                signal = self._signal_func(self._buffer.window())
+            signal = int(to_signal_array([signal], 1)[0])
+        except Exception as e:
+            raise ValueError(f"Strategy execution error: {e}") from e
+
+        # 매수 신호: 현금의 95% 로 매수
+        if signal == BUY and self._balance > 0:
+            cost = self._balance * BUY_CASH_RATIO
+            quantity = cost / (price * (1 + self.commission))
+            self._position += quantity
+            self._balance -= cost
+            self._trades.append(
+                timestamp=pd.Timestamp(timestamp, tz='UTC'),
+                bar_index=i,
+                action=BUY,
+                price=price,
+                quantity=quantity,
+                commission=quantity * price * self.commission,
+                balance=self._balance,
+                position=self._position,
+            )
+
+        # 매도 신호: 보유 주식 전량 매도
+        elif signal == SELL and self._position > 0:
+            self._balance += self._position * price * (1 - self.commission)
+            self._trades.append(
+                timestamp=pd.Timestamp(timestamp, tz='UTC'),
+                bar_index=i,
+                action=SELL,
+                price=price,
+                quantity=self._position,
+                commission=self._position * price * self.commission,
+                balance=self._balance,
+                position=0,
+            )
+            self._position = 0.0
+
+        self._metrics.update(self._balance + self._position * price)
+
+        if self.progress is not None and self._buffer.count % PROGRESS_EVERY == 0:
+            self.progress.update(
+                done=self._buffer.count, metrics=self._metrics.snapshot()
+            )
+
+    def _result(self) -> StreamingResult:
+        trades = self._trades
+        metrics = {}
+        if self._metrics.bars:
+            metrics = self._metrics.snapshot(trade_metrics(
+                action=trades.action,
+                price=trades.price,
+                quantity=trades.quantity,
+                trade_index=trades.bar_index,
+                position=trades.position,
+                n_bars=self._metrics.bars,
+                commission=self.commission,
+            ))
+
+        final_capital = (
+            self._metrics.last_equity if self._metrics.bars else self.initial_capital
+        )
+
+        return StreamingResult(
+            trades=trades,
+            metrics=metrics,
+            initial_capital=self.initial_capital,
+            final_capital=final_capital,
+            bars=self._metrics.bars,
+        )
+
+    def run(self, bars: Iterable) -> StreamingResult:
+        """봉 이터레이터로 백테스트 실행"""
+
+        self._reset()
+        for bar in bars:
+            self._step(bar)
+        return self._result()
+
+    async def arun(self, bars: AsyncIterable) -> StreamingResult:
+        """비동기 봉 제너레이터로 백테스트 실행"""
+
+        self._reset()
+        async for bar in bars:
+            self._step(bar)
+        return self._result()
@@ -0,0 +1,277 @@
+"""
+열 기반 거래 기록
+
+체결마다 객체를 만드는 대신 열별 NumPy 배열에 기록합니다.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.services.signals import BUY
+
+
+# 실수형 열 (하나의 2차원 블록에 함께 저장)
+VALUE_COLUMNS = ('price', 'quantity', 'commission', 'balance', 'position')
+
+
+class TradeLog:
+    """
+    열 기반 거래 기록 (struct-of-arrays)
+
+    타임스탬프(datetime64[ns]), 봉 위치(int64), 방향(int8, 1 = 매수 /
+    -1 = 매도)과 실수형 열 블록을 미리 할당하고, 가득 차면 두 배로
+    늘립니다. 내보내기는 채워진 구간의 뷰를 사용하므로 복사하지 않습니다.
+    """
+
+    __slots__ = ('_timestamp', '_bar_index', '_action', '_values', '_size', 'tz')
+
+    def __init__(self, capacity: int = 64, tz: Optional[str] = None):
+        capacity = max(1, capacity)
+        self._timestamp = np.empty(capacity, dtype='datetime64[ns]')
+        self._bar_index = np.empty(capacity, dtype=np.int64)
+        self._action = np.empty(capacity, dtype=np.int8)
+        self._values = np.empty((len(VALUE_COLUMNS), capacity), dtype=np.float64)
+        self._size = 0
+        self.tz = tz
+
+    @classmethod
+    def from_arrays(
+        cls,
+        timestamp: np.ndarray,
+        bar_index: np.ndarray,
+        action: np.ndarray,
+        price: np.ndarray,
+        quantity: np.ndarray,
+        commission: np.ndarray,
+        balance: np.ndarray,
+        position: np.ndarray,
+        tz: Optional[str] = None
+    ) -> "TradeLog":
+        """열 배열로 한 번에 생성"""
+
+        log = cls(capacity=len(action), tz=tz)
+        log.extend(
+            timestamp, bar_index, action,
+            price, quantity, commission, balance, position
+        )
+        return log
+
+    def _reserve(self, extra: int):
+        """extra 건을 더 기록할 수 있도록 용량 확보"""
+
+        needed = self._size + extra
+        capacity = len(self._action)
+        if needed <= capacity:
+            return
+
+        while capacity < needed:
+            capacity *= 2
+
+        n = self._size
+        timestamp = np.empty(capacity, dtype='datetime64[ns]')
+        bar_index = np.empty(capacity, dtype=np.int64)
+        action = np.empty(capacity, dtype=np.int8)
+        values = np.empty((len(VALUE_COLUMNS), capacity), dtype=np.float64)
+
+        timestamp[:n] = self._timestamp[:n]
+        bar_index[:n] = self._bar_index[:n]
+        action[:n] = self._action[:n]
+        values[:, :n] = self._values[:, :n]
+
+        self._timestamp = timestamp
+        self._bar_index = bar_index
+        self._action = action
+        self._values = values
+
+    def append(
+        self,
+        timestamp,
+        bar_index: int,
+        action: int,
+        price: float,
+        quantity: float,
+        commission: float,
+        balance: float,
+        position: float
+    ):
+        """체결 한 건 기록"""
+
+        self._reserve(1)
+        i = self._size
+        self._timestamp[i] = _to_datetime64(timestamp)
+        self._bar_index[i] = bar_index
+        self._action[i] = action
+        self._values[:, i] = (price, quantity, commission, balance, position)
+        self._size += 1
+
+    def extend(
+        self,
+        timestamp: np.ndarray,
+        bar_index: np.ndarray,
+        action: np.ndarray,
+        price: np.ndarray,
+        quantity: np.ndarray,
+        commission: np.ndarray,
+        balance: np.ndarray,
+        position: np.ndarray
+    ):
+        """여러 체결을 열 단위로 기록"""
+
+        count = len(action)
+        self._reserve(count)
+        start, end = self._size, self._size + count
+
+        self._timestamp[start:end] = _to_datetime64(timestamp)
+        self._bar_index[start:end] = bar_index
+        self._action[start:end] = action
+        for row, column in enumerate(
+            (price, quantity, commission, balance, position)
+        ):
+            self._values[row, start:end] = column
+        self._size = end
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    # 열 뷰 (채워진 구간만)
+    @property
+    def timestamp(self) -> np.ndarray:
+        return self._timestamp[:self._size]
+
+    @property
+    def bar_index(self) -> np.ndarray:
+        return self._bar_index[:self._size]
+
+    @property
+    def action(self) -> np.ndarray:
+        return self._action[:self._size]
+
+    @property
+    def price(self) -> np.ndarray:
+        return self._values[0, :self._size]
+
+    @property
+    def quantity(self) -> np.ndarray:
+        return self._values[1, :self._size]
+
+    @property
+    def commission(self) -> np.ndarray:
+        return self._values[2, :self._size]
+
+    @property
+    def balance(self) -> np.ndarray:
+        return self._values[3, :self._size]
+
+    @property
+    def position(self) -> np.ndarray:
+        return self._values[4, :self._size]
+
+    def timestamps(self) -> pd.DatetimeIndex:
+        """타임스탬프 (시간대 반영)"""
+
+        index = pd.DatetimeIndex(self.timestamp)
+        if self.tz is not None:
+            index = index.tz_localize('UTC').tz_convert(self.tz)
+        return index
+
+    def __getitem__(self, i: int):
+        """체결 한 건을 Trade 객체로 조회 (기존 코드 호환용)"""
+
+        from app.services.backtest_engine import Trade
+
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError("trade index out of range")
+
+        timestamp = pd.Timestamp(self._timestamp[i])
+        if self.tz is not None:
+            timestamp = timestamp.tz_localize('UTC').tz_convert(self.tz)
+
+        return Trade(
+            timestamp=timestamp,
+            action='buy' if self._action[i] == BUY else 'sell',
+            price=float(self._values[0, i]),
+            quantity=float(self._values[1, i]),
+            balance=float(self._values[3, i]),
+            position=float(self._values[4, i]),
+            commission=float(self._values[2, i]),
+        )
+
+    def __iter__(self) -> Iterator:
+        for i in range(self._size):
+            yield self[i]
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame 으로 내보내기 (실수형 열은 복사 없이 뷰로 연결)"""
+
+        frame = pd.DataFrame(
+            self._values[:, :self._size].T,
+            columns=list(VALUE_COLUMNS),
+            copy=False
+        )
+        frame.insert(0, 'timestamp', self.timestamps())
+        frame.insert(1, 'bar_index', self.bar_index)
+        frame.insert(2, 'action', self.action)
+        return frame
+
+    def to_arrow(self):
+        """pyarrow Table 로 내보내기 (숫자 열은 버퍼를 공유)"""
+
+        import pyarrow as pa
+
+        n = self._size
+        arrays = [
+            pa.array(self._timestamp[:n], type=pa.timestamp('ns', tz=self.tz)),
+            pa.array(self._bar_index[:n]),
+            pa.array(self._action[:n]),
+        ] + [pa.array(self._values[row, :n]) for row in range(len(VALUE_COLUMNS))]
+
+        names = ['timestamp', 'bar_index', 'action'] + list(VALUE_COLUMNS)
+        return pa.Table.from_arrays(arrays, names=names)
+
+    def to_record_batches(self, max_chunksize: Optional[int] = None) -> List:
+        """pyarrow RecordBatch 목록으로 내보내기"""
+
+        return self.to_arrow().to_batches(max_chunksize=max_chunksize)
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """JSON 직렬화용 레코드 목록 (열 단위로 한 번에 변환)"""
+
+        timestamps = self.timestamps()
+        actions = np.where(self.action == BUY, 'buy', 'sell').tolist()
+        columns = [self._values[row, :self._size].tolist()
+                   for row in range(len(VALUE_COLUMNS))]
+
+        return [
+            {
+                'timestamp': timestamp.isoformat(),
+                'action': action,
+                'price': price,
+                'quantity': quantity,
+                'commission': commission,
+                'balance': balance,
+                'position': position,
+            }
+            for timestamp, action, price, quantity, commission, balance, position
+            in zip(timestamps, actions, *columns)
+        ]
+
+
+def _to_datetime64(timestamp):
+    """타임스탬프(들)를 UTC 기준 datetime64[ns] 로 변환"""
+
+    if isinstance(timestamp, (pd.DatetimeIndex, pd.Series, np.ndarray, list)):
+        index = pd.DatetimeIndex(timestamp)
+        if index.tz is not None:
+            index = index.tz_convert('UTC').tz_localize(None)
+        return index.as_unit('ns').to_numpy()
+
+    timestamp = pd.Timestamp(timestamp)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert('UTC').tz_localize(None)
+    return timestamp.as_unit('ns').to_datetime64()
@@ -0,0 +1,36 @@
+"""
+Backtest Celery Tasks
+"""
+
+import asyncio
+from typing import Any, Dict
+
+from app.tasks.celery_app import celery_app
+
+# 워커 프로세스마다 한 번만 생성
+_data_collector = None
+
+
+def _get_data_collector():
+    global _data_collector
+    if _data_collector is None:
+        from app.services.data_collector import DataCollector
+        _data_collector = DataCollector()
+    return _data_collector
+
+
+@celery_app.task(name="backtests.run")
+def run_backtest_task(backtest_id: str, request: Dict[str, Any]) -> Dict[str, Any]:
+    """대기 중인 백테스트 실행 후 결과 저장"""
+
+    from app.services.backtest_runner import run_pending_backtest
+    from app.supabase_client import get_supabase
+
+    status = asyncio.run(run_pending_backtest(
+        get_supabase(),
+        _get_data_collector(),
+        backtest_id,
+        request
+    ))
+
+    return {"backtest_id": backtest_id, "status": status}
@@ -0,0 +1,29 @@
+"""
+Celery Application
+
+워커 실행: celery -A app.tasks.celery_app worker --loglevel=info
+"""
+
+from celery import Celery
+from app.config import settings
+
+celery_app = Celery(
+    "trading_backtest",
+    broker=settings.CELERY_BROKER_URL,
+    backend=settings.CELERY_RESULT_BACKEND,
+    include=["app.tasks.backtest_tasks"],
+)
+
+celery_app.conf.update(
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+    timezone="UTC",
+    enable_utc=True,
+    # 긴 백테스트가 한 워커에 몰리지 않도록 하나씩 가져옴
+    worker_prefetch_multiplier=1,
+    task_acks_late=True,
+    # 테스트용: 브로커 없이 호출 즉시 실행
+    task_always_eager=settings.CELERY_TASK_ALWAYS_EAGER,
+    task_eager_propagates=True,
+)
@@ -0,0 +1,51 @@
+"""
+데이터·설정 지문 (캐시 키용 해시)
+"""
+
+import hashlib
+import json
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+
+OHLCV_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+def dataset_fingerprint(market_data) -> str:
+    """
+    시장 데이터 내용의 해시
+
+    타임스탬프(UTC ns)와 OHLCV 열의 원시 바이트를 해시하므로 같은 봉이면
+    DataFrame 이든 OHLCVArrays 뷰든 같은 값이 나옵니다.
+    """
+
+    if isinstance(market_data, pd.DataFrame):
+        index = pd.DatetimeIndex(market_data.index)
+        if index.tz is not None:
+            index = index.tz_convert('UTC').tz_localize(None)
+        timestamps = index.as_unit('ns').asi8
+        columns = [
+            market_data[column].to_numpy(dtype=np.float64)
+            for column in OHLCV_COLUMNS if column in market_data.columns
+        ]
+    else:
+        timestamps = np.asarray(market_data.timestamp, dtype=np.int64)
+        columns = [
+            np.asarray(getattr(market_data, column), dtype=np.float64)
+            for column in OHLCV_COLUMNS
+        ]
+
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(timestamps).tobytes())
+    for column in columns:
+        digest.update(np.ascontiguousarray(column).tobytes())
+    return digest.hexdigest()
+
+
+def stable_hash(value: Any) -> str:
+    """JSON 직렬화 가능한 값의 해시 (딕셔너리 키 순서와 무관)"""
+
+    payload = json.dumps(value, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
@@ -0,0 +1,56 @@
+"""
+전략 실행 (컴파일 캐시, 오류 처리)
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.backtest_engine import BacktestEngine
+from app.services.strategy_cache import strategy_cache
+
+
+def _market_data(n: int = 50) -> pd.DataFrame:
+    close = np.linspace(100, 150, n)
+    index = pd.date_range('2020-01-01', periods=n, freq='D', tz='UTC')
+    return pd.DataFrame({
+        'open': close, 'high': close, 'low': close, 'close': close, 'volume': 1.0
+    }, index=index)
+
+
+def test_strategy_error_raises_value_error():
+    """전략 실행 오류는 거래 없는 결과가 아니라 ValueError"""
+
+    code = '''
+def strategy(data):
+    return data['missing_column']
+'''
+    with pytest.raises(ValueError, match="Strategy execution error"):
+        BacktestEngine(code, {}).execute(_market_data())
+
+
+def test_missing_strategy_function_raises_value_error():
+    with pytest.raises(ValueError, match="Strategy function not found"):
+        BacktestEngine("x = 1", {}).execute(_market_data())
+
+
+def test_module_state_does_not_leak_between_runs():
+    """컴파일 결과는 재사용해도 모듈 수준 상태는 실행마다 새로 시작"""
+
+    code = '''
+calls = []
+
+def strategy(data):
+    calls.append(1)
+    signals = np.zeros(len(data))
+    if len(calls) == 1:
+        signals[0] = BUY
+    return signals
+'''
+    data = _market_data()
+    hits = strategy_cache.hits
+    first = BacktestEngine(code, {}).execute(data)
+    second = BacktestEngine(code, {}).execute(data)
+
+    assert len(first.trades) == len(second.trades) == 1
+    assert strategy_cache.hits > hits
@@ -0,0 +1,132 @@
+"""
+최적화 체크포인트 재개
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from app.config import settings
+from app.services.checkpoint import OptimizationCheckpoint
+from app.services.optimizer import StrategyOptimizer
+from app.services.result_sink import results_path
+
+
+STRATEGY = '''
+def strategy(data, params):
+    short = ta.sma(data['close'], params['short'])
+    long = ta.sma(data['close'], params['long'])
+    return np.where(short > long, BUY, SELL)
+'''
+
+GRID = {'short': list(range(2, 10)), 'long': list(range(20, 26))}
+SPACE = {'short': (2, 12), 'long': (20, 30)}
+
+
+class Crash(Exception):
+    """워커 중단 흉내"""
+
+
+@pytest.fixture
+def optimizer_dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, 'OPTIMIZER_RESULTS_DIR', str(tmp_path / 'results'))
+    monkeypatch.setattr(settings, 'OPTIMIZER_CHECKPOINT_DIR', str(tmp_path / 'checkpoints'))
+    monkeypatch.setattr(settings, 'OPTIMIZER_BLOCK_SIZE', 7)
+
+
+def _market_data(n: int = 800) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0002, 0.01, n)))
+    index = pd.date_range('2010-01-01', periods=n, freq='B', tz='UTC')
+    return pd.DataFrame({
+        'open': close, 'high': close, 'low': close, 'close': close, 'volume': 1.0
+    }, index=index)
+
+
+def _optimizer(data, results_id, checkpoint=None) -> StrategyOptimizer:
+    return StrategyOptimizer(
+        STRATEGY, data, n_jobs=1, use_cache=False, random_state=5,
+        results_id=results_id, checkpoint=checkpoint, top_k=5
+    )
+
+
+@pytest.mark.parametrize('method, args, kwargs', [
+    ('grid_search', (GRID,), {}),
+    ('random_search', (SPACE,), {'n_iter': 40}),
+    ('bayesian_optimization', (SPACE,), {'n_calls': 20, 'n_points': 4}),
+], ids=['grid', 'random', 'bayesian'])
+def test_resume_matches_uninterrupted_run(optimizer_dirs, monkeypatch, method, args, kwargs):
+    """중간에 죽은 뒤 이어서 실행한 결과가 한 번에 끝까지 실행한 결과와 같아야 함"""
+
+    if method == 'bayesian_optimization':
+        pytest.importorskip('skopt')
+
+    data = _market_data()
+    reference = getattr(_optimizer(data, 'reference'), method)(*args, **kwargs)
+
+    evaluate = StrategyOptimizer._evaluate
+    calls = {'count': 0}
+
+    def crashing(self, *a, **k):
+        calls['count'] += 1
+        if calls['count'] > 3:
+            raise Crash()
+        return evaluate(self, *a, **k)
+
+    monkeypatch.setattr(StrategyOptimizer, '_evaluate', crashing)
+    checkpoint = OptimizationCheckpoint('job', meta={'method': method}, interval=0)
+    with pytest.raises(Crash):
+        getattr(_optimizer(data, 'job', checkpoint), method)(*args, **kwargs)
+    assert OptimizationCheckpoint.read_meta('job') == {'method': method}
+
+    # 재개 시 이미 평가한 파라미터 세트는 다시 평가하지 않음
+    evaluated = {'count': 0}
+
+    def counting(self, evaluator, parameter_sets, *a, **k):
+        evaluated['count'] += len(parameter_sets)
+        return evaluate(self, evaluator, parameter_sets, *a, **k)
+
+    monkeypatch.setattr(StrategyOptimizer, '_evaluate', counting)
+    resumed = getattr(
+        _optimizer(data, 'job', OptimizationCheckpoint('job', interval=0)), method
+    )(*args, **kwargs)
+
+    assert evaluated['count'] < resumed['results_total']
+    assert resumed['best_params'] == reference['best_params']
+    assert resumed['top_results'] == reference['top_results']
+    assert resumed['evaluation_stats'] == reference['evaluation_stats']
+    assert pq.read_table(results_path('job')).equals(
+        pq.read_table(results_path('reference'))
+    )
+    assert OptimizationCheckpoint.read_meta('job') is None
+    assert not [
+        name for name in os.listdir(settings.OPTIMIZER_RESULTS_DIR)
+        if '.part' in name or name.endswith('.tmp')
+    ]
+
+
+def test_resume_rejects_different_data(optimizer_dirs, monkeypatch):
+    """체크포인트와 다른 데이터로 재개하면 ValueError"""
+
+    data = _market_data()
+    evaluate = StrategyOptimizer._evaluate
+    calls = {'count': 0}
+
+    def crashing(self, *a, **k):
+        calls['count'] += 1
+        if calls['count'] > 1:
+            raise Crash()
+        return evaluate(self, *a, **k)
+
+    monkeypatch.setattr(StrategyOptimizer, '_evaluate', crashing)
+    with pytest.raises(Crash):
+        _optimizer(data, 'job', OptimizationCheckpoint('job', interval=0)).grid_search(GRID)
+
+    monkeypatch.setattr(StrategyOptimizer, '_evaluate', evaluate)
+    with pytest.raises(ValueError):
+        _optimizer(
+            data.iloc[:-1], 'job', OptimizationCheckpoint('job', interval=0)
+        ).grid_search(GRID)
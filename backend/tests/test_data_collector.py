@@ -0,0 +1,127 @@
+"""
+여러 심볼 일괄 가져오기
+"""
+
+import asyncio
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.config import settings
+from app.services.data_collector import DataCollector
+from app.services.data_source import FrameDataSource
+from app.services.market_store import ParquetMarketStore
+
+
+class FakeTable:
+    def __init__(self, client):
+        self.client = client
+        self.records = None
+
+    def upsert(self, records):
+        self.records = records
+        return self
+
+    def execute(self):
+        self.client.upserts.append(self.records)
+
+
+class FakeSupabase:
+    """bt_market_data upsert 만 기록하는 가짜 클라이언트"""
+
+    def __init__(self):
+        self.upserts = []
+
+    def table(self, name):
+        assert name == "bt_market_data"
+        return FakeTable(self)
+
+    def saved(self, symbol):
+        return [
+            record for records in self.upserts for record in records
+            if record['symbol'] == symbol
+        ]
+
+
+class SlowSource(FrameDataSource):
+    """심볼마다 다른 시간 뒤에 응답하는 메모리 소스"""
+
+    def __init__(self, frames, delays):
+        super().__init__(frames)
+        self.delays = delays
+        self.requests = []
+
+    def download(self, symbol, start_date, end_date, interval="1d"):
+        self.requests.append(symbol)
+        time.sleep(self.delays.get(symbol, 0))
+        return super().download(symbol, start_date, end_date, interval)
+
+
+def _daily_bars(start: str = '2020-01-01', end: str = '2020-12-31') -> pd.DataFrame:
+    index = pd.date_range(start, end, freq='D', tz='UTC')
+    close = np.arange(len(index), dtype=np.float64) + 100
+    return pd.DataFrame({
+        'open': close, 'high': close + 1, 'low': close - 1, 'close': close,
+        'volume': 1000.0,
+    }, index=index)
+
+
+@pytest.fixture(autouse=True)
+def local_settings(monkeypatch):
+    # 로컬 캐시는 테스트마다 직접 넘기고, DB 저장은 가짜 upsert 로
+    monkeypatch.setattr(settings, 'MARKET_DATA_CACHE_DIR', '')
+    monkeypatch.setattr(settings, 'MARKET_DATA_USE_COPY', False)
+
+
+def test_partial_failure_keeps_input_order():
+    """실패한 심볼이 있어도 나머지는 저장하고, 결과는 끝난 순서가 아닌 입력 순서"""
+
+    frames = {'AAA': _daily_bars(), 'CCC': _daily_bars('2020-06-01')}
+    source = SlowSource(frames, delays={'AAA': 0.05})
+    collector = DataCollector(source=source)
+    supabase = FakeSupabase()
+    progress = []
+
+    results = asyncio.run(collector.import_symbols(
+        supabase, ['AAA', 'BBB', 'CCC'], '2020-01-01', '2020-03-01',
+        concurrency=3,
+        on_progress=lambda done, total, result: progress.append((done, total, result.symbol))
+    ))
+
+    assert [r.symbol for r in results] == ['AAA', 'BBB', 'CCC']
+    assert [r.success for r in results] == [True, False, False]
+    assert results[0].records == len(supabase.saved('AAA')) == 60
+    assert 'Unknown symbol' in results[1].error
+    assert 'No data found' in results[2].error
+    # 느린 AAA 가 마지막에 끝남
+    assert [p[2] for p in progress][-1] == 'AAA'
+    assert [p[0] for p in progress] == [1, 2, 3]
+    assert all(p[1] == 3 for p in progress)
+
+
+def test_reimport_upserts_only_new_ranges(tmp_path):
+    """로컬 캐시가 있으면 이미 받은 구간은 DB 에 다시 쓰지 않음"""
+
+    source = SlowSource({'AAA': _daily_bars()}, delays={})
+    collector = DataCollector(store=ParquetMarketStore(str(tmp_path)), source=source)
+    supabase = FakeSupabase()
+
+    first = asyncio.run(collector.import_symbols(
+        supabase, ['AAA'], '2020-01-01', '2020-03-01'
+    ))
+    assert first[0].records == 60
+
+    supabase.upserts.clear()
+    again = asyncio.run(collector.import_symbols(
+        supabase, ['AAA'], '2020-01-01', '2020-03-01'
+    ))
+    assert again[0].success and again[0].records == 0
+    assert supabase.upserts == []
+
+    wider = asyncio.run(collector.import_symbols(
+        supabase, ['AAA'], '2020-01-01', '2020-04-01'
+    ))
+    assert wider[0].records == 31
+    assert [r['timestamp'][:10] for r in supabase.saved('AAA')][0] == '2020-03-01'
@@ -0,0 +1,39 @@
+"""
+지표 캐시 키
+"""
+
+import numpy as np
+import pandas as pd
+
+from app.services import indicators as ta
+
+
+def test_in_place_update_is_not_served_stale():
+    """같은 버퍼를 제자리에서 고치면 이전 결과를 돌려주지 않음"""
+
+    ta.indicator_cache.clear()
+    close = np.arange(1000, dtype=np.float64)
+
+    first = ta.sma(close, 10).copy()
+    np.testing.assert_array_equal(ta.sma(close, 10), first)
+    assert ta.indicator_cache.stats()['hits'] == 1
+
+    # 한 칸씩 밀고 마지막에 새 값 (링 버퍼처럼)
+    close[:-1] = close[1:]
+    close[-1] = 5000.0
+    expected = pd.Series(close).rolling(10).mean().to_numpy()
+    np.testing.assert_array_equal(ta.sma(close, 10), expected)
+
+    # 마지막 값만 바꿔도 다시 계산
+    close[-1] = 6000.0
+    assert ta.sma(close, 10)[-1] == np.mean(close[-10:])
+
+
+def test_same_content_in_same_buffer_hits():
+    ta.indicator_cache.clear()
+    close = pd.Series(np.linspace(100, 200, 500))
+
+    ta.rsi(close, 14)
+    ta.rsi(close, 14)
+
+    assert ta.indicator_cache.stats()['hits'] == 1
@@ -0,0 +1,231 @@
+"""
+로컬 Parquet 시장 데이터 저장소
+"""
+
+import asyncio
+import multiprocessing
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.config import settings
+from app.services.data_collector import DataCollector
+from app.services.data_source import FrameDataSource
+from app.services.market_store import CoverageIndex, ParquetMarketStore, to_utc
+
+
+class RecordingSource(FrameDataSource):
+    """요청 구간을 기록하는 메모리 소스"""
+
+    def __init__(self, frames):
+        super().__init__(frames)
+        self.requests = []
+
+    def download(self, symbol, start_date, end_date, interval="1d"):
+        self.requests.append((to_utc(start_date), to_utc(end_date)))
+        return super().download(symbol, start_date, end_date, interval)
+
+
+def _daily_bars(start: str = '2020-01-01', end: str = '2020-12-31') -> pd.DataFrame:
+    index = pd.date_range(start, end, freq='D', tz='UTC')
+    close = np.arange(len(index), dtype=np.float64) + 100
+    return pd.DataFrame({
+        'open': close, 'high': close + 1, 'low': close - 1, 'close': close,
+        'volume': 1000.0,
+    }, index=index)
+
+
+def _utc(value: str) -> pd.Timestamp:
+    return pd.Timestamp(value, tz='UTC')
+
+
+class NullSupabase:
+    """upsert 를 버리는 가짜 클라이언트"""
+
+    def table(self, name):
+        return self
+
+    def upsert(self, records):
+        return self
+
+    def execute(self):
+        return None
+
+
+def _write_days(root: str, offset: int):
+    # 프로세스마다 같은 연도 파일의 서로 다른 날짜를 하루씩 씀
+    store = ParquetMarketStore(root)
+    bars = _daily_bars('2020-01-01', '2020-03-31')
+    for i in range(offset, len(bars), 4):
+        store.write('AAA', '1d', bars.iloc[i:i + 1])
+        store.mark_covered('AAA', '1d', bars.index[i], bars.index[i] + pd.Timedelta(days=1))
+
+
+def test_coverage_index_merges_and_reports_gaps():
+    """겹치거나 맞닿은 구간은 합치고, 요청 구간 중 빈 곳만 돌려줌"""
+
+    coverage = CoverageIndex()
+    coverage.add('2020-02-01', '2020-03-01')
+    coverage.add('2020-03-01', '2020-04-01')
+    coverage.add('2020-06-01', '2020-07-01')
+    coverage.add('2020-06-15', '2020-06-20')
+    coverage.add('2020-08-01', '2020-08-01')  # 빈 구간은 무시
+
+    assert coverage.ranges == [
+        (_utc('2020-02-01'), _utc('2020-04-01')),
+        (_utc('2020-06-01'), _utc('2020-07-01')),
+    ]
+    assert coverage.gaps('2020-01-01', '2020-12-31') == [
+        (_utc('2020-01-01'), _utc('2020-02-01')),
+        (_utc('2020-04-01'), _utc('2020-06-01')),
+        (_utc('2020-07-01'), _utc('2020-12-31')),
+    ]
+    assert coverage.gaps('2020-02-10', '2020-03-20') == []
+    assert coverage.gaps('2020-03-15', '2020-06-10') == [
+        (_utc('2020-04-01'), _utc('2020-06-01')),
+    ]
+    assert CoverageIndex.from_json(coverage.to_json()).ranges == coverage.ranges
+
+
+def test_collector_downloads_only_missing_ranges(tmp_path):
+    """캐시에 없는 구간만 소스에 요청하고 결과는 소스 데이터와 같아야 함"""
+
+    bars = _daily_bars()
+    source = RecordingSource({'AAA': bars})
+    collector = DataCollector(store=ParquetMarketStore(str(tmp_path)), source=source)
+
+    def fetch(start, end):
+        return asyncio.run(collector.fetch_stock_data('AAA', start, end))
+
+    first = fetch('2020-03-01', '2020-05-01')
+    assert source.requests == [(_utc('2020-03-01'), _utc('2020-05-01'))]
+    expected = bars[(bars.index >= '2020-03-01') & (bars.index < '2020-05-01')]
+    assert list(first.index) == list(expected.index)
+    np.testing.assert_array_equal(first[list(expected.columns)], expected)
+
+    # 앞뒤로 넓힌 요청은 양쪽 빈 구간만 받음
+    source.requests.clear()
+    wider = fetch('2020-02-01', '2020-06-01')
+    assert source.requests == [
+        (_utc('2020-02-01'), _utc('2020-03-01')),
+        (_utc('2020-05-01'), _utc('2020-06-01')),
+    ]
+    assert len(wider) == 121
+
+    # 이미 받은 구간은 소스를 거치지 않음
+    source.requests.clear()
+    fetch('2020-02-15', '2020-05-15')
+    assert source.requests == []
+    assert ParquetMarketStore(str(tmp_path)).coverage('AAA', '1d').ranges == [
+        (_utc('2020-02-01'), _utc('2020-06-01')),
+    ]
+
+
+def test_write_merges_and_replaces(tmp_path):
+    """같은 타임스탬프는 새 값으로 교체하고 연도 경계를 넘어 병합"""
+
+    store = ParquetMarketStore(str(tmp_path))
+    bars = _daily_bars('2019-12-01', '2020-01-31')
+    store.write('AAA', '1d', bars.iloc[:40])
+
+    updated = bars.iloc[30:].copy()
+    updated['close'] += 1000
+    store.write('AAA', '1d', updated)
+
+    data = store.read('AAA', '1d', '2019-12-01', '2020-02-01')
+    assert len(data) == len(bars)
+    np.testing.assert_array_equal(data['close'].to_numpy()[:30], bars['close'].to_numpy()[:30])
+    np.testing.assert_array_equal(data['close'].to_numpy()[30:], updated['close'].to_numpy())
+    # 조회는 [start, end)
+    assert len(store.read('AAA', '1d', '2020-01-01', '2020-01-02')) == 1
+
+
+def test_concurrent_writers_keep_every_row(tmp_path):
+    """여러 프로세스가 같은 데이터셋에 동시에 써도 행과 coverage 가 사라지지 않음"""
+
+    root = str(tmp_path)
+    context = multiprocessing.get_context('fork')
+    workers = [context.Process(target=_write_days, args=(root, i)) for i in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert all(worker.exitcode == 0 for worker in workers)
+
+    store = ParquetMarketStore(root)
+    data = store.read('AAA', '1d', '2020-01-01', '2020-04-01')
+    assert len(data) == 91
+    assert store.coverage('AAA', '1d').gaps('2020-01-01', '2020-04-01') == []
+
+    # 임시 파일이 남지 않음
+    leftovers = [
+        name for _, _, files in os.walk(root) for name in files if name.endswith('.tmp')
+    ]
+    assert leftovers == []
+
+
+def test_hidden_temp_file_is_not_read(tmp_path):
+    """쓰는 중인 임시 파일('.' 로 시작)은 조회에 섞이지 않음"""
+
+    store = ParquetMarketStore(str(tmp_path))
+    store.write('AAA', '1d', _daily_bars('2020-01-01', '2020-01-10'))
+    directory = os.path.join(store.dataset_path('AAA', '1d'), 'year=2020')
+    with open(os.path.join(directory, '.data.parquet.partial.tmp'), 'wb') as f:
+        f.write(b'not parquet')
+
+    assert len(store.read('AAA', '1d', '2020-01-01', '2021-01-01')) == 10
+
+
+def test_coverage_only_dataset_reads_empty(tmp_path):
+    store = ParquetMarketStore(str(tmp_path))
+    store.mark_covered('AAA', '1d', '2020-01-01', '2020-02-01')
+
+    assert store.read('AAA', '1d', '2020-01-01', '2020-02-01').empty
+
+
+def test_load_market_data_includes_end_date(tmp_path, monkeypatch):
+    """백테스트 데이터는 DB 조회(lte)처럼 end_date 봉을 포함"""
+
+    monkeypatch.setattr(settings, 'MARKET_DATA_USE_COPY', False)
+    bars = _daily_bars()
+    collector = DataCollector(
+        store=ParquetMarketStore(str(tmp_path)), source=FrameDataSource({'AAA': bars})
+    )
+
+    data = asyncio.run(collector.load_market_data(NullSupabase(), 'AAA', '2020-03-01', '2020-03-31'))
+
+    assert data.index[0] == pd.Timestamp('2020-03-01', tz='UTC')
+    assert data.index[-1] == pd.Timestamp('2020-03-31', tz='UTC')
+    assert len(data) == 31
+
+
+def test_settled_empty_range_is_marked_covered(tmp_path):
+    """정산 기간이 지난 빈 구간은 coverage 에 기록해 다시 요청하지 않음"""
+
+    source = RecordingSource({'AAA': _daily_bars('2020-01-01', '2020-01-31')})
+    collector = DataCollector(store=ParquetMarketStore(str(tmp_path)), source=source)
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            asyncio.run(collector.fetch_stock_data('AAA', '2021-01-01', '2021-02-01'))
+
+    assert len(source.requests) == 1
+
+
+def test_recent_empty_range_is_retried(tmp_path):
+    """최근 구간의 빈 응답은 일시적일 수 있으므로 다음 조회 때 다시 요청"""
+
+    source = RecordingSource({'AAA': _daily_bars('2020-01-01', '2020-01-31')})
+    collector = DataCollector(store=ParquetMarketStore(str(tmp_path)), source=source)
+    today = pd.Timestamp.now(tz='UTC').normalize()
+    start = (today - pd.Timedelta(days=3)).strftime('%Y-%m-%d')
+    end = (today - pd.Timedelta(days=1)).strftime('%Y-%m-%d')
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            asyncio.run(collector.fetch_stock_data('AAA', start, end))
+
+    assert len(source.requests) == 2
+    assert collector.store.coverage('AAA', '1d').ranges == []
@@ -0,0 +1,127 @@
+"""
+bt_market_data 청크 upsert 재시도 / 중단, 저장 경로 선택
+"""
+
+import asyncio
+
+import pandas as pd
+import pytest
+
+from app.config import settings
+from app.services import data_collector
+from app.services.data_collector import DataCollector
+from app.services.market_writer import upsert_chunks
+
+
+class FlakyUpsert:
+    """청크마다 정해진 횟수만큼 실패한 뒤 성공하는 가짜 upsert"""
+
+    def __init__(self, failures=None, always_fail=()):
+        self.failures = dict(failures or {})
+        self.always_fail = set(always_fail)
+        self.attempts = []
+        self.saved = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, chunk):
+        key = chunk[0]['id']
+        self.attempts.append(key)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0)
+            if key in self.always_fail:
+                raise RuntimeError(f"chunk {key} rejected")
+            if self.failures.get(key, 0) > 0:
+                self.failures[key] -= 1
+                raise ConnectionError(f"chunk {key} timed out")
+            self.saved.append(key)
+        finally:
+            self.in_flight -= 1
+
+
+def _chunks(count: int, size: int = 3, produced: list = None):
+    for i in range(count):
+        if produced is not None:
+            produced.append(i)
+        yield [{'id': i, 'row': j} for j in range(size)]
+
+
+def test_failed_chunks_are_retried():
+    """일시적으로 실패한 청크는 다시 보내 모두 저장"""
+
+    upsert = FlakyUpsert(failures={1: 2, 4: 1})
+    written = asyncio.run(upsert_chunks(
+        upsert, _chunks(6), max_in_flight=2, retries=3, retry_delay=0
+    ))
+
+    assert written == 18
+    assert sorted(upsert.saved) == list(range(6))
+    assert upsert.attempts.count(1) == 3
+    assert upsert.attempts.count(4) == 2
+    assert upsert.max_in_flight <= 2
+
+
+def test_exhausted_retries_abort_remaining_chunks():
+    """재시도를 다 쓰면 남은 청크는 만들지 않고 그 청크의 오류를 올림"""
+
+    produced = []
+    upsert = FlakyUpsert(always_fail={2})
+
+    with pytest.raises(RuntimeError, match="chunk 2"):
+        asyncio.run(upsert_chunks(
+            upsert, _chunks(50, produced=produced),
+            max_in_flight=2, retries=2, retry_delay=0
+        ))
+
+    assert upsert.attempts.count(2) == 3
+    assert 2 not in upsert.saved
+    assert len(produced) < 50
+
+
+class RecordingSupabase:
+    """upsert 한 레코드 수만 기록하는 가짜 클라이언트"""
+
+    def __init__(self):
+        self.saved = 0
+
+    def table(self, name):
+        return self
+
+    def upsert(self, records):
+        self.saved += len(records)
+        return self
+
+    def execute(self):
+        return None
+
+
+@pytest.mark.parametrize('use_copy, database_url, expected', [
+    (False, 'postgresql://db/trading', 'upsert'),
+    (True, '', 'upsert'),
+    (True, 'postgresql://db/trading', 'copy'),
+])
+def test_save_uses_copy_only_when_enabled_and_configured(monkeypatch, use_copy, database_url, expected):
+    copied = []
+
+    async def fake_copy(symbol, data, chunk_size):
+        copied.append(symbol)
+        return len(data)
+
+    monkeypatch.setattr(settings, 'MARKET_DATA_CACHE_DIR', '')
+    monkeypatch.setattr(settings, 'MARKET_DATA_USE_COPY', use_copy)
+    monkeypatch.setattr(settings, 'DATABASE_URL', database_url)
+    monkeypatch.setattr(data_collector, 'copy_to_postgres', fake_copy)
+
+    index = pd.date_range('2020-01-01', periods=3, freq='D', tz='UTC')
+    data = pd.DataFrame({
+        'open': 1.0, 'high': 1.0, 'low': 1.0, 'close': 1.0, 'volume': 1.0,
+    }, index=index)
+    supabase = RecordingSupabase()
+
+    saved = asyncio.run(DataCollector().save_to_database(supabase, 'AAA', data))
+
+    assert saved == 3
+    assert (copied == ['AAA']) == (expected == 'copy')
+    assert supabase.saved == (3 if expected == 'upsert' else 0)
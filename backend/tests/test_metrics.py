@@ -0,0 +1,70 @@
+"""
+체결 기반 성과 지표
+"""
+
+import numpy as np
+import pytest
+
+from app.services.metrics import exposure, pair_round_trips, trade_metrics, trade_statistics
+
+
+def _statistics(action, price, quantity):
+    return trade_statistics(pair_round_trips(
+        np.asarray(action), np.asarray(price, dtype=np.float64),
+        np.asarray(quantity, dtype=np.float64)
+    ))
+
+
+def test_profit_factor_without_losses_is_undefined():
+    """이익 거래만 있으면 profit_factor 는 0 이 아니라 None"""
+
+    stats = _statistics([1, -1], [100.0, 110.0], [1.0, 1.0])
+
+    assert stats['round_trips'] == 1
+    assert stats['profit_factor'] is None
+    assert stats['avg_win'] == pytest.approx(10.0)
+
+
+def test_profit_factor_with_only_losses_is_zero():
+    stats = _statistics([1, -1], [100.0, 90.0], [1.0, 1.0])
+
+    assert stats['profit_factor'] == 0.0
+    assert stats['avg_loss'] == pytest.approx(-10.0)
+
+
+def test_profit_factor_ratio_and_no_trades():
+    """총이익 / 총손실, 거래가 없으면 0"""
+
+    stats = _statistics(
+        [1, -1, 1, -1], [100.0, 130.0, 100.0, 90.0], [1.0, 1.0, 1.0, 1.0]
+    )
+    assert stats['profit_factor'] == pytest.approx(3.0)
+    assert _statistics([], [], [])['profit_factor'] == 0.0
+
+
+def test_trade_metrics_keeps_undefined_profit_factor():
+    metrics = trade_metrics(
+        np.array([1, -1]), np.array([100.0, 110.0]), np.array([1.0, 1.0]),
+        trade_index=np.array([0, 3]), position=np.array([1.0, 0.0]), n_bars=5
+    )
+
+    assert metrics['profit_factor'] is None
+    assert metrics['exposure'] == pytest.approx(60.0)
+
+
+def test_exposure_sums_holding_intervals():
+    """보유 구간 합이 봉마다 보유 여부를 표시한 비율과 같음"""
+
+    rng = np.random.default_rng(0)
+    n_bars = 1000
+    trade_index = np.sort(rng.choice(n_bars, 40, replace=False))
+    position = np.where(np.arange(40) % 2 == 0, 1.0, 0.0)
+
+    holding = np.zeros(n_bars, dtype=bool)
+    for i, bar in enumerate(trade_index):
+        holding[bar:] = position[i] > 0
+    assert exposure(trade_index, position, n_bars) == pytest.approx(holding.mean() * 100)
+
+    # 같은 봉의 체결은 마지막 체결 뒤 상태만 반영
+    assert exposure(np.array([2, 2]), np.array([1.0, 0.0]), 10) == 0.0
+    assert exposure(np.array([], dtype=np.int64), np.array([]), 10) == 0.0
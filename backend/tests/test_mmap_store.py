@@ -0,0 +1,104 @@
+"""
+메모리 맵 시장 데이터 저장소
+"""
+
+import asyncio
+import multiprocessing
+
+import numpy as np
+import pandas as pd
+
+from app.config import settings
+from app.services.data_collector import DataCollector
+from app.services.data_source import FrameDataSource
+from app.services.market_store import ParquetMarketStore
+from app.services.mmap_store import MmapMarketStore
+
+
+def _daily_bars(start: str = '2020-01-01', end: str = '2020-12-31') -> pd.DataFrame:
+    index = pd.date_range(start, end, freq='D', tz='UTC')
+    close = np.arange(len(index), dtype=np.float64) + 100
+    return pd.DataFrame({
+        'open': close, 'high': close + 1, 'low': close - 1, 'close': close,
+        'volume': 1000.0,
+    }, index=index)
+
+
+class NullSupabase:
+    """upsert 를 버리는 가짜 클라이언트"""
+
+    def table(self, name):
+        return self
+
+    def upsert(self, records):
+        return self
+
+    def execute(self):
+        return None
+
+
+def _write_days(root: str, offset: int):
+    # 프로세스마다 서로 다른 날짜를 역순으로 하루씩 씀 (이어 쓰기와 병합이 섞임)
+    store = MmapMarketStore(root)
+    bars = _daily_bars('2020-01-01', '2020-03-31')
+    for i in reversed(range(offset, len(bars), 4)):
+        store.write('AAA', '1d', bars.iloc[i:i + 1])
+
+
+def test_write_keeps_older_rows_and_replaces_duplicates(tmp_path):
+    """마지막 타임스탬프 이전 행도 버리지 않고 병합"""
+
+    store = MmapMarketStore(str(tmp_path))
+    bars = _daily_bars('2020-01-01', '2020-01-31')
+    store.write('AAA', '1d', bars.iloc[10:20])
+    store.write('AAA', '1d', bars.iloc[20:])
+    store.write('AAA', '1d', bars.iloc[:5])
+
+    updated = bars.iloc[15:25].copy()
+    updated['close'] += 1000
+    store.write('AAA', '1d', updated)
+
+    arrays = store.arrays('AAA', '1d')
+    assert isinstance(arrays.close, np.memmap)
+    expected = pd.concat([bars.iloc[:5], bars.iloc[10:15], updated, bars.iloc[25:]])
+    assert arrays.timestamp.tolist() == [t.value for t in expected.index]
+    np.testing.assert_array_equal(arrays.close, expected['close'].to_numpy())
+
+    frame = store.read('AAA', '1d', '2020-01-03', '2020-01-12').to_frame()
+    assert frame.index[0] == pd.Timestamp('2020-01-03', tz='UTC')
+    assert len(frame) == 4  # 1/3~1/5, 1/11
+
+
+def test_concurrent_writers_keep_every_row(tmp_path):
+    root = str(tmp_path)
+    context = multiprocessing.get_context('fork')
+    workers = [context.Process(target=_write_days, args=(root, i)) for i in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert all(worker.exitcode == 0 for worker in workers)
+
+    arrays = MmapMarketStore(root).arrays('AAA', '1d')
+    assert len(arrays) == 91
+    assert np.all(np.diff(arrays.timestamp) > 0)
+
+
+def test_collector_reads_mirror_of_parquet_cache(tmp_path, monkeypatch):
+    """조회는 메모리 맵 사본에서, Parquet 캐시가 바뀌면 사본도 다시 만듦"""
+
+    monkeypatch.setattr(settings, 'MARKET_DATA_USE_COPY', False)
+    monkeypatch.setattr(settings, 'MARKET_DATA_MMAP', True)
+    bars = _daily_bars()
+    store = ParquetMarketStore(str(tmp_path))
+    collector = DataCollector(store=store, source=FrameDataSource({'AAA': bars}))
+
+    data = asyncio.run(collector.load_market_data(NullSupabase(), 'AAA', '2020-03-01', '2020-03-31'))
+    assert len(data) == 31
+    assert not data['close'].to_numpy().flags.writeable
+    np.testing.assert_array_equal(data['close'].to_numpy(), bars.loc['2020-03-01':'2020-03-31', 'close'].to_numpy())
+
+    # 캐시 밖 구간을 받으면 Parquet 가 바뀌고 사본이 따라옴
+    data = asyncio.run(collector.load_market_data(NullSupabase(), 'AAA', '2020-01-01', '2020-04-30'))
+    assert len(data) == 121
+    assert len(collector.mmap_store.arrays('AAA', '1d')) == 121
@@ -0,0 +1,74 @@
+"""
+Redis 결과 캐시 직렬화
+"""
+
+import pickle
+import sys
+import types
+
+import numpy as np
+import pytest
+
+from app.services.evaluation_memo import EvaluationMemo
+from app.services.result_cache import RedisResultCache
+
+
+class FakeRedis:
+    """get / set 만 흉내 내는 메모리 Redis"""
+
+    def __init__(self):
+        self.values = {}
+
+    @classmethod
+    def from_url(cls, url):
+        return cls()
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value.encode('utf-8') if isinstance(value, str) else value
+
+    def delete(self, key):
+        self.values.pop(key, None)
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'redis', types.SimpleNamespace(Redis=FakeRedis))
+    return RedisResultCache('redis://localhost:6379/0')
+
+
+def test_values_are_stored_as_json(cache):
+    cache.set('a', {
+        'metrics': {'total_return': np.float64(12.5), 'total_trades': np.int64(3)},
+        'profit_factor': None,
+        'equity': np.array([1.0, 2.0]),
+    })
+
+    raw = cache.client.values['result:a']
+    assert raw.startswith(b'{')
+    assert cache.get('a') == {
+        'metrics': {'total_return': 12.5, 'total_trades': 3},
+        'profit_factor': None,
+        'equity': [1.0, 2.0],
+    }
+    assert cache.get('missing') is None
+
+
+def test_pickled_values_are_not_loaded(cache):
+    """공유 Redis 의 pickle 값은 역직렬화하지 않고 없는 것으로 취급"""
+
+    cache.client.values['result:a'] = pickle.dumps({'total_return': 1.0})
+
+    assert cache.get('a') is None
+
+
+def test_evaluation_memo_round_trips_through_redis(cache):
+    memo = EvaluationMemo('scope', store=cache)
+    key = memo.key({'fast': np.int64(5)})
+    memo.set(key, {'sharpe_ratio': np.float64(1.5)})
+
+    other = EvaluationMemo('scope', store=cache)
+    assert other.lookup([key]) == []
+    assert other.get(key) == {'sharpe_ratio': 1.5}
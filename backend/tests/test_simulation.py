@@ -0,0 +1,123 @@
+"""
+루프 / 벡터화 / 배치 시뮬레이션 결과 일치
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.backtest_engine import BacktestEngine
+from app.services.simulation import simulate_signal_matrix, simulate_signals
+
+
+STRATEGY = '''
+def strategy(data, params):
+    short = ta.sma(data['close'], params['short'])
+    long = ta.sma(data['close'], params['long'])
+    return np.where(short > long, BUY, SELL)
+'''
+
+ALWAYS_BUY = '''
+def strategy(data, params):
+    return np.full(len(data), BUY)
+'''
+
+RANDOM_SIGNALS = '''
+def strategy(data, params):
+    rng = np.random.default_rng(params['seed'])
+    return rng.choice([SELL, HOLD, BUY], len(data), p=[0.1, 0.6, 0.3])
+'''
+
+
+def _market_data(n: int = 600, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.01, n)))
+    index = pd.date_range('2015-01-01', periods=n, freq='B', tz='UTC')
+    return pd.DataFrame({
+        'open': close, 'high': close, 'low': close, 'close': close, 'volume': 1.0
+    }, index=index)
+
+
+def _signal_columns(n: int, seed: int = 1) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    always_buy = np.ones(n, dtype=np.int8)
+    two_sells = np.ones(n, dtype=np.int8)
+    two_sells[[n // 3, 2 * n // 3]] = -1
+    mixed = rng.choice([-1, 0, 1], n, p=[0.1, 0.6, 0.3]).astype(np.int8)
+    return np.stack([always_buy, two_sells, mixed], axis=1)
+
+
+@pytest.mark.parametrize(
+    'code', [STRATEGY, ALWAYS_BUY, RANDOM_SIGNALS],
+    ids=['sma_cross', 'always_buy', 'random']
+)
+def test_loop_and_vectorized_engines_match(code):
+    """두 엔진 모드의 체결 내역·수익 곡선·지표가 같아야 함"""
+
+    data = _market_data()
+    params = {'short': 5, 'long': 20, 'seed': 3}
+    loop = BacktestEngine(code, params, mode="loop").execute(data)
+    vectorized = BacktestEngine(code, params, mode="vectorized").execute(data)
+
+    assert len(loop.trades) == len(vectorized.trades) > 0
+    np.testing.assert_array_equal(loop.trades.bar_index, vectorized.trades.bar_index)
+    np.testing.assert_array_equal(loop.trades.action, vectorized.trades.action)
+    for column in ('price', 'quantity', 'balance', 'position'):
+        np.testing.assert_allclose(
+            getattr(loop.trades, column), getattr(vectorized.trades, column),
+            rtol=1e-9, atol=1e-9, err_msg=column
+        )
+    np.testing.assert_allclose(
+        np.asarray(loop.equity_curve), np.asarray(vectorized.equity_curve), rtol=1e-9
+    )
+    assert loop.metrics == pytest.approx(vectorized.metrics, rel=1e-9)
+    assert loop.final_capital == pytest.approx(vectorized.final_capital, rel=1e-9)
+
+
+@pytest.mark.parametrize('capital', [10000.0, 1e-20, 1e250])
+def test_signal_matrix_matches_per_column_simulation(capital):
+    """
+    행렬 시뮬레이션의 열마다 단일 시뮬레이션과 매수·매도 횟수와 수익 곡선이 같아야 함
+
+    연속 매수로 현금이 0 에 수렴하는 경우(0.05 ** n 언더플로)도 포함합니다.
+    """
+
+    close = _market_data(1000)['close'].to_numpy()
+    signals = _signal_columns(len(close))
+    matrix = simulate_signal_matrix(close, signals, capital, 0.001)
+
+    for j in range(signals.shape[1]):
+        single = simulate_signals(close, signals[:, j], capital, 0.001)
+        assert matrix.buys[:, j].sum() == (single.action == 1).sum()
+        assert matrix.sells[:, j].sum() == (single.action == -1).sum()
+        np.testing.assert_allclose(matrix.equity[:, j], single.equity, rtol=1e-9)
+
+
+def test_cash_exhaustion_matches_loop_engine():
+    """현금이 소진될 때까지 매수해도 배치 매수 횟수가 루프 엔진과 같아야 함"""
+
+    data = _market_data(1000)
+    loop = BacktestEngine(ALWAYS_BUY, {}, mode="loop").execute(data)
+    batch = BacktestEngine(ALWAYS_BUY, {}).execute_batch(data, [{}])
+
+    assert batch['total_trades'][0] == len(loop.trades) < len(data)
+
+
+def test_execute_batch_matches_loop_engine():
+    """execute_batch 의 파라미터 세트별 지표가 루프 엔진과 같아야 함"""
+
+    data = _market_data()
+    parameter_sets = [
+        {'short': short, 'long': long}
+        for short in (3, 5, 8) for long in (20, 30)
+    ]
+    batch = BacktestEngine(STRATEGY, {}).execute_batch(
+        data, parameter_sets, batch_size=4
+    )
+
+    assert len(batch) == len(parameter_sets)
+    for row, params in zip(batch.to_dict('records'), parameter_sets):
+        metrics = BacktestEngine(STRATEGY, params, mode="loop").execute(data).metrics
+        for name in ('total_return', 'max_drawdown', 'total_trades',
+                     'win_rate', 'sharpe_ratio', 'final_value'):
+            assert row[name] == pytest.approx(metrics[name], abs=0.011), name
@@ -0,0 +1,87 @@
+"""
+스트리밍 백테스트 (로컬 캐시 봉 재생)
+"""
+
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.config import settings
+from app.services.backtest_engine import BacktestEngine
+from app.services.backtest_runner import run_streaming_backtest
+from app.services.data_collector import DataCollector
+from app.services.data_source import FrameDataSource
+from app.services.market_store import ParquetMarketStore
+from app.services.streaming import StreamingBacktestEngine
+
+
+STRATEGY = '''
+lookback = 10
+
+def strategy(data, params):
+    close = data['close']
+    return np.where(close > close.rolling(params['period']).mean(), BUY, SELL)
+'''
+
+
+class NullSupabase:
+    """upsert 를 버리는 가짜 클라이언트"""
+
+    def table(self, name):
+        return self
+
+    def upsert(self, records):
+        return self
+
+    def execute(self):
+        return None
+
+
+def _random_walk(n: int = 400, seed: int = 3) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    index = pd.date_range('2020-01-01', periods=n, freq='D', tz='UTC')
+    return pd.DataFrame({
+        'open': close, 'high': close, 'low': close, 'close': close, 'volume': 1.0
+    }, index=index)
+
+
+def test_streaming_backtest_matches_batch_engine(tmp_path, monkeypatch):
+    """캐시 봉을 흘려보낸 결과가 전체 DataFrame 백테스트와 같음 (end_date 포함)"""
+
+    monkeypatch.setattr(settings, 'MARKET_DATA_USE_COPY', False)
+    bars = _random_walk()
+    collector = DataCollector(
+        store=ParquetMarketStore(str(tmp_path)), source=FrameDataSource({'AAA': bars})
+    )
+    strategy = {'code': STRATEGY, 'parameters': {'period': 5}}
+
+    result = asyncio.run(run_streaming_backtest(
+        NullSupabase(), collector, strategy, 'AAA', '2020-01-01', '2020-12-31',
+        initial_capital=10000.0, commission=0.001
+    ))
+
+    expected = BacktestEngine(
+        STRATEGY, {'period': 5}, initial_capital=10000.0, commission=0.001
+    ).execute(bars.loc[:'2020-12-31'])
+
+    assert result.bars == 366
+    assert len(result.trades) == len(expected.trades)
+    np.testing.assert_allclose(result.final_capital, expected.final_capital, rtol=1e-9)
+    assert result.metrics['total_trades'] == expected.metrics['total_trades']
+    assert result.metrics['exposure'] == expected.metrics['exposure']
+
+
+def test_streaming_strategy_error_raises_value_error():
+    code = '''
+lookback = 3
+
+def on_bar(window):
+    return window['missing']
+'''
+    engine = StreamingBacktestEngine(code, {})
+    bars = _random_walk(5)
+    with pytest.raises(ValueError, match="Strategy execution error"):
+        engine.run(bars.rename_axis('timestamp').reset_index().to_dict('records'))